@@ -1,14 +1,49 @@
 """API endpoint custom per ArtistPage."""
-import hashlib
+from collections import defaultdict
 
-from django.db.models import CharField, Value
-from django.db.models.functions import MD5, Cast, Concat
+from django.db.models import F, Prefetch, Window
+from django.db.models.functions import RowNumber
+from django.http import JsonResponse
 from django.utils import timezone
+from django.utils.functional import cached_property
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import etag
 from rest_framework.fields import Field
+from wagtail.api.v2.filters import LocaleFilter
 from wagtail.api.v2.serializers import PageSerializer
+from wagtail.api.v2.utils import BadRequestError
 from wagtail.api.v2.views import PagesAPIViewSet
 
-from .models import ArtistPage
+from core.conditional import (
+    ARTISTS,
+    EPK,
+    EVENTS,
+    IMAGES,
+    VENUES,
+    conditional_api_method,
+)
+from core.facets import FacetsMixin
+from core.pagination import KeysetPaginationMixin
+from core.renditions import (
+    API_IMAGE_SPEC,
+    absolute_url,
+    cached_rendition_urls,
+    placeholder_url,
+    placeholder_urls,
+    rendition_url,
+)
+from core.response_cache import (
+    ROSTER_KEY,
+    artist_key,
+    event_key,
+    set_surrogate_keys,
+)
+from core.serializers import cached_serializer_class, request_fields_config
+
+from .models import ARTIST_TYPE_CHOICES, ArtistPage
+from .roster_index import roster_filter_ids, split_filter_values
+from .rotation import daily_order_mode, order_by_daily_rotation
+from .snapshot import get_roster_manifest
 
 
 class GenreListField(Field):
@@ -49,37 +84,97 @@ class SocialsField(Field):
         }
 
 
-class ArtistEventsField(Field):
-    """Campo custom: prossimi eventi dell'artista."""
+ARTIST_EVENTS_LIMIT = 10
 
-    def get_attribute(self, instance):
-        return instance
 
-    def to_representation(self, page):
-        from events.models import EventPage
+def _upcoming_events_by_artist(artist_ids, today):
+    """Prossimi eventi per artista (max ARTIST_EVENTS_LIMIT), con una query a finestra."""
+    from events.models import EventPage
 
-        base_qs = EventPage.objects.live().filter(start_date__gte=timezone.now().date())
-        events = list(base_qs.filter(related_artist=page).order_by("start_date")[:10])
+    events = defaultdict(list)
+    if not artist_ids:
+        return events
 
-        if page.locale.language_code != "it":
-            source_artist = (
-                page.__class__.objects.filter(
-                    translation_key=page.translation_key,
-                    locale__language_code="it",
-                )
-                .first()
+    ranked = (
+        EventPage.objects.live()
+        .filter(related_artist_id__in=artist_ids, start_date__gte=today)
+        .select_related("venue")
+        .annotate(
+            artist_rank=Window(
+                RowNumber(),
+                partition_by=F("related_artist_id"),
+                order_by=[F("start_date").asc(), F("pk").asc()],
             )
-            if source_artist:
-                translated_keys = {event.translation_key for event in events}
-                fallback_events = (
-                    base_qs.filter(related_artist=source_artist)
-                    .exclude(translation_key__in=translated_keys)
-                    .order_by("start_date")
-                )
-                for fallback_event in fallback_events:
+        )
+        .filter(artist_rank__lte=ARTIST_EVENTS_LIMIT)
+        .order_by("related_artist_id", "start_date", "pk")
+    )
+    for event in ranked:
+        events[event.related_artist_id].append(event)
+    return events
+
+
+def prefetch_artist_events(pages):
+    """Precarica i prossimi eventi per un insieme di artisti.
+
+    Una query a finestra per gli eventi degli artisti e, per gli artisti
+    non italiani, una query per gli originali italiani (``translation_key``)
+    e una per i loro eventi, usati come fallback per gli eventi non
+    tradotti. Il risultato va in ``page._upcoming_events``, letto da
+    ``ArtistEventsField``.
+    """
+    from wagtail.models import Locale
+
+    if not pages:
+        return
+
+    today = timezone.now().date()
+    own_events = _upcoming_events_by_artist([page.pk for page in pages], today)
+
+    italian_locale_id = (
+        Locale.objects.filter(language_code="it").values_list("id", flat=True).first()
+    )
+    translation_keys = {
+        page.translation_key for page in pages if page.locale_id != italian_locale_id
+    }
+    source_ids = {}
+    if translation_keys and italian_locale_id is not None:
+        source_ids = dict(
+            ArtistPage.objects.filter(
+                translation_key__in=translation_keys,
+                locale_id=italian_locale_id,
+            ).values_list("translation_key", "id")
+        )
+    fallback_events = _upcoming_events_by_artist(list(source_ids.values()), today)
+
+    for page in pages:
+        events = list(own_events.get(page.pk, []))
+        source_id = None
+        if page.locale_id != italian_locale_id:
+            source_id = source_ids.get(page.translation_key)
+        if source_id:
+            translated_keys = {event.translation_key for event in events}
+            for fallback_event in fallback_events.get(source_id, []):
+                if len(events) >= ARTIST_EVENTS_LIMIT:
+                    break
+                if fallback_event.translation_key not in translated_keys:
                     events.append(fallback_event)
-                    if len(events) >= 10:
-                        break
+        page._upcoming_events = events
+
+
+class ArtistEventsField(Field):
+    """Campo custom: prossimi eventi dell'artista.
+
+    Legge gli eventi precaricati da ``prefetch_artist_events`` (chiamato
+    dal viewset per tutta la pagina di risultati).
+    """
+
+    def get_attribute(self, instance):
+        return instance
+
+    def to_representation(self, page):
+        if not hasattr(page, "_upcoming_events"):
+            prefetch_artist_events([page])
 
         return [
             {
@@ -90,10 +185,27 @@ class ArtistEventsField(Field):
                 "city": e.venue.city if e.venue else "",
                 "status": e.display_status,
             }
-            for e in events
+            for e in page._upcoming_events
         ]
 
 
+def latest_public_epk_queryset():
+    """EPK pubblici dal piu' recente, con tutti gli asset in select_related."""
+    from core.models import EPKPackage
+
+    return (
+        EPKPackage.objects.filter(is_public=True)
+        .select_related(
+            "press_photo_hires",
+            "technical_rider",
+            "biography_pdf",
+            "logo_vector",
+            "press_kit_zip",
+        )
+        .order_by("-updated_at", "-pk")
+    )
+
+
 class EPKField(Field):
     """Campo custom: EPK (press kit) associato all'artista, se pubblico."""
 
@@ -101,13 +213,11 @@ class EPKField(Field):
         return instance
 
     def to_representation(self, page):
-        from core.models import EPKPackage
-
-        epk = (
-            EPKPackage.objects.filter(artist=page, is_public=True)
-            .order_by("-updated_at")
-            .first()
-        )
+        if hasattr(page, "latest_public_epks"):
+            # Precaricato da ArtistAPIViewSet.get_queryset
+            epk = page.latest_public_epks[0] if page.latest_public_epks else None
+        else:
+            epk = latest_public_epk_queryset().filter(artist=page).first()
         if not epk:
             return None
         return {
@@ -126,94 +236,25 @@ class EPKField(Field):
 
 
 class BodyHTMLField(Field):
-    """Campo custom: renderizza StreamField body come HTML per il frontend."""
+    """Campo custom: body StreamField come HTML per il frontend.
+
+    Serve l'HTML renderizzato alla pubblicazione (``ArtistRenderedBody``);
+    se manca o e' di un'altra revisione lo renderizza al volo.
+    """
 
     def get_attribute(self, instance):
         return instance
 
     def to_representation(self, page):
-        if not page.body:
-            return ""
-        html_parts: list[str] = []
-        for block in page.body:
-            bt = block.block_type
-            val = block.value
-            if bt == "richtext":
-                html_parts.append(str(val))
-            elif bt == "heading":
-                level = val.get("level", "h2")
-                html_parts.append(f"<{level}>{val.get('text', '')}</{level}>")
-            elif bt == "bio":
-                body_html = str(val.get("body", ""))
-                quote = val.get("quote", "")
-                attribution = val.get("quote_attribution", "")
-                html_parts.append(f'<div class="artist-bio">{body_html}')
-                if quote:
-                    html_parts.append(f'<blockquote>{quote}')
-                    if attribution:
-                        html_parts.append(f"<cite>— {attribution}</cite>")
-                    html_parts.append("</blockquote>")
-                html_parts.append("</div>")
-            elif bt == "discography":
-                heading = val.get("heading", "Discografia")
-                albums = val.get("albums", [])
-                html_parts.append(f'<div class="discography"><h3>{heading}</h3>')
-                for album in albums:
-                    title = album.get("title", "")
-                    year = album.get("year", "")
-                    cover = album.get("cover_image")
-                    spotify = album.get("spotify_url", "")
-                    html_parts.append(f'<div class="album">')
-                    if cover:
-                        try:
-                            rendition = cover.get_rendition("fill-200x200|format-webp")
-                            html_parts.append(f'<img src="{rendition.url}" alt="{title}" />')
-                        except Exception:
-                            pass
-                    html_parts.append(f"<strong>{title}</strong> ({year})")
-                    if spotify:
-                        html_parts.append(f' <a href="{spotify}" target="_blank" rel="noopener">Spotify</a>')
-                    html_parts.append("</div>")
-                html_parts.append("</div>")
-            elif bt == "video":
-                caption = val.get("caption", "")
-                video_embed = val.get("video")
-                if video_embed:
-                    try:
-                        html_parts.append(f'<div class="video-embed">{video_embed.html}')
-                        if caption:
-                            html_parts.append(f"<p>{caption}</p>")
-                        html_parts.append("</div>")
-                    except Exception:
-                        pass
-            elif bt == "gallery":
-                images = val.get("images", [])
-                if images:
-                    html_parts.append('<div class="gallery">')
-                    for gi in images:
-                        img = gi.get("image")
-                        if img:
-                            try:
-                                rendition = img.get_rendition("width-600|format-webp")
-                                cap = gi.get("caption", "") or img.title
-                                html_parts.append(f'<img src="{rendition.url}" alt="{cap}" />')
-                            except Exception:
-                                continue
-                    html_parts.append("</div>")
-            elif bt == "cta":
-                text = val.get("text", "")
-                url = val.get("url", "")
-                cta_page = val.get("page")
-                href = url or (cta_page.url if cta_page else "#")
-                style = val.get("style", "primary")
-                html_parts.append(f'<a href="{href}" class="cta cta-{style}">{text}</a>')
-        return "".join(html_parts)
+        from .body_html import get_body_html
+
+        return get_body_html(page)
 
 
 class ImageUrlField(Field):
     """Campo custom: URL rendition immagine principale."""
 
-    def __init__(self, rendition_spec="fill-800x1200|format-webp", **kwargs):
+    def __init__(self, rendition_spec=API_IMAGE_SPEC, **kwargs):
         self.rendition_spec = rendition_spec
         super().__init__(**kwargs)
 
@@ -221,37 +262,34 @@ class ImageUrlField(Field):
         return instance
 
     def to_representation(self, page):
-        if not page.main_image:
-            return None
-        try:
-            rendition = page.main_image.get_rendition(self.rendition_spec)
-            return rendition.full_url
-        except Exception:
-            return None
+        return rendition_url(page.main_image, self.rendition_spec, full=True)
 
 
 class ImageThumbField(Field):
-    """Campo custom: URL rendition LQIP tiny placeholder (40×60)."""
-
-    THUMB_SPEC = "fill-40x60|format-webp"
+    """Campo custom: placeholder LQIP inline (data URI, o URL thumb 40×60)."""
 
     def get_attribute(self, instance):
         return instance
 
     def to_representation(self, page):
-        if not page.main_image:
-            return None
-        try:
-            rendition = page.main_image.get_rendition(self.THUMB_SPEC)
-            return rendition.full_url
-        except Exception:
-            return None
+        return placeholder_url(page.main_image)
+
+
+def _gallery_urls(page, spec) -> list[str]:
+    """URL assolute delle immagini gallery (rendizioni non generabili escluse)."""
+    images = [item.image for item in page.gallery_images.all()]
+    urls = cached_rendition_urls((image, spec) for image in images)
+    return [
+        absolute_url(urls[(image.id, spec)])
+        for image in images
+        if urls.get((image.id, spec))
+    ]
 
 
 class GalleryImagesField(Field):
     """Campo custom: lista URL rendition delle immagini gallery."""
 
-    def __init__(self, rendition_spec="fill-800x1200|format-webp", **kwargs):
+    def __init__(self, rendition_spec=API_IMAGE_SPEC, **kwargs):
         self.rendition_spec = rendition_spec
         super().__init__(**kwargs)
 
@@ -259,36 +297,22 @@ class GalleryImagesField(Field):
         return instance
 
     def to_representation(self, page):
-        urls: list[str] = []
-        for item in page.gallery_images.all():
-            try:
-                rendition = item.image.get_rendition(self.rendition_spec)
-                urls.append(rendition.full_url)
-            except Exception:
-                continue
-        return urls
+        return _gallery_urls(page, self.rendition_spec)
 
 
 class GalleryThumbsField(Field):
-    """Campo custom: lista URL rendition LQIP tiny placeholder gallery."""
-
-    THUMB_SPEC = "fill-40x60|format-webp"
+    """Campo custom: lista placeholder LQIP inline delle immagini gallery."""
 
     def get_attribute(self, instance):
         return instance
 
     def to_representation(self, page):
-        urls: list[str] = []
-        for item in page.gallery_images.all():
-            try:
-                rendition = item.image.get_rendition(self.THUMB_SPEC)
-                urls.append(rendition.full_url)
-            except Exception:
-                continue
-        return urls
+        images = [item.image for item in page.gallery_images.all()]
+        thumbs = placeholder_urls(images)
+        return [thumbs[image.id] for image in images if thumbs.get(image.id)]
 
 
-class ArtistAPIViewSet(PagesAPIViewSet):
+class ArtistAPIViewSet(FacetsMixin, KeysetPaginationMixin, PagesAPIViewSet):
     """Endpoint API per gli artisti."""
 
     base_serializer_class = PageSerializer
@@ -329,65 +353,279 @@ class ArtistAPIViewSet(PagesAPIViewSet):
         "body_html",
     ]
 
+    # Profili di campi (?profile=): insieme di partenza al posto dei campi di
+    # default, ?fields= si applica sopra. "card" e' la card della griglia
+    # roster: niente gallery, eventi, EPK e body (ne' query ne' serializer).
+    field_profiles = {
+        "card": ["_"] + PagesAPIViewSet.listing_default_fields + [
+            "short_bio",
+            "artist_type",
+            "tribute_to",
+            "hero_video_url",
+            "base_country",
+            "base_region",
+            "base_city",
+            "image_url",
+            "image_thumb",
+            "genre_display",
+            "tags",
+        ],
+        "detail": ["_"] + PagesAPIViewSet.listing_default_fields + body_fields[
+            len(PagesAPIViewSet.body_fields):
+        ],
+        "full": ["*"],
+    }
+
     known_query_parameters = PagesAPIViewSet.known_query_parameters.union(
-        {"artist_type", "genre", "region", "country", "daily_seed"}
+        {
+            "artist_type",
+            "genre",
+            "target_event",
+            "region",
+            "country",
+            "match",
+            "daily_seed",
+            "profile",
+            "cursor",
+        }
     )
 
+    # Faccette dei filtri roster (/api/v2/artists/facets/): (valore, etichetta)
+    facet_fields = {
+        "artist_type": ("artist_type", None),
+        "genre": ("genres__slug", "genres__name"),
+        "target_event": ("target_events__slug", "target_events__name"),
+        "region": ("base_region", None),
+        "country": ("base_country", None),
+    }
+    facet_query_parameters = frozenset(facet_fields) | {"match", "locale"}
+
+    # Campi custom, dichiarati sul serializer solo se richiesti
+    custom_serializer_fields = {
+        "image_url": ImageUrlField,
+        "image_thumb": ImageThumbField,
+        "gallery_images": GalleryImagesField,
+        "gallery_thumbs": GalleryThumbsField,
+        "genre_display": GenreListField,
+        "tags": TagsListField,
+        "socials": SocialsField,
+        "events": ArtistEventsField,
+        "epk": EPKField,
+        "body_html": BodyHTMLField,
+    }
+
+    def _fields_config(self):
+        """Configurazione campi da ``?profile=`` e ``?fields=``.
+
+        Un ``?fields=`` che riparte da zero (``_`` o ``*``) ignora il profilo.
+        """
+        fields_config = request_fields_config(self.request)
+
+        profile = self.request.GET.get("profile")
+        if not profile:
+            return fields_config
+        if profile not in self.field_profiles:
+            raise BadRequestError(
+                "profile error: valori ammessi %s" % ", ".join(self.field_profiles)
+            )
+        if fields_config and fields_config[0][0] in ("_", "*"):
+            return fields_config
+        return [
+            (name, False, None) for name in self.field_profiles[profile]
+        ] + fields_config
+
     def get_serializer_class(self):
-        """Aggiunge campi custom al serializer."""
-        base = super().get_serializer_class()
-
-        class CustomSerializer(base):
-            image_url = ImageUrlField(read_only=True)
-            image_thumb = ImageThumbField(read_only=True)
-            gallery_images = GalleryImagesField(read_only=True)
-            gallery_thumbs = GalleryThumbsField(read_only=True)
-            genre_display = GenreListField(read_only=True)
-            tags = TagsListField(read_only=True)
-            socials = SocialsField(read_only=True)
-            events = ArtistEventsField(read_only=True)
-            epk = EPKField(read_only=True)
-            body_html = BodyHTMLField(read_only=True)
-
-        return CustomSerializer
+        """Serializer per i campi richiesti, con i campi custom (vedi ``core.serializers``)."""
+        return cached_serializer_class(
+            self,
+            self.model,
+            self._fields_config(),
+            show_details=self.action != "listing_view",
+        )
+
+    def cursor_ordering(self):
+        """Chiave del cursore: posizione del giorno con ``daily_seed``, altrimenti titolo."""
+        if self.request.query_params.get("daily_seed"):
+            return [("daily_order", False), ("pk", False)]
+        return [("title", False), ("pk", False)]
+
+    def cursor_scope(self, queryset):
+        """Con ``daily_seed`` la chiave e' il rank precalcolato o l'hash MD5.
+
+        Un cursore emesso con un tipo non vale con l'altro (rotazione
+        ricalcolata a mezzanotte o calcolo fallito): scope diversi, 400.
+        """
+        seed = self.request.query_params.get("daily_seed")
+        if not seed:
+            return None
+        return f"{daily_order_mode(queryset)}:{seed}"
+
+    @cached_property
+    def _requested_fields(self):
+        """Campi del serializer per la richiesta corrente (profilo + ``?fields=``)."""
+        return set(self.get_serializer_class().Meta.fields)
+
+    def _prefetch_events(self, pages):
+        """Precarica gli eventi se il campo ``events`` e' tra quelli richiesti."""
+        if "events" in self._requested_fields:
+            prefetch_artist_events(pages)
+
+    def _prime_rendition_urls(self, pages):
+        """URL e placeholder delle immagini della pagina in blocco (cache + una query)."""
+        fields = self._requested_fields
+        images = []
+        if fields & {"image_url", "image_thumb"}:
+            images += [page.main_image for page in pages]
+        if fields & {"gallery_images", "gallery_thumbs"}:
+            images += [item.image for page in pages for item in page.gallery_images.all()]
+        cached_rendition_urls((image, API_IMAGE_SPEC) for image in images)
+        placeholder_urls(images)
+
+    def _surrogate_keys(self, pages) -> set[str]:
+        """Surrogate key della risposta: artisti serializzati e loro eventi."""
+        keys = set()
+        for page in pages:
+            keys.add(artist_key(page.translation_key))
+            keys.update(event_key(event.pk) for event in getattr(page, "_upcoming_events", []))
+        return keys
+
+    def paginate_queryset(self, queryset):
+        page = list(super().paginate_queryset(queryset))
+        self._prefetch_events(page)
+        self._prime_rendition_urls(page)
+        self._listed_pages = page
+        return page
+
+    @conditional_api_method(ARTISTS, EVENTS, VENUES, EPK, IMAGES)
+    def listing_view(self, request):
+        response = super().listing_view(request)
+        set_surrogate_keys(response, {ROSTER_KEY} | self._surrogate_keys(self._listed_pages))
+        return response
+
+    @conditional_api_method(ARTISTS, EVENTS, VENUES, EPK, IMAGES)
+    def detail_view(self, request, pk):
+        # get_object() e' in cache sul viewset: il serializer riceve la
+        # stessa istanza con gli eventi gia' caricati
+        page = self.get_object()
+        self._prefetch_events([page])
+        response = super().detail_view(request, pk)
+        set_surrogate_keys(response, self._surrogate_keys([page]))
+        return response
+
+    def facet_queryset(self):
+        """Artisti pubblicati nella lingua richiesta, senza i filtri faccetta."""
+        return LocaleFilter().filter_queryset(self.request, super().get_queryset(), self)
+
+    def facet_filters(self):
+        """Predicati dei filtri attivi, con la stessa semantica di ``get_queryset``."""
+        params = self.request.query_params
+        filters = {}
+        for facet in ("artist_type", "country"):
+            value = params.get(facet)
+            if value:
+                filters[facet] = lambda values, value=value: value in values
+        combine = all if self._match_all() else any
+        for facet in ("genre", "target_event"):
+            slugs = split_filter_values(params.get(facet))
+            if slugs:
+                filters[facet] = lambda values, slugs=slugs: combine(
+                    slug in values for slug in slugs
+                )
+        region = params.get("region")
+        if region:
+            needle = region.lower()
+            filters["region"] = lambda values: any(needle in value.lower() for value in values)
+        return filters
+
+    def facet_labels(self, facet, values):
+        if facet == "artist_type":
+            return dict(ARTIST_TYPE_CHOICES)
+        if facet == "country":
+            from django_countries import countries
+
+            return {code: countries.name(code) for code in values}
+        return {}
+
+    @conditional_api_method(ARTISTS)
+    def facets_view(self, request):
+        response = super().facets_view(request)
+        set_surrogate_keys(response, {ROSTER_KEY})
+        return response
+
+    def _match_all(self) -> bool:
+        """``?match=all``: generi ed eventi target multipli in AND (default OR)."""
+        return self.request.query_params.get("match") == "all"
 
     def get_queryset(self):
         """Aggiunge filtri custom e ordinamento rotativo giornaliero.
 
+        I filtri (``genre`` e ``target_event`` accettano piu' slug separati
+        da virgola) si risolvono sull'indice bitmap in memoria
+        (``artists.roster_index``) in una lista di pk.
+
         Il parametro `daily_seed` (es. "2026-02-19") attiva un ordinamento
         deterministico basato sulla data: ogni giorno le band appaiono in
         posizioni diverse, garantendo equa visibilità a rotazione.
-        Formula: ORDER BY MD5(pk || daily_seed)
+        Formula: ORDER BY MD5(pk || daily_seed), precalcolata una volta al
+        giorno in ``ArtistDailyRank`` (vedi ``artists.rotation``).
         """
         qs = super().get_queryset()
 
-        artist_type = self.request.query_params.get("artist_type")
-        if artist_type:
-            qs = qs.filter(artist_type=artist_type)
-
-        genre = self.request.query_params.get("genre")
-        if genre:
-            qs = qs.filter(genres__slug=genre)
-
-        region = self.request.query_params.get("region")
-        if region:
-            qs = qs.filter(base_region__icontains=region)
-
-        country = self.request.query_params.get("country")
-        if country:
-            qs = qs.filter(base_country=country)
+        params = self.request.query_params
+        artist_ids = roster_filter_ids(
+            artist_type=params.get("artist_type"),
+            genres=split_filter_values(params.get("genre")),
+            target_events=split_filter_values(params.get("target_event")),
+            region=params.get("region"),
+            country=params.get("country"),
+            locale=params.get("locale"),
+            match_all=self._match_all(),
+        )
+        if artist_ids is not None:
+            qs = qs.filter(pk__in=artist_ids)
 
-        # Ordinamento rotativo giornaliero: MD5(pk + seed) come chiave di sort
+        # Ordinamento rotativo giornaliero: posizioni precalcolate per il seed
         daily_seed = self.request.query_params.get("daily_seed")
         if daily_seed:
-            qs = qs.annotate(
-                daily_order=MD5(
-                    Concat(
-                        Cast("pk", output_field=CharField()),
-                        Value(daily_seed),
-                        output_field=CharField(),
-                    )
+            qs = order_by_daily_rotation(qs, daily_seed)
+
+        # Carica solo i dati dei campi richiesti
+        fields = self._requested_fields
+        if fields & {"image_url", "image_thumb"}:
+            qs = qs.select_related("main_image")
+        if fields & {"gallery_images", "gallery_thumbs"}:
+            qs = qs.prefetch_related("gallery_images__image")
+        if "body_html" in fields:
+            qs = qs.select_related("rendered_body")
+        if fields & {"genre_display", "tags"}:
+            qs = qs.prefetch_related("genres")
+        if "tags" in fields:
+            qs = qs.prefetch_related("target_events")
+        if "epk" in fields:
+            # Solo l'EPK pubblico piu' recente per artista (query a finestra)
+            qs = qs.prefetch_related(
+                Prefetch(
+                    "epk_packages",
+                    queryset=latest_public_epk_queryset()[:1],
+                    to_attr="latest_public_epks",
                 )
-            ).order_by("daily_order")
+            )
+        return qs
+
+
+def _roster_manifest_etag(request):
+    manifest = get_roster_manifest()
+    if manifest is None:
+        return None
+    return "-".join(entry["hash"] for _code, entry in sorted(manifest["locales"].items()))
+
 
-        return qs.select_related("main_image").prefetch_related("genres", "target_events")
+@cache_control(public=True, max_age=60)
+@etag(_roster_manifest_etag)
+def roster_snapshot_api(request):
+    """
+    GET /api/v2/roster/
+    Manifest degli snapshot statici del roster: URL e hash per lingua.
+    Senza snapshot (mai generato) ``locales`` e' vuoto: il client usa il listing.
+    """
+    return JsonResponse(get_roster_manifest() or {"generated_at": None, "locales": {}})
@@ -0,0 +1,124 @@
+"""HTML del body StreamField degli artisti, renderizzato alla pubblicazione.
+
+Il rendering (HTML dei blocchi + renditions di copertine e gallery) e'
+costoso e ``body_html`` e' nei campi di default del listing: il task
+``artists.tasks.render_artist_body_html`` lo esegue una volta per revisione
+pubblicata e lo salva in ``ArtistRenderedBody``; l'API lo serve da li'.
+"""
+from django.core.exceptions import ObjectDoesNotExist
+
+
+def render_body_html(page) -> str:
+    """Renderizza il body StreamField della pagina come HTML."""
+    if not page.body:
+        return ""
+    html_parts: list[str] = []
+    for block in page.body:
+        bt = block.block_type
+        val = block.value
+        if bt == "richtext":
+            html_parts.append(str(val))
+        elif bt == "heading":
+            level = val.get("level", "h2")
+            html_parts.append(f"<{level}>{val.get('text', '')}</{level}>")
+        elif bt == "bio":
+            body_html = str(val.get("body", ""))
+            quote = val.get("quote", "")
+            attribution = val.get("quote_attribution", "")
+            html_parts.append(f'<div class="artist-bio">{body_html}')
+            if quote:
+                html_parts.append(f'<blockquote>{quote}')
+                if attribution:
+                    html_parts.append(f"<cite>— {attribution}</cite>")
+                html_parts.append("</blockquote>")
+            html_parts.append("</div>")
+        elif bt == "discography":
+            heading = val.get("heading", "Discografia")
+            albums = val.get("albums", [])
+            html_parts.append(f'<div class="discography"><h3>{heading}</h3>')
+            for album in albums:
+                title = album.get("title", "")
+                year = album.get("year", "")
+                cover = album.get("cover_image")
+                spotify = album.get("spotify_url", "")
+                html_parts.append(f'<div class="album">')
+                if cover:
+                    try:
+                        rendition = cover.get_rendition("fill-200x200|format-webp")
+                        html_parts.append(f'<img src="{rendition.url}" alt="{title}" />')
+                    except Exception:
+                        pass
+                html_parts.append(f"<strong>{title}</strong> ({year})")
+                if spotify:
+                    html_parts.append(f' <a href="{spotify}" target="_blank" rel="noopener">Spotify</a>')
+                html_parts.append("</div>")
+            html_parts.append("</div>")
+        elif bt == "video":
+            caption = val.get("caption", "")
+            video_embed = val.get("video")
+            if video_embed:
+                try:
+                    html_parts.append(f'<div class="video-embed">{video_embed.html}')
+                    if caption:
+                        html_parts.append(f"<p>{caption}</p>")
+                    html_parts.append("</div>")
+                except Exception:
+                    pass
+        elif bt == "gallery":
+            images = val.get("images", [])
+            if images:
+                html_parts.append('<div class="gallery">')
+                for gi in images:
+                    img = gi.get("image")
+                    if img:
+                        try:
+                            rendition = img.get_rendition("width-600|format-webp")
+                            cap = gi.get("caption", "") or img.title
+                            html_parts.append(f'<img src="{rendition.url}" alt="{cap}" />')
+                        except Exception:
+                            continue
+                html_parts.append("</div>")
+        elif bt == "cta":
+            text = val.get("text", "")
+            url = val.get("url", "")
+            cta_page = val.get("page")
+            href = url or (cta_page.url if cta_page else "#")
+            style = val.get("style", "primary")
+            html_parts.append(f'<a href="{href}" class="cta cta-{style}">{text}</a>')
+    return "".join(html_parts)
+
+
+def get_stored_body_html(page) -> str | None:
+    """HTML salvato per la revisione live della pagina, se aggiornato."""
+    if page.live_revision_id is None:
+        return None
+    try:
+        rendered = page.rendered_body
+    except ObjectDoesNotExist:
+        return None
+    if rendered.revision_id != page.live_revision_id:
+        return None
+    return rendered.html
+
+
+def get_body_html(page) -> str:
+    """HTML salvato se aggiornato, altrimenti rendering al volo."""
+    stored = get_stored_body_html(page)
+    if stored is not None:
+        return stored
+    return render_body_html(page)
+
+
+def store_body_html(page):
+    """Renderizza e salva l'HTML per la revisione live della pagina."""
+    from .models import ArtistRenderedBody
+
+    rendered, _created = ArtistRenderedBody.objects.update_or_create(
+        page=page,
+        defaults={
+            "revision_id": page.live_revision_id,
+            "html": render_body_html(page),
+        },
+    )
+    page.rendered_body = rendered
+    return rendered
@@ -0,0 +1,55 @@
+"""
+Management command: renderizza il body HTML salvato (ArtistRenderedBody)
+per gli artisti pubblicati che non lo hanno o lo hanno di una revisione
+precedente.
+
+Uso:
+    python manage.py backfill_body_html [--force] [--async]
+"""
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Genera il body HTML pre-renderizzato per gli artisti pubblicati."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Rigenera anche l'HTML gia' aggiornato.",
+        )
+        parser.add_argument(
+            "--async",
+            action="store_true",
+            dest="use_celery",
+            help="Accoda un task Celery per pagina invece di renderizzare qui.",
+        )
+
+    def handle(self, *args, **options):
+        from artists.body_html import get_stored_body_html, store_body_html
+        from artists.models import ArtistPage
+        from artists.tasks import render_artist_body_html
+
+        pages = (
+            ArtistPage.objects.live()
+            .exclude(live_revision=None)
+            .select_related("rendered_body")
+            .order_by("pk")
+        )
+
+        stats = {"rendered": 0, "queued": 0, "skipped": 0}
+        for page in pages.iterator(chunk_size=200):
+            if not options["force"] and get_stored_body_html(page) is not None:
+                stats["skipped"] += 1
+                continue
+            if options["use_celery"]:
+                render_artist_body_html.delay(page.pk, page.live_revision_id)
+                stats["queued"] += 1
+            else:
+                store_body_html(page)
+                stats["rendered"] += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Renderizzati: {stats['rendered']}  Accodati: {stats['queued']}  "
+            f"Gia' aggiornati: {stats['skipped']}"
+        ))
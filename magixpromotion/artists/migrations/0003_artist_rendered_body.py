@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artists', '0002_add_gallery_images'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArtistRenderedBody',
+            fields=[
+                ('page', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rendered_body', serialize=False, to='artists.artistpage')),
+                ('revision_id', models.PositiveIntegerField(verbose_name='Revisione')),
+                ('html', models.TextField(blank=True)),
+                ('rendered_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Body HTML renderizzato',
+                'verbose_name_plural': 'Body HTML renderizzati',
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artists', '0003_artist_rendered_body'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArtistDailyRank',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seed', models.CharField(max_length=10)),
+                ('rank', models.PositiveIntegerField()),
+                ('page', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_ranks', to='artists.artistpage')),
+            ],
+            options={
+                'verbose_name': 'Posizione rotazione giornaliera',
+                'verbose_name_plural': 'Posizioni rotazione giornaliera',
+                'indexes': [models.Index(fields=['seed', 'rank'], name='artists_daily_rank_seed_rank')],
+                'constraints': [models.UniqueConstraint(fields=('seed', 'page'), name='artists_daily_rank_seed_page')],
+            },
+        ),
+    ]
@@ -16,6 +16,7 @@ from wagtail.snippets.models import register_snippet
 
 from wagtail_localize.fields import SynchronizedField, TranslatableField
 
+from core.renditions import ARTIST_CARD_SPECS, ARTIST_HERO_SPECS, cached_rendition_urls
 from core.widgets import IconPickerWidget
 
 from core.blocks import ARTIST_BODY_BLOCKS
@@ -131,22 +132,19 @@ class ArtistListingPage(Page):
     def get_context(self, request, *args, **kwargs):
         """Aggiunge la lista artisti live al contesto template."""
         context = super().get_context(request, *args, **kwargs)
-        genre_slug = request.GET.get("genre")
-        artist_type = request.GET.get("type")
-        region = request.GET.get("region")
+        from .roster_index import roster_filter_ids, split_filter_values
 
         artists = ArtistPage.objects.live().public().order_by("title")
 
-        if genre_slug:
-            artists = artists.filter(genres__slug=genre_slug)
-        if artist_type:
-            artists = artists.filter(artist_type=artist_type)
-        if region:
-            artists = artists.filter(base_region__icontains=region)
-
-        country = request.GET.get("country")
-        if country:
-            artists = artists.filter(base_country=country)
+        # Filtri risolti sull'indice bitmap in memoria (vedi roster_index)
+        artist_ids = roster_filter_ids(
+            artist_type=request.GET.get("type"),
+            genres=split_filter_values(request.GET.get("genre")),
+            region=request.GET.get("region"),
+            country=request.GET.get("country"),
+        )
+        if artist_ids is not None:
+            artists = artists.filter(pk__in=artist_ids)
 
         context["artists"] = artists
         context["genres"] = Genre.objects.all()
@@ -382,35 +380,24 @@ class ArtistPage(Page):
 
     # === Image Renditions ===
 
-    @property
-    def card_image_renditions(self) -> dict[str, str]:
-        """Genera rendition set per la card artista (WebP)."""
+    def _rendition_set(self, specs: dict[str, str]) -> dict[str, str]:
+        """``{nome: url}`` per l'immagine principale, via cache delle URL."""
         if not self.main_image:
             return {}
-        try:
-            return {
-                "thumbnail": self.main_image.get_rendition("fill-400x533|format-webp").url,
-                "card": self.main_image.get_rendition("fill-600x800|format-webp").url,
-                "card_2x": self.main_image.get_rendition("fill-1200x1600|format-webp").url,
-                "og": self.main_image.get_rendition("fill-1200x630|format-webp").url,
-            }
-        except Exception:
+        urls = cached_rendition_urls((self.main_image, spec) for spec in specs.values())
+        if not all(urls.values()):
             return {}
+        return {name: urls[(self.main_image.id, spec)] for name, spec in specs.items()}
+
+    @property
+    def card_image_renditions(self) -> dict[str, str]:
+        """Genera rendition set per la card artista (WebP)."""
+        return self._rendition_set(ARTIST_CARD_SPECS)
 
     @property
     def hero_image_renditions(self) -> dict[str, str]:
         """Rendition set per l'hero image nel detail (WebP)."""
-        img = self.main_image
-        if not img:
-            return {}
-        try:
-            return {
-                "mobile": img.get_rendition("fill-800x1000|format-webp").url,
-                "desktop": img.get_rendition("fill-1200x1600|format-webp").url,
-                "desktop_2x": img.get_rendition("fill-2400x3200|format-webp").url,
-            }
-        except Exception:
-            return {}
+        return self._rendition_set(ARTIST_HERO_SPECS)
 
     @property
     def card_image_url(self) -> str | None:
@@ -439,3 +426,57 @@ class ArtistPage(Page):
         if self.pk:
             invalidate_model_cache("ArtistPage", self.pk)
         super().save(*args, **kwargs)
+
+
+class ArtistRenderedBody(models.Model):
+    """HTML del body di un ArtistPage renderizzato alla pubblicazione.
+
+    Valido solo finche' ``revision_id`` coincide con ``live_revision_id``
+    della pagina (vedi ``artists.body_html``).
+    """
+
+    page = models.OneToOneField(
+        "artists.ArtistPage",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="rendered_body",
+    )
+    revision_id = models.PositiveIntegerField(verbose_name=_("Revisione"))
+    html = models.TextField(blank=True)
+    rendered_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _("Body HTML renderizzato")
+        verbose_name_plural = _("Body HTML renderizzati")
+
+    def __str__(self) -> str:
+        return f"Body HTML {self.page_id} (rev. {self.revision_id})"
+
+
+class ArtistDailyRank(models.Model):
+    """Posizione di un artista nella rotazione giornaliera del roster.
+
+    Una riga per (seed, artista), calcolata una volta per giorno
+    (vedi ``artists.rotation``): il roster si ordina per ``rank``.
+    """
+
+    seed = models.CharField(max_length=10)
+    page = models.ForeignKey(
+        "artists.ArtistPage",
+        on_delete=models.CASCADE,
+        related_name="daily_ranks",
+    )
+    rank = models.PositiveIntegerField()
+
+    class Meta:
+        verbose_name = _("Posizione rotazione giornaliera")
+        verbose_name_plural = _("Posizioni rotazione giornaliera")
+        constraints = [
+            models.UniqueConstraint(fields=["seed", "page"], name="artists_daily_rank_seed_page"),
+        ]
+        indexes = [
+            models.Index(fields=["seed", "rank"], name="artists_daily_rank_seed_rank"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.seed} #{self.rank}: {self.page_id}"
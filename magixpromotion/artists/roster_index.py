@@ -0,0 +1,272 @@
+"""Indice bitmap in memoria per i filtri del roster.
+
+Ogni artista pubblicato ha uno slot; per ogni valore di filtro (tipologia,
+genere, evento target, regione, paese, lingua) l'indice tiene un intero
+Python usato come bitmap degli slot. Un filtro si risolve con AND/OR tra
+interi e la lista di pk si passa al queryset (``pk__in``): niente JOIN
+sulle tabelle m2m ne' ``icontains`` su ``base_region`` nella query della
+pagina. Il queryset mantiene comunque i suoi filtri (live, public, lingua),
+quindi un indice un po' indietro non mostra mai artisti ritirati.
+
+L'indice vive in ogni processo. Pubblicazione, ritiro ed eliminazione di un
+artista incrementano la generazione ``roster_index`` e salvano in cache il
+pk modificato sotto quella generazione: alla richiesta successiva ogni
+processo ricarica solo quegli artisti. Se manca un passaggio (cache
+svuotata, troppe modifiche, ``invalidate_roster_index``) o l'indice ha piu'
+di ``INDEX_MAX_AGE`` secondi, viene ricostruito da zero.
+
+Genere ed evento target accettano piu' slug separati da virgola: basta uno
+dei valori (OR), oppure tutti con ``match_all`` (AND).
+"""
+import threading
+import time
+from collections import defaultdict
+
+from django.core.cache import cache
+
+from core.cache import bump_cache_generation, get_cache_generation
+
+ROSTER_INDEX_GENERATION = "roster_index"
+
+# Ricostruzione completa anche senza publish (es. restrizioni di visibilita')
+INDEX_MAX_AGE = 600
+# Oltre questo numero di modifiche conviene ricostruire da zero
+MAX_INCREMENTAL_CHANGES = 200
+CHANGE_TTL = 60 * 60
+
+# Faccetta -> campo ``values()`` (le m2m producono una riga per valore)
+INDEX_FIELDS = {
+    "artist_type": "artist_type",
+    "genre": "genres__slug",
+    "target_event": "target_events__slug",
+    "region": "base_region",
+    "country": "base_country",
+    "locale": "locale__language_code",
+}
+
+
+def _change_key(generation: int) -> str:
+    return f"roster_index:change:{generation}"
+
+
+def record_roster_change(pk: int) -> None:
+    """Artista modificato: i processi aggiorneranno solo il suo slot."""
+    generation = bump_cache_generation(ROSTER_INDEX_GENERATION)
+    cache.set(_change_key(generation), pk, CHANGE_TTL)
+
+
+def invalidate_roster_index() -> None:
+    """Forza la ricostruzione completa (es. slug di un genere cambiato)."""
+    bump_cache_generation(ROSTER_INDEX_GENERATION)
+
+
+def split_filter_values(value: str | None) -> list[str]:
+    """Valori di un filtro multi-selezione (``rock,jazz``), senza vuoti."""
+    if not value:
+        return []
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+def load_roster_rows(pks=None) -> dict[int, dict[str, set]]:
+    """Valori indicizzati degli artisti live e pubblici (solo ``pks`` se dato)."""
+    from artists.models import ArtistPage
+
+    queryset = ArtistPage.objects.live().public()
+    if pks is not None:
+        queryset = queryset.filter(pk__in=pks)
+
+    rows = {}
+    for record in queryset.values("pk", *INDEX_FIELDS.values()):
+        row = rows.setdefault(record["pk"], {facet: set() for facet in INDEX_FIELDS})
+        for facet, field in INDEX_FIELDS.items():
+            if record[field]:
+                row[facet].add(record[field])
+    return rows
+
+
+class RosterIndex:
+    """Bitmap degli slot degli artisti per ogni valore di filtro."""
+
+    def __init__(self):
+        self._pks: list[int] = []
+        self._slots: dict[int, int] = {}
+        self._live = 0
+        self._bitmaps: dict[str, dict[str, int]] = {
+            facet: defaultdict(int) for facet in INDEX_FIELDS
+        }
+
+    def __len__(self) -> int:
+        return self._live.bit_count()
+
+    def copy(self) -> "RosterIndex":
+        clone = RosterIndex()
+        clone._pks = list(self._pks)
+        clone._slots = dict(self._slots)
+        clone._live = self._live
+        clone._bitmaps = {
+            facet: defaultdict(int, bitmaps) for facet, bitmaps in self._bitmaps.items()
+        }
+        return clone
+
+    def add(self, pk: int, row: dict[str, set]) -> None:
+        slot = self._slots.get(pk)
+        if slot is None:
+            slot = self._slots[pk] = len(self._pks)
+            self._pks.append(pk)
+        bit = 1 << slot
+        self._live |= bit
+        for facet, values in row.items():
+            for value in values:
+                self._bitmaps[facet][value] |= bit
+
+    def remove(self, pk: int) -> None:
+        """Libera lo slot dell'artista (resta vuoto fino alla ricostruzione)."""
+        slot = self._slots.get(pk)
+        if slot is None:
+            return
+        mask = ~(1 << slot)
+        self._live &= mask
+        for bitmaps in self._bitmaps.values():
+            for value in [value for value, bits in bitmaps.items() if bits & ~mask]:
+                bitmaps[value] &= mask
+                if not bitmaps[value]:
+                    del bitmaps[value]
+
+    def _any(self, facet: str, values) -> int:
+        bits = 0
+        for value in values:
+            bits |= self._bitmaps[facet].get(value, 0)
+        return bits
+
+    def _all(self, facet: str, values) -> int:
+        bits = self._live
+        for value in values:
+            bits &= self._bitmaps[facet].get(value, 0)
+        return bits
+
+    def _region(self, region: str) -> int:
+        # Come ``base_region__icontains``: OR delle regioni che contengono il testo
+        needle = region.lower()
+        return self._any(
+            "region", [value for value in self._bitmaps["region"] if needle in value.lower()]
+        )
+
+    def _ids(self, bits: int) -> list[int]:
+        ids = []
+        while bits:
+            low = bits & -bits
+            ids.append(self._pks[low.bit_length() - 1])
+            bits ^= low
+        return sorted(ids)
+
+    def filter_ids(
+        self,
+        *,
+        artist_type: str | None = None,
+        genres=(),
+        target_events=(),
+        region: str | None = None,
+        country: str | None = None,
+        locale: str | None = None,
+        match_all: bool = False,
+    ) -> list[int]:
+        """Pk ordinati degli artisti che soddisfano tutti i filtri dati."""
+        combine = self._all if match_all else self._any
+        bits = self._live
+        if artist_type:
+            bits &= self._any("artist_type", [artist_type])
+        if genres:
+            bits &= combine("genre", genres)
+        if target_events:
+            bits &= combine("target_event", target_events)
+        if region:
+            bits &= self._region(region)
+        if country:
+            bits &= self._any("country", [country])
+        if locale:
+            bits &= self._any("locale", [locale])
+        return self._ids(bits)
+
+
+def build_roster_index() -> RosterIndex:
+    index = RosterIndex()
+    for pk, row in load_roster_rows().items():
+        index.add(pk, row)
+    return index
+
+
+def _apply_changes(index: RosterIndex, pks) -> RosterIndex:
+    """Copia dell'indice con gli artisti ``pks`` ricaricati."""
+    index = index.copy()
+    rows = load_roster_rows(pks)
+    for pk in pks:
+        index.remove(pk)
+        if pk in rows:
+            index.add(pk, rows[pk])
+    return index
+
+
+_index: tuple[int, float, RosterIndex] | None = None
+_index_lock = threading.Lock()
+
+
+def _changed_pks(since: int, generation: int):
+    """Pk modificati tra due generazioni, o None se manca un passaggio."""
+    if not 0 < generation - since <= MAX_INCREMENTAL_CHANGES:
+        return None
+    keys = [_change_key(g) for g in range(since + 1, generation + 1)]
+    changes = cache.get_many(keys)
+    if len(changes) != len(keys):
+        return None
+    return set(changes.values())
+
+
+def get_roster_index() -> RosterIndex:
+    """Indice del processo, aggiornato alla generazione corrente."""
+    global _index
+
+    generation = get_cache_generation(ROSTER_INDEX_GENERATION)
+    entry = _index
+    if (
+        entry is not None
+        and entry[0] == generation
+        and time.monotonic() - entry[1] < INDEX_MAX_AGE
+    ):
+        return entry[2]
+
+    with _index_lock:
+        entry = _index
+        if entry is not None and time.monotonic() - entry[1] < INDEX_MAX_AGE:
+            if entry[0] == generation:
+                return entry[2]
+            pks = _changed_pks(entry[0], generation)
+            if pks is not None:
+                # Stessa eta': la ricostruzione completa periodica non slitta
+                _index = (generation, entry[1], _apply_changes(entry[2], pks))
+                return _index[2]
+        _index = (generation, time.monotonic(), build_roster_index())
+        return _index[2]
+
+
+def roster_filter_ids(
+    *,
+    artist_type=None,
+    genres=(),
+    target_events=(),
+    region=None,
+    country=None,
+    locale=None,
+    match_all=False,
+) -> list[int] | None:
+    """Pk degli artisti per i filtri dati, o None se non c'e' nessun filtro."""
+    if not (artist_type or genres or target_events or region or country):
+        return None
+    return get_roster_index().filter_ids(
+        artist_type=artist_type,
+        genres=genres,
+        target_events=target_events,
+        region=region,
+        country=country,
+        locale=locale,
+        match_all=match_all,
+    )
@@ -0,0 +1,120 @@
+"""Rotazione giornaliera del roster (parametro ``daily_seed`` dell'API).
+
+La permutazione del giorno e' quella di sempre, ``MD5(pk || seed)``, ma viene
+calcolata una sola volta (task Celery a mezzanotte, o alla prima richiesta)
+e salvata in ``ArtistDailyRank``: il listing si ordina per un intero
+indicizzato invece di calcolare e ordinare un hash per riga a ogni pagina.
+
+Solo i seed vicini a oggi hanno la tabella; gli altri usano ancora l'hash.
+Gli artisti creati dopo il calcolo vanno in coda, ordinati per pk.
+"""
+import datetime
+import hashlib
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import CharField, F, FilteredRelation, Q, Value
+from django.db.models.functions import MD5, Cast, Coalesce, Concat
+from django.utils import timezone
+
+# Seed con rotazione precalcolata: oggi +/- DAILY_ROTATION_WINDOW giorni
+DAILY_ROTATION_WINDOW = 1
+DAILY_ROTATION_KEEP_DAYS = 3
+DAILY_ROTATION_READY_TTL = 60 * 60 * 24 * 2
+DAILY_ROTATION_BUILD_LOCK_TIMEOUT = 60
+# Posizione degli artisti assenti dalla rotazione precalcolata
+UNRANKED = 2**31 - 1
+
+
+def _ready_key(seed: str) -> str:
+    return f"artists:daily-rotation:{seed}:ready"
+
+
+def rotation_sort_key(pk: int, seed: str) -> str:
+    """Chiave di ordinamento di un artista: ``MD5(pk || seed)`` come in SQL."""
+    return hashlib.md5(f"{pk}{seed}".encode()).hexdigest()
+
+
+def seed_has_rotation(seed: str) -> bool:
+    """True se il seed e' una data abbastanza vicina a oggi da precalcolare."""
+    try:
+        day = datetime.date.fromisoformat(seed)
+    except ValueError:
+        return False
+    return abs((day - timezone.localdate()).days) <= DAILY_ROTATION_WINDOW
+
+
+def build_daily_rotation(seed: str) -> int:
+    """Calcola e salva le posizioni del giorno; elimina i seed vecchi."""
+    from artists.models import ArtistDailyRank, ArtistPage
+
+    pks = sorted(
+        ArtistPage.objects.values_list("pk", flat=True),
+        key=lambda pk: rotation_sort_key(pk, seed),
+    )
+    with transaction.atomic():
+        ArtistDailyRank.objects.filter(seed=seed).delete()
+        ArtistDailyRank.objects.bulk_create(
+            ArtistDailyRank(seed=seed, page_id=pk, rank=rank)
+            for rank, pk in enumerate(pks)
+        )
+        oldest = timezone.localdate() - datetime.timedelta(days=DAILY_ROTATION_KEEP_DAYS)
+        ArtistDailyRank.objects.filter(seed__lt=oldest.isoformat()).delete()
+    transaction.on_commit(lambda: cache.set(_ready_key(seed), True, DAILY_ROTATION_READY_TTL))
+    return len(pks)
+
+
+def ensure_daily_rotation(seed: str) -> bool:
+    """True se le posizioni del seed sono pronte, calcolandole se serve.
+
+    Se un altro worker le sta gia' calcolando ritorna False: la richiesta
+    usa l'hash per riga (stesso ordine) invece di aspettare.
+    """
+    from artists.models import ArtistDailyRank
+
+    if not seed_has_rotation(seed):
+        return False
+    if cache.get(_ready_key(seed)):
+        return True
+    if ArtistDailyRank.objects.filter(seed=seed).exists():
+        cache.set(_ready_key(seed), True, DAILY_ROTATION_READY_TTL)
+        return True
+
+    lock_key = f"{_ready_key(seed)}:lock"
+    if not cache.add(lock_key, True, DAILY_ROTATION_BUILD_LOCK_TIMEOUT):
+        return False
+    try:
+        build_daily_rotation(seed)
+    finally:
+        cache.delete(lock_key)
+    return True
+
+
+def order_by_daily_rotation(qs, seed: str):
+    """Ordina il queryset degli artisti secondo la rotazione del seed.
+
+    La posizione del giorno e' nell'annotazione ``daily_order`` (usata come
+    chiave dalla paginazione a cursore), sempre seguita dal pk.
+    """
+    if ensure_daily_rotation(seed):
+        return qs.annotate(
+            rotation=FilteredRelation("daily_ranks", condition=Q(daily_ranks__seed=seed)),
+            # Artisti creati dopo il calcolo: in coda
+            daily_order=Coalesce(F("rotation__rank"), Value(UNRANKED)),
+        ).order_by("daily_order", "pk")
+
+    return qs.annotate(
+        daily_order=MD5(
+            Concat(
+                Cast("pk", output_field=CharField()),
+                Value(seed),
+                output_field=CharField(),
+            )
+        )
+    ).order_by("daily_order", "pk")
+
+
+def daily_order_mode(qs) -> str:
+    """``rank`` o ``md5``: come ``order_by_daily_rotation`` ha ordinato ``qs``."""
+    output_field = qs.query.annotations["daily_order"].output_field
+    return "md5" if isinstance(output_field, CharField) else "rank"
@@ -2,6 +2,8 @@
 import json
 from typing import Any
 
+from core.renditions import ARTIST_JSONLD_SPEC, rendition_url
+
 
 def artist_jsonld(page) -> str:
     """Genera JSON-LD Schema.org/MusicGroup per una ArtistPage.
@@ -21,11 +23,9 @@ def artist_jsonld(page) -> str:
     }
 
     # Immagine principale
-    if page.main_image:
-        try:
-            data["image"] = page.main_image.get_rendition("fill-800x600").url
-        except Exception:
-            pass
+    image_url = rendition_url(page.main_image, ARTIST_JSONLD_SPEC)
+    if image_url:
+        data["image"] = image_url
 
     # Video promo
     if page.hero_video_url:
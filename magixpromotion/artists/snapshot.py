@@ -0,0 +1,205 @@
+"""Snapshot statico del roster per lingua, servito da Nginx senza Django.
+
+Il task ``build_roster_snapshot`` scrive per ogni lingua il roster completo
+nel formato del listing API (profilo ``card``, placeholder LQIP compresi)
+in ``MEDIA_ROOT/roster/roster.<lingua>.<hash>.json``, con accanto le
+varianti ``.gz`` e ``.br`` gia' compresse (``gzip_static``/``brotli_static``).
+Il nome contiene l'hash del contenuto: il file non cambia mai e si puo'
+servire con cache ``immutable``. Se il contenuto non cambia l'hash resta
+lo stesso e non si riscrive nulla.
+
+Il manifest (``/api/v2/roster/``) dice al client quale hash e' corrente;
+resta in cache e in ``roster/manifest.json``. Si conservano le ultime
+``ROSTER_SNAPSHOT_KEEP`` versioni per lingua, per i client con un
+manifest appena precedente.
+
+Se il listing contiene URL immagine provvisorie (renditions in generazione,
+vedi ``core.renditions``) lo snapshot non viene scritto e il task riprova:
+resta valido quello precedente.
+
+Senza il pacchetto ``brotli`` si scrive solo la variante gzip.
+"""
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone, translation
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dipende dall'ambiente
+    brotli = None
+
+ROSTER_SNAPSHOT_DIR = "roster"
+ROSTER_SNAPSHOT_KEEP = 3
+ROSTER_SNAPSHOT_PROFILE = "card"
+# Attesa prima della ricostruzione: piu' pubblicazioni ravvicinate, un task solo
+ROSTER_SNAPSHOT_DELAY = 10
+# Il task toglie il flag all'avvio; la scadenza copre solo un task perso
+ROSTER_SNAPSHOT_QUEUED_TIMEOUT = 300
+MANIFEST_CACHE_KEY = "artists:roster-snapshot:manifest"
+_QUEUED_KEY = "artists:roster-snapshot:queued"
+
+
+class SnapshotNotReady(RuntimeError):
+    """Renditions ancora in generazione: lo snapshot va riprovato piu' tardi."""
+
+
+def snapshot_dir() -> Path:
+    return Path(settings.MEDIA_ROOT) / ROSTER_SNAPSHOT_DIR
+
+
+def _snapshot_name(locale_code: str, digest: str) -> str:
+    return f"roster.{locale_code}.{digest}.json"
+
+
+def _listing_page(locale_code: str, cursor: str) -> dict:
+    """Una pagina del listing artisti, chiamando la view come farebbe il client."""
+    from django.contrib.auth.models import AnonymousUser
+    from django.test import RequestFactory
+    from django.urls import resolve, reverse
+
+    from core.renditions import degraded_renditions, reset_degraded_renditions
+
+    base_url = urlparse(getattr(settings, "WAGTAILADMIN_BASE_URL", "") or "http://localhost")
+    path = reverse("wagtailapi:artists:listing")
+    request = RequestFactory().get(
+        path,
+        {
+            "profile": ROSTER_SNAPSHOT_PROFILE,
+            "locale": locale_code,
+            "limit": getattr(settings, "WAGTAILAPI_LIMIT_MAX", 20) or 20,
+            "cursor": cursor,
+        },
+        HTTP_HOST=base_url.netloc,
+        secure=base_url.scheme == "https",
+    )
+    request.user = AnonymousUser()
+    reset_degraded_renditions()
+    response = resolve(path).func(request)
+    response.render()
+    if response.status_code != 200:
+        raise RuntimeError(
+            f"Snapshot roster {locale_code}: listing artisti HTTP {response.status_code}"
+        )
+    if degraded_renditions():
+        # URL immagine provvisorie: uno snapshot immutable le terrebbe per sempre
+        raise SnapshotNotReady(f"Snapshot roster {locale_code}: renditions in generazione")
+    return json.loads(response.content)
+
+
+def roster_items(locale_code: str) -> list[dict]:
+    """Tutti gli artisti della lingua in ordine di titolo (paginazione a cursore)."""
+    items = []
+    cursor = ""
+    with translation.override(locale_code):
+        while cursor is not None:
+            page = _listing_page(locale_code, cursor)
+            items += page["items"]
+            cursor = page["meta"]["next"]
+    return items
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def _prune(locale_code: str, current: str) -> None:
+    """Elimina le versioni piu' vecchie oltre ``ROSTER_SNAPSHOT_KEEP``."""
+    versions = sorted(
+        snapshot_dir().glob(f"roster.{locale_code}.*.json"),
+        key=lambda path: path.stat().st_mtime,
+        reverse=True,
+    )
+    stale = [path for path in versions if path.name != current][ROSTER_SNAPSHOT_KEEP - 1:]
+    for path in stale:
+        for variant in (path, Path(f"{path}.gz"), Path(f"{path}.br")):
+            variant.unlink(missing_ok=True)
+
+
+def write_roster_snapshot(locale_code: str) -> dict:
+    """Scrive (se cambiato) lo snapshot della lingua; ritorna la voce del manifest."""
+    items = roster_items(locale_code)
+    data = json.dumps(
+        {"meta": {"total_count": len(items)}, "items": items},
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode()
+    digest = hashlib.sha256(data).hexdigest()[:16]
+    name = _snapshot_name(locale_code, digest)
+    path = snapshot_dir() / name
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if not path.exists():
+        # Prima le varianti compresse: quando c'e' il .json sono gia' pronte
+        _write_atomic(Path(f"{path}.gz"), gzip.compress(data, compresslevel=9, mtime=0))
+        if brotli is not None:
+            _write_atomic(Path(f"{path}.br"), brotli.compress(data, quality=11))
+        _write_atomic(path, data)
+    else:
+        # Stesso contenuto: diventa la versione piu' recente per _prune
+        path.touch()
+    _prune(locale_code, name)
+
+    return {
+        "hash": digest,
+        "url": f"{settings.MEDIA_URL}{ROSTER_SNAPSHOT_DIR}/{name}",
+        "count": len(items),
+        "bytes": len(data),
+    }
+
+
+def build_roster_snapshots() -> dict:
+    """Snapshot di tutte le lingue e nuovo manifest."""
+    from wagtail.models import Locale
+
+    # Le pubblicazioni da qui in poi accodano una nuova ricostruzione
+    cache.delete(_QUEUED_KEY)
+    manifest = {
+        "generated_at": timezone.now().isoformat(),
+        "locales": {
+            locale_code: write_roster_snapshot(locale_code)
+            for locale_code in Locale.objects.order_by("language_code").values_list(
+                "language_code", flat=True
+            )
+        },
+    }
+    _write_atomic(snapshot_dir() / "manifest.json", json.dumps(manifest).encode())
+    cache.set(MANIFEST_CACHE_KEY, manifest, None)
+    return manifest
+
+
+def get_roster_manifest() -> dict | None:
+    """Manifest corrente: dalla cache, altrimenti dal file su disco."""
+    manifest = cache.get(MANIFEST_CACHE_KEY)
+    if manifest is None:
+        try:
+            manifest = json.loads((snapshot_dir() / "manifest.json").read_bytes())
+        except (OSError, ValueError):
+            return None
+        cache.set(MANIFEST_CACHE_KEY, manifest, None)
+    return manifest
+
+
+def schedule_roster_snapshot() -> None:
+    """Accoda la ricostruzione (una sola per ``ROSTER_SNAPSHOT_DELAY`` secondi)."""
+    from artists.tasks import build_roster_snapshot
+
+    if not getattr(settings, "ROSTER_SNAPSHOT", True):
+        return
+    if cache.add(_QUEUED_KEY, True, ROSTER_SNAPSHOT_QUEUED_TIMEOUT):
+        build_roster_snapshot.apply_async(countdown=ROSTER_SNAPSHOT_DELAY)
@@ -0,0 +1,70 @@
+"""Task Celery per gli artisti."""
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def render_artist_body_html(self, page_id: int, revision_id: int) -> dict:
+    """
+    Renderizza e salva il body HTML di un artista per la revisione pubblicata.
+
+    Se nel frattempo e' stata pubblicata un'altra revisione non fa nulla:
+    ci pensa il task lanciato da quella pubblicazione.
+    """
+    from artists.body_html import store_body_html
+    from artists.models import ArtistPage
+
+    page = ArtistPage.objects.filter(pk=page_id).first()
+    if page is None or page.live_revision_id != revision_id:
+        logger.info("Body HTML artista %s: revisione %s non piu' live.", page_id, revision_id)
+        return {"page_id": page_id, "revision_id": revision_id, "rendered": False}
+
+    try:
+        store_body_html(page)
+    except Exception as exc:
+        raise self.retry(exc=exc)
+
+    return {"page_id": page_id, "revision_id": revision_id, "rendered": True}
+
+
+@shared_task
+def build_daily_rotation() -> dict:
+    """
+    Precalcola la rotazione del roster per la data di oggi (beat a mezzanotte).
+
+    Il client manda come seed la data UTC, che in Italia cambia dopo la
+    mezzanotte locale: a quell'ora la rotazione del giorno e' gia' pronta.
+    """
+    from django.utils import timezone
+
+    from artists.rotation import build_daily_rotation as build
+
+    seed = timezone.localdate().isoformat()
+    count = build(seed)
+    logger.info("Rotazione giornaliera %s calcolata per %d artisti.", seed, count)
+    return {"seed": seed, "artists": count}
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def build_roster_snapshot(self) -> dict:
+    """
+    Scrive gli snapshot statici del roster (JSON, gzip, brotli) per ogni lingua.
+
+    Accodato dopo pubblicazioni e ritiri (vedi ``artists.snapshot``) e
+    ogni notte, per le modifiche che non passano da una pubblicazione.
+    Con renditions ancora in generazione riprova piu' tardi.
+    """
+    from artists.snapshot import SnapshotNotReady, build_roster_snapshots
+
+    try:
+        manifest = build_roster_snapshots()
+    except SnapshotNotReady as exc:
+        raise self.retry(exc=exc)
+    for locale_code, entry in manifest["locales"].items():
+        logger.info(
+            "Snapshot roster %s: %d artisti, hash %s.", locale_code, entry["count"], entry["hash"]
+        )
+    return {locale_code: entry["hash"] for locale_code, entry in manifest["locales"].items()}
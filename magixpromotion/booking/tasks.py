@@ -34,9 +34,25 @@ def archive_past_events(self) -> dict:
         logger.info("Nessun evento da archiviare.")
         return {"archived": 0, "date": str(yesterday)}
 
-    updated = events_to_archive.update(is_archived=True)
+    archived_ids = list(events_to_archive.values_list("pk", flat=True))
+    updated = EventPage.objects.filter(pk__in=archived_ids).update(is_archived=True)
     logger.info("Archiviati %d eventi con data precedente a %s.", updated, yesterday)
 
+    # update() non emette segnali: gli eventi archiviati escono dalla ricerca
+    # e dalle risposte API in cache
+    from core.cache import bump_cache_generation
+    from core.conditional import EVENTS, touch_content_versions_on_commit
+    from core.response_cache import (
+        CALENDAR_KEY,
+        event_key,
+        purge_surrogate_keys_on_commit,
+    )
+    from core.search_index import SEARCH_GENERATION
+
+    bump_cache_generation(SEARCH_GENERATION)
+    purge_surrogate_keys_on_commit([CALENDAR_KEY] + [event_key(pk) for pk in archived_ids])
+    touch_content_versions_on_commit([EVENTS])
+
     return {
         "archived": updated,
         "date": str(yesterday),
@@ -46,8 +62,8 @@ def archive_past_events(self) -> dict:
 @shared_task
 def send_booking_notification(submission_id: int) -> None:
     """Task asincrono per invio email di notifica booking."""
-    from wagtail.contrib.forms.models import FormSubmission
     from django.core.mail import send_mail
+    from wagtail.contrib.forms.models import FormSubmission
 
     try:
         submission = FormSubmission.objects.get(pk=submission_id)
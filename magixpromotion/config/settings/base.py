@@ -69,6 +69,7 @@ MIDDLEWARE = [
     "django.middleware.locale.LocaleMiddleware",
     "wagtail.contrib.redirects.middleware.RedirectMiddleware",
     "core.middleware.APICacheMiddleware",
+    "core.middleware.APIResponseCacheMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -150,6 +151,22 @@ WAGTAILSEARCH_BACKENDS = {
     }
 }
 
+# Fallback fuzzy della ricerca quando full-text e icontains non trovano nulla:
+# "python" = indice in memoria per processo, "trigram" = pg_trgm su PostgreSQL
+SEARCH_FUZZY_BACKEND = os.environ.get("SEARCH_FUZZY_BACKEND", "python")
+SEARCH_TRIGRAM_THRESHOLD = float(os.environ.get("SEARCH_TRIGRAM_THRESHOLD", "0.5"))
+
+# Cache server-side delle risposte API v2 anonime (core.response_cache)
+API_RESPONSE_CACHE = os.environ.get("API_RESPONSE_CACHE", "true").lower() == "true"
+
+# Snapshot statico del roster ricostruito dopo ogni pubblicazione (artists.snapshot)
+ROSTER_SNAPSHOT = os.environ.get("ROSTER_SNAPSHOT", "true").lower() == "true"
+
+# Autocomplete: sorgenti (artisti, eventi, venue, citta') in parallelo su
+# PostgreSQL con un pool di thread (0 = in sequenza) e budget per battuta
+SEARCH_AUTOCOMPLETE_WORKERS = int(os.environ.get("SEARCH_AUTOCOMPLETE_WORKERS", "4"))
+SEARCH_AUTOCOMPLETE_BUDGET_MS = int(os.environ.get("SEARCH_AUTOCOMPLETE_BUDGET_MS", "150"))
+
 # Celery
 CELERY_BROKER_URL = os.environ.get("CELERY_BROKER_URL", "redis://localhost:6379/0")
 CELERY_RESULT_BACKEND = CELERY_BROKER_URL
@@ -163,6 +180,16 @@ CELERY_BEAT_SCHEDULE = {
         "schedule": crontab(hour=3, minute=0),  # Ogni notte alle 03:00
         "options": {"expires": 3600},
     },
+    "build-daily-rotation": {
+        "task": "artists.tasks.build_daily_rotation",
+        "schedule": crontab(hour=0, minute=0),  # Ogni notte a mezzanotte
+        "options": {"expires": 3600},
+    },
+    "build-roster-snapshot": {
+        "task": "artists.tasks.build_roster_snapshot",
+        "schedule": crontab(hour=3, minute=30),  # Ogni notte alle 03:30
+        "options": {"expires": 3600},
+    },
 }
 
 # wagtail-localize machine translator
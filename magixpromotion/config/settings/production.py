@@ -137,6 +137,12 @@ LOGGING = {
             "level": "ERROR",
             "propagate": False,
         },
+        # Riga search_trace per ogni richiesta search/autocomplete
+        "core.search": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
     },
 }
 
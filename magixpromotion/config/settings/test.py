@@ -23,6 +23,9 @@ CACHES = {
 CELERY_TASK_ALWAYS_EAGER = True
 CELERY_TASK_EAGER_PROPAGATES = True
 
+# Niente snapshot del roster su disco a ogni pubblicazione (test dedicati)
+ROSTER_SNAPSHOT = False
+
 # Password hasher veloce per test
 PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
 
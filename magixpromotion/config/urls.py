@@ -12,7 +12,7 @@ from wagtail.documents import urls as wagtaildocs_urls
 from wagtail.documents.api.v2.views import DocumentsAPIViewSet
 from wagtail.images.api.v2.views import ImagesAPIViewSet
 
-from artists.api import ArtistAPIViewSet
+from artists.api import ArtistAPIViewSet, roster_snapshot_api
 from booking.views import booking_submit_api
 from core.band_finder import band_finder_api
 from core.search import autocomplete_api, search_api
@@ -37,6 +37,8 @@ urlpatterns = [
     path("api/v2/", api_router.urls),
     path("api/v2/site-settings/", include("core.api_urls")),
     path("api/v2/menu/<str:location>/", menu_api, name="menu_api"),
+    # Manifest dello snapshot statico del roster
+    path("api/v2/roster/", roster_snapshot_api, name="roster_snapshot_api"),
     # Search API
     path("api/v2/search/autocomplete/", autocomplete_api, name="autocomplete_api"),
     path("api/v2/search/", search_api, name="search_api"),
@@ -1,5 +1,6 @@
 """Fixture globali pytest per il progetto Magix Promotion."""
 import pytest
+from django.core.cache import cache
 from wagtail.models import Page, Site
 
 from tests.factories import (
@@ -12,6 +13,18 @@ from tests.factories import (
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Svuota la cache tra i test (contatori di generazione, indici, risultati)."""
+    from core.renditions import clear_rendition_url_cache
+
+    cache.clear()
+    clear_rendition_url_cache()
+    yield
+    cache.clear()
+    clear_rendition_url_cache()
+
+
 @pytest.fixture
 def home_page(db):
     """Crea una HomePage come root del sito.
@@ -3,7 +3,10 @@ from django.conf import settings as django_settings
 from django.http import JsonResponse
 from wagtail.models import Site
 
+from core.conditional import ARTISTS, EPK, IMAGES, SETTINGS, conditional_api
 
+
+@conditional_api(SETTINGS)
 def site_settings_view(request):
     """Ritorna i dati aziendali pubblici dal CMS.
 
@@ -47,6 +50,7 @@ def site_settings_view(request):
     return JsonResponse(data)
 
 
+@conditional_api(EPK, ARTISTS, IMAGES)
 def epk_list_view(request):
     """Lista tutti gli EPK pubblici per la Press Area.
 
@@ -0,0 +1,427 @@
+"""Benchmark riproducibile della ricerca su un roster sintetico.
+
+``seed_roster`` popola il database con le factory di ``tests/factories.py``
+(default 10k artisti / 200k eventi, nomi deterministici da un seed fisso,
+una quota di pagine in inglese). ``run_benchmark`` misura ``search_api``,
+``autocomplete_api`` e il fallback fuzzy su vari mix di query e ritorna
+p50/p95 della latenza, numero di query SQL e picco di memoria per ogni
+combinazione endpoint/mix. ``compare_to_baseline`` confronta il risultato
+con una baseline salvata in JSON.
+
+Da usare solo su un database dedicato: il seed crea pagine vere.
+
+``run_serializer_benchmark`` e' un micro-benchmark senza database: misura
+``get_serializer_class`` dei viewset artisti/eventi con la cache delle
+classi serializer (``core.serializers``) vuota a ogni chiamata, come prima
+della cache, e con la cache calda.
+"""
+import datetime
+import random
+import statistics
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+BENCHMARK_SEED = 1975
+BENCHMARK_SLUG_PREFIX = "bench-"
+DEFAULT_ARTISTS = 10_000
+DEFAULT_EVENTS = 200_000
+DEFAULT_ITERATIONS = 20
+
+# Tolleranza relativa su latenza e memoria; sotto BASELINE_MIN_DELTA_MS la
+# differenza di latenza e' considerata rumore. Le query SQL non hanno
+# tolleranza: una query in piu' e' sempre una regressione.
+DEFAULT_TOLERANCE = 0.25
+BASELINE_MIN_DELTA_MS = 2.0
+
+# Una pagina ogni ENGLISH_EVERY e' creata nel Locale "en"
+ENGLISH_EVERY = 10
+VENUE_COUNT = 500
+SEED_BATCH_SIZE = 500
+
+_NAME_WORDS = [
+    "Red", "Moon", "Lupi", "Neri", "Electric", "Groove", "Notte", "Blu",
+    "Fuoco", "Stelle", "Dance", "Machine", "Vintage", "Sound", "Rebel",
+    "Caffè", "Perché", "Città", "Velvet", "Garage", "Sole", "Onda", "Jolly",
+    "Swing", "Rock", "Latina", "Fiesta", "Diavoli", "Gatti", "Tempesta",
+]
+_TRIBUTES = [
+    "Queen", "Vasco Rossi", "Ligabue", "Pooh", "Nomadi", "Pink Floyd",
+    "Lucio Dalla", "Mina", "Zucchero", "Renato Zero", "Fabrizio De André",
+    "Lucio Battisti", "U2", "Depeche Mode", "Bon Jovi", "Litfiba",
+]
+_GENRES = [
+    "Dance Show Band", "Tributo Italiano", "Tributo Internazionale",
+    "Rock Band", "Liscio", "Jazz", "Latino Americano", "Anni 80",
+]
+_CITIES = [
+    ("Milano", "Lombardia"), ("Cantù", "Lombardia"), ("Torino", "Piemonte"),
+    ("Alessandria", "Piemonte"), ("Genova", "Liguria"), ("Forlì", "Emilia-Romagna"),
+    ("Città di Castello", "Umbria"), ("Canicattì", "Sicilia"),
+    ("Saint-Vincent", "Valle d'Aosta"), ("Bolzano", "Trentino-Alto Adige"),
+]
+_EVENT_WORDS = ["Live", "Festa", "Notte", "Concerto", "Serata", "Tour", "Party"]
+
+# Mix di query: (nome, parametri GET). Le query "accented" cercano senza
+# accento valori che lo hanno (e viceversa).
+QUERY_MIXES = {
+    "exact": [{"q": "Vasco Rossi"}, {"q": "Red Moon"}, {"q": "Pink Floyd"}],
+    "prefix": [{"q": "vas"}, {"q": "pin"}, {"q": "lig"}],
+    "typo": [{"q": "vasko"}, {"q": "ligabeu"}, {"q": "qeen"}],
+    "accented": [{"q": "cantu"}, {"q": "forlì"}, {"q": "de andre"}],
+    "other_locale": [
+        {"q": "Queen", "locale": "en"},
+        {"q": "vasko", "locale": "en"},
+    ],
+}
+
+
+def _percentile(values, percent):
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+def _artist_values(rng):
+    """Titolo, tipo, tributo e bio di un artista sintetico."""
+    artist_type = rng.choice(["show_band", "tribute", "original", "dj", "cover"])
+    tribute_to = rng.choice(_TRIBUTES) if artist_type == "tribute" else ""
+    words = rng.sample(_NAME_WORDS, rng.randint(1, 3))
+    if tribute_to:
+        title = f"{tribute_to} {' '.join(words)}"
+    else:
+        title = " ".join(words)
+    city, region = rng.choice(_CITIES)
+    short_bio = f"{' '.join(rng.sample(_NAME_WORDS, 4))} da {city}."
+    return {
+        "title": title,
+        "artist_type": artist_type,
+        "tribute_to": tribute_to,
+        "short_bio": short_bio,
+        "base_city": city,
+        "base_region": region,
+    }
+
+
+def _home_page():
+    """Home del sito (creata se il database e' vuoto)."""
+    from wagtail.models import Page
+
+    from core.models import HomePage
+    from tests.factories import HomePageFactory
+
+    home = HomePage.objects.first()
+    if home is None:
+        home = HomePageFactory(parent=Page.get_first_root_node(), slug=f"{BENCHMARK_SLUG_PREFIX}home")
+    return home
+
+
+def _listing(model, factory, home, locale, slug):
+    listing = model.objects.filter(locale=locale).first()
+    if listing is None:
+        listing = factory(parent=home, locale=locale, slug=slug)
+    return listing
+
+
+def seed_roster(artists=DEFAULT_ARTISTS, events=DEFAULT_EVENTS, seed=BENCHMARK_SEED, log=None):
+    """Crea il roster sintetico; le pagine gia' presenti non vengono ricreate.
+
+    I valori dell'i-esima pagina dipendono solo da ``seed`` e ``i``, quindi
+    un seed interrotto puo' essere ripreso ottenendo lo stesso database.
+    """
+    from wagtail.models import Locale
+
+    from artists.models import ArtistListingPage, ArtistPage
+    from events.models import EventListingPage, EventPage, Venue
+    from tests.factories import (
+        ArtistListingPageFactory,
+        ArtistPageFactory,
+        EventListingPageFactory,
+        EventPageFactory,
+        GenreFactory,
+        VenueFactory,
+    )
+
+    log = log or (lambda message: None)
+    locales = {
+        "it": Locale.objects.get_or_create(language_code="it")[0],
+        "en": Locale.objects.get_or_create(language_code="en")[0],
+    }
+    home = _home_page()
+    artist_listings = {
+        code: _listing(
+            ArtistListingPage, ArtistListingPageFactory, home, locale,
+            f"{BENCHMARK_SLUG_PREFIX}artisti-{code}",
+        )
+        for code, locale in locales.items()
+    }
+    event_listings = {
+        code: _listing(
+            EventListingPage, EventListingPageFactory, home, locale,
+            f"{BENCHMARK_SLUG_PREFIX}eventi-{code}",
+        )
+        for code, locale in locales.items()
+    }
+    genres = [GenreFactory(name=name) for name in _GENRES]
+
+    venues = list(Venue.objects.filter(name__startswith="Bench Venue").order_by("id"))
+    for idx in range(len(venues), VENUE_COUNT):
+        city, region = random.Random(seed * 7 + idx).choice(_CITIES)
+        venues.append(VenueFactory(name=f"Bench Venue {idx}", city=city, region=region))
+
+    def _locale_code(idx):
+        return "en" if idx % ENGLISH_EVERY == 0 else "it"
+
+    artist_ids = list(
+        ArtistPage.objects.filter(slug__startswith=BENCHMARK_SLUG_PREFIX)
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+    for start in range(len(artist_ids), artists, SEED_BATCH_SIZE):
+        with transaction.atomic():
+            for idx in range(start, min(start + SEED_BATCH_SIZE, artists)):
+                rng = random.Random(seed * 1_000_003 + idx)
+                code = _locale_code(idx)
+                page = ArtistPageFactory(
+                    parent=artist_listings[code],
+                    locale=locales[code],
+                    slug=f"{BENCHMARK_SLUG_PREFIX}artist-{idx}",
+                    **_artist_values(rng),
+                )
+                page.genres.add(*rng.sample(genres, rng.randint(1, 2)))
+                artist_ids.append(page.id)
+        log(f"Artisti: {min(start + SEED_BATCH_SIZE, artists)}/{artists}")
+
+    today = timezone.localdate()
+    existing_events = EventPage.objects.filter(slug__startswith=BENCHMARK_SLUG_PREFIX).count()
+    for start in range(existing_events, events, SEED_BATCH_SIZE):
+        with transaction.atomic():
+            for idx in range(start, min(start + SEED_BATCH_SIZE, events)):
+                rng = random.Random(seed * 2_000_003 + idx)
+                code = _locale_code(idx)
+                venue = rng.choice(venues)
+                EventPageFactory(
+                    parent=event_listings[code],
+                    locale=locales[code],
+                    title=f"{rng.choice(_EVENT_WORDS)} {rng.choice(_NAME_WORDS)} {venue.city}",
+                    slug=f"{BENCHMARK_SLUG_PREFIX}event-{idx}",
+                    description=f"<p>{' '.join(rng.sample(_NAME_WORDS, 6))}</p>",
+                    start_date=today + datetime.timedelta(days=rng.randint(1, 365)),
+                    related_artist_id=rng.choice(artist_ids) if artist_ids else None,
+                    venue=venue,
+                )
+        log(f"Eventi: {min(start + SEED_BATCH_SIZE, events)}/{events}")
+
+
+def _fuzzy_view(request):
+    """Solo il fallback fuzzy (artisti + eventi), senza HTTP ne' cache."""
+    from core.search import (
+        _fuzzy_match_artists,
+        _fuzzy_match_events,
+        _resolve_locale_code,
+    )
+
+    locale_code = _resolve_locale_code(request)
+    query_string = request.GET["q"]
+    return (
+        _fuzzy_match_artists(locale_code, query_string, 10)
+        + _fuzzy_match_events(locale_code, query_string, 10)
+    )
+
+
+def _targets():
+    """Endpoint misurati: nome -> (view, parametri fissi, chiave cache risultati)."""
+    from core.search import (
+        AUTOCOMPLETE_TYPES,
+        _results_cache_key,
+        autocomplete_api,
+        search_api,
+    )
+
+    return {
+        "search": (
+            search_api,
+            {"type": "all", "limit": "10"},
+            lambda q, locale: _results_cache_key("search", q, "all", locale, 10),
+        ),
+        "autocomplete": (
+            autocomplete_api,
+            {"limit": "5"},
+            lambda q, locale: _results_cache_key(
+                "autocomplete", q, locale, 5, ",".join(AUTOCOMPLETE_TYPES)
+            ),
+        ),
+        "fuzzy": (_fuzzy_view, {}, None),
+    }
+
+
+def run_benchmark(iterations=DEFAULT_ITERATIONS, mixes=None):
+    """Misura ogni endpoint su ogni mix di query.
+
+    La cache dei risultati viene saltata (la chiave e' cancellata prima di
+    ogni chiamata), gli indici fuzzy sono scaldati da un giro iniziale non
+    misurato. Latenza: ``iterations`` giri senza strumentazione; query SQL e
+    picco di memoria: un giro separato con ``CaptureQueriesContext`` e
+    ``tracemalloc``.
+    """
+    from django.core.cache import cache
+
+    mixes = mixes or QUERY_MIXES
+    factory = RequestFactory()
+    results = {}
+
+    for target, (view, fixed_params, cache_key) in _targets().items():
+        for mix, queries in mixes.items():
+            requests = [
+                (factory.get("/", {**fixed_params, **params}), params)
+                for params in queries
+            ]
+
+            def _call(request, params, view=view, cache_key=cache_key):
+                if cache_key:
+                    cache.delete(cache_key(params["q"], params.get("locale")))
+                return view(request)
+
+            for request, params in requests:
+                _call(request, params)
+
+            latencies = []
+            for _iteration in range(iterations):
+                for request, params in requests:
+                    started = time.perf_counter()
+                    _call(request, params)
+                    latencies.append((time.perf_counter() - started) * 1000)
+
+            sql = 0
+            peak = 0
+            for request, params in requests:
+                tracemalloc.start()
+                try:
+                    with CaptureQueriesContext(connection) as queries_context:
+                        _call(request, params)
+                    peak = max(peak, tracemalloc.get_traced_memory()[1])
+                finally:
+                    tracemalloc.stop()
+                sql = max(sql, len(queries_context.captured_queries))
+
+            results[f"{target}.{mix}"] = {
+                "p50_ms": round(statistics.median(latencies), 3),
+                "p95_ms": round(_percentile(latencies, 95), 3),
+                "sql": sql,
+                "peak_kib": round(peak / 1024, 1),
+            }
+
+    from artists.models import ArtistPage
+    from events.models import EventPage
+
+    return {
+        "meta": {
+            "created_at": timezone.now().isoformat(),
+            "database": connection.vendor,
+            "fuzzy_backend": getattr(settings, "SEARCH_FUZZY_BACKEND", "python"),
+            "artists": ArtistPage.objects.live().count(),
+            "events": EventPage.objects.live().count(),
+            "iterations": iterations,
+        },
+        "results": results,
+    }
+
+
+def baseline_mismatch(current, baseline):
+    """Campi ``meta`` (database, backend fuzzy, dimensioni del roster) diversi dalla baseline."""
+    base_meta = baseline.get("meta", {})
+    return [
+        f"{key}: {base_meta[key]} -> {current['meta'].get(key)}"
+        for key in ("database", "fuzzy_backend", "artists", "events")
+        if key in base_meta and base_meta[key] != current["meta"].get(key)
+    ]
+
+
+def compare_to_baseline(current, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Ritorna la lista (leggibile) delle regressioni rispetto alla baseline."""
+    regressions = []
+    for name, base in baseline.get("results", {}).items():
+        measured = current["results"].get(name)
+        if measured is None:
+            regressions.append(f"{name}: misura assente")
+            continue
+
+        for metric in ("p50_ms", "p95_ms"):
+            limit = base[metric] * (1 + tolerance)
+            if (
+                measured[metric] > limit
+                and measured[metric] - base[metric] > BASELINE_MIN_DELTA_MS
+            ):
+                regressions.append(
+                    f"{name}: {metric} {measured[metric]} > {base[metric]} (+{tolerance:.0%})"
+                )
+        if measured["sql"] > base["sql"]:
+            regressions.append(f"{name}: sql {measured['sql']} > {base['sql']}")
+        if measured["peak_kib"] > base["peak_kib"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: peak_kib {measured['peak_kib']} > {base['peak_kib']} (+{tolerance:.0%})"
+            )
+    return regressions
+
+
+SERIALIZER_BENCHMARK_ITERATIONS = 200
+
+# Richieste misurate: nome -> (viewset, path, query string)
+SERIALIZER_TARGETS = {
+    "artists.listing": ("artists.api.ArtistAPIViewSet", "/api/v2/artists/", {}),
+    "artists.card": ("artists.api.ArtistAPIViewSet", "/api/v2/artists/", {"profile": "card"}),
+    "artists.fields": (
+        "artists.api.ArtistAPIViewSet",
+        "/api/v2/artists/",
+        {"fields": "_,id,title,image_url,events"},
+    ),
+    "events.listing": ("events.api.EventAPIViewSet", "/api/v2/events/", {}),
+}
+
+
+def _serializer_viewset(viewset_path, path, params):
+    from django.utils.module_loading import import_string
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from config.urls import api_router
+
+    request = Request(APIRequestFactory().get(path, params))
+    request.wagtailapi_router = api_router
+    viewset = import_string(viewset_path)()
+    viewset.request = request
+    viewset.action = "listing_view"
+    return viewset
+
+
+def run_serializer_benchmark(iterations=SERIALIZER_BENCHMARK_ITERATIONS):
+    """Microsecondi per ``get_serializer_class`` senza e con cache delle classi."""
+    from core.serializers import clear_serializer_class_cache
+
+    results = {}
+    for name, (viewset_path, path, params) in SERIALIZER_TARGETS.items():
+        viewset = _serializer_viewset(viewset_path, path, params)
+        timings = {}
+        for mode in ("uncached", "cached"):
+            clear_serializer_class_cache()
+            viewset.get_serializer_class()
+            latencies = []
+            for _iteration in range(iterations):
+                if mode == "uncached":
+                    clear_serializer_class_cache()
+                started = time.perf_counter()
+                viewset.get_serializer_class()
+                latencies.append((time.perf_counter() - started) * 1_000_000)
+            timings[mode] = statistics.median(latencies)
+        results[name] = {
+            "uncached_us": round(timings["uncached"], 1),
+            "cached_us": round(timings["cached"], 1),
+            "speedup": round(timings["uncached"] / timings["cached"], 1),
+        }
+    clear_serializer_class_cache()
+    return {"meta": {"iterations": iterations}, "results": results}
@@ -1,4 +1,5 @@
 """Utility per cache fragments e proprietà cacheable."""
+import time
 from functools import wraps
 
 from django.core.cache import cache
@@ -45,3 +46,55 @@ def invalidate_model_cache(model_class_name: str, pk: int) -> None:
         # LocMem o altri backend non supportano delete_pattern.
         # In dev con LocMem il cache e' gia' volatile.
         pass
+
+
+def get_cache_generation(namespace: str) -> int:
+    """Ritorna il contatore di generazione corrente per un namespace.
+
+    Il contatore vive nella cache condivisa (Redis in produzione), quindi
+    tutti i worker vedono lo stesso valore. Se la chiave manca (cache
+    svuotata o mai inizializzata) viene creata con un valore basato sul
+    tempo, cosi' ogni struttura derivata dalla generazione precedente
+    risulta automaticamente obsoleta.
+    """
+    cache_key = f"generation:{namespace}"
+    generation = cache.get(cache_key)
+    if generation is None:
+        cache.add(cache_key, time.time_ns(), None)
+        generation = cache.get(cache_key)
+    return generation
+
+
+def get_cache_generations(namespaces) -> dict[str, int]:
+    """Come ``get_cache_generation`` per piu' namespace, con due letture in blocco."""
+    keys = {f"generation:{namespace}": namespace for namespace in namespaces}
+    found = cache.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        for key in missing:
+            cache.add(key, time.time_ns(), None)
+        found.update(cache.get_many(missing))
+    return {keys[key]: generation for key, generation in found.items()}
+
+
+def bump_cache_generation(namespace: str) -> int:
+    """Incrementa la generazione di un namespace, invalidando i dati derivati."""
+    cache_key = f"generation:{namespace}"
+    try:
+        return cache.incr(cache_key)
+    except ValueError:
+        # Chiave assente: la inizializza con un valore nuovo
+        generation = time.time_ns()
+        cache.set(cache_key, generation, None)
+        return generation
+
+
+def increment_cache_counter(cache_key: str, delta: int = 1) -> None:
+    """Incrementa un contatore condiviso (senza scadenza) nella cache."""
+    if cache.add(cache_key, delta, None):
+        return
+    try:
+        cache.incr(cache_key, delta)
+    except ValueError:
+        # Chiave rimossa tra add() e incr(): riparte da delta
+        cache.set(cache_key, delta, None)
@@ -0,0 +1,126 @@
+"""GET condizionali (ETag / Last-Modified) per gli endpoint JSON.
+
+Ogni endpoint dipende da alcune aree di contenuto (artisti, eventi,
+impostazioni, menu, ...). Per ogni area la cache condivisa tiene il
+timestamp dell'ultima modifica, aggiornato dai segnali dopo il commit.
+I validatori si calcolano con una sola lettura in blocco, senza query:
+se il client ha gia' la versione corrente risponde 304 prima della view.
+
+``max(last_published_at)`` non basta: ritiro e archiviazione degli eventi
+non lo cambiano. Se un timestamp manca dalla cache (svuotata o evicted)
+riparte da adesso, come le generazioni di ``core.cache``: al peggio il
+client riscarica una volta.
+"""
+import datetime
+import functools
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import quote_etag
+from django.utils.decorators import method_decorator
+from django.utils.http import http_date
+from django.views.decorators.http import condition
+
+ARTISTS = "artists"
+EVENTS = "events"
+VENUES = "venues"
+IMAGES = "images"
+EPK = "epk"
+SETTINGS = "settings"
+MENU = "menu"
+
+
+def _version_key(area: str) -> str:
+    return f"api:version:{area}"
+
+
+def content_versions(areas) -> dict[str, float]:
+    """Timestamp dell'ultima modifica per area (creato adesso se manca)."""
+    keys = {_version_key(area): area for area in areas}
+    found = cache.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        now = time.time()
+        for key in missing:
+            cache.add(key, now, None)
+        found.update(cache.get_many(missing))
+    return {keys[key]: version for key, version in found.items()}
+
+
+def touch_content_versions(areas) -> None:
+    """Segna le aree come modificate adesso."""
+    now = time.time()
+    cache.set_many({_version_key(area): now for area in areas}, None)
+
+
+def touch_content_versions_on_commit(areas) -> None:
+    """Come ``touch_content_versions``, dopo il commit della transazione."""
+    areas = set(areas)
+    transaction.on_commit(lambda: touch_content_versions(areas))
+
+
+def _request_versions(request, areas) -> dict[str, float]:
+    # etag_func e last_modified_func ricevono la stessa richiesta: una lettura sola
+    versions = getattr(request, "_content_versions", None)
+    if versions is None:
+        versions = content_versions(areas)
+        request._content_versions = versions
+    return versions
+
+
+def api_etag(request, areas) -> str:
+    """ETag: URL con query ordinata, lingua attiva e versioni delle aree."""
+    versions = _request_versions(request, areas)
+    raw = "|".join(
+        [
+            request.path,
+            urlencode(sorted(request.GET.lists()), doseq=True),
+            getattr(request, "LANGUAGE_CODE", ""),
+            *(f"{area}:{versions[area]!r}" for area in sorted(versions)),
+        ]
+    )
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def api_last_modified(request, areas) -> datetime.datetime:
+    versions = _request_versions(request, areas)
+    return datetime.datetime.fromtimestamp(max(versions.values()), tz=datetime.timezone.utc)
+
+
+def api_validators(request, areas) -> tuple[str, str]:
+    """Header ``ETag`` e ``Last-Modified`` come li scrive ``conditional_api``."""
+    last_modified = api_last_modified(request, areas)
+    return quote_etag(api_etag(request, areas)), http_date(last_modified.timestamp())
+
+
+def conditional_api(*areas):
+    """Decorator per view JSON: ETag e Last-Modified dalle aree, 304 prima della view.
+
+    La risposta porta in ``content_areas`` le aree dei validatori: la cache
+    delle risposte li ricalcola (``api_validators``) prima di servirla.
+    """
+    decorator = condition(
+        etag_func=lambda request, *args, **kwargs: api_etag(request, areas),
+        last_modified_func=lambda request, *args, **kwargs: api_last_modified(request, areas),
+    )
+
+    def wrap(view):
+        conditional_view = decorator(view)
+
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            response = conditional_view(request, *args, **kwargs)
+            response.content_areas = areas
+            return response
+
+        return wrapper
+
+    return wrap
+
+
+def conditional_api_method(*areas):
+    """``conditional_api`` per i metodi dei viewset."""
+    return method_decorator(conditional_api(*areas))
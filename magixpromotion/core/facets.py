@@ -0,0 +1,149 @@
+"""Conteggi per faccette dei filtri SPA (roster artisti e calendario eventi).
+
+Ogni faccetta conta i suoi valori sulle righe che soddisfano tutti gli
+*altri* filtri attivi, non il proprio: scelto un genere si vedono ancora
+i conteggi degli altri generi, ristretti da tipologia, regione, ecc.
+
+Le righe si leggono con una query sola (``values()`` con i campi di tutte
+le faccette, una riga per combinazione delle relazioni m2m) e si
+raggruppano per pagina; i conteggi si calcolano in memoria in un solo
+passaggio. Se ogni riga ha un solo valore per faccetta (eventi) il
+viewset puo' contare nel database con ``aggregate_counts``, una
+``GROUP BY`` per faccetta, senza leggere le righe. Il viewset aggiunge l'endpoint ``facets/`` e marca la risposta
+con le surrogate key: la cache delle risposte (``core.response_cache``) la
+tiene per query string, cioe' per combinazione di filtri, fino alla
+prossima pubblicazione.
+"""
+from collections import Counter
+
+from django.db.models import Count
+from django.urls import path
+from rest_framework.response import Response
+from wagtail.api.v2.utils import BadRequestError
+
+
+def group_rows(records, facet_fields):
+    """Righe ``values()`` raggruppate per pk.
+
+    ``facet_fields`` mappa ogni faccetta a ``(campo valore, campo etichetta)``
+    (etichetta ``None`` se il valore basta). Ritorna la lista di righe
+    ``{faccetta: set di valori}`` e le etichette ``{faccetta: {valore: etichetta}}``.
+    """
+    rows = {}
+    labels = {facet: {} for facet in facet_fields}
+    for record in records:
+        row = rows.setdefault(record["pk"], {facet: set() for facet in facet_fields})
+        for facet, (value_field, label_field) in facet_fields.items():
+            value = record[value_field]
+            if value is None or value == "":
+                continue
+            row[facet].add(value)
+            if label_field:
+                labels[facet][value] = record[label_field]
+    return list(rows.values()), labels
+
+
+def facet_counts(rows, facets, filters):
+    """Totale filtrato e conteggi disgiuntivi per faccetta.
+
+    ``filters`` mappa le faccette con un filtro attivo a un predicato sul
+    set di valori della riga. Una riga che non passa un solo filtro conta
+    solo per la faccetta di quel filtro; se ne fallisce due non conta.
+    """
+    counts = {facet: Counter() for facet in facets}
+    total = 0
+    for row in rows:
+        failed = [facet for facet, matches in filters.items() if not matches(row[facet])]
+        if not failed:
+            total += 1
+            for facet in facets:
+                counts[facet].update(row[facet])
+        elif len(failed) == 1:
+            counts[failed[0]].update(row[failed[0]])
+    return total, counts
+
+
+def aggregate_counts(queryset, value_field, label_field=None):
+    """Conteggi di una faccetta a valore singolo, calcolati dal database.
+
+    Ritorna ``(Counter valore -> conteggio, {valore: etichetta})``; i valori
+    vuoti non contano, come in ``group_rows``.
+    """
+    fields = [value_field, label_field] if label_field else [value_field]
+    counts = Counter()
+    labels = {}
+    for record in queryset.order_by().values(*fields).annotate(count=Count("pk")):
+        value = record[value_field]
+        if value is None or value == "":
+            continue
+        counts[value] += record["count"]
+        if label_field:
+            labels[value] = record[label_field]
+    return counts, labels
+
+
+def facet_items(counter, labels) -> list[dict]:
+    """Valori di una faccetta per conteggio decrescente, poi per etichetta."""
+    items = [
+        {"value": value, "label": str(labels.get(value, value)), "count": count}
+        for value, count in counter.items()
+    ]
+    return sorted(items, key=lambda item: (-item["count"], item["label"].lower()))
+
+
+class FacetsMixin:
+    """Endpoint ``facets/`` per un viewset API v2.
+
+    Il viewset definisce ``facet_fields`` (vedi ``group_rows``),
+    ``facet_query_parameters``, ``facet_queryset()`` con i filtri che non
+    sono faccette e ``facet_filters()`` con i predicati dei filtri attivi.
+    ``facet_labels(facet, values)`` puo' fornire le etichette mancanti.
+    Con faccette a valore singolo il viewset puo' ridefinire
+    ``count_facets()`` e contare nel database (``aggregate_counts``).
+    """
+
+    facet_fields = {}
+    facet_query_parameters = frozenset()
+
+    @classmethod
+    def get_urlpatterns(cls):
+        return super().get_urlpatterns() + [
+            path("facets/", cls.as_view({"get": "facets_view"}), name="facets"),
+        ]
+
+    def facet_queryset(self):
+        raise NotImplementedError
+
+    def facet_filters(self):
+        raise NotImplementedError
+
+    def facet_labels(self, facet, values):
+        return {}
+
+    def count_facets(self):
+        """Totale filtrato, conteggi ed etichette per faccetta dalle righe in memoria."""
+        value_fields = {
+            field
+            for value_field, label_field in self.facet_fields.values()
+            for field in (value_field, label_field)
+            if field
+        }
+        records = self.facet_queryset().values("pk", *sorted(value_fields))
+        rows, labels = group_rows(records, self.facet_fields)
+        total, counts = facet_counts(rows, list(self.facet_fields), self.facet_filters())
+        return total, counts, labels
+
+    def facets_view(self, request):
+        unknown = set(request.GET) - set(self.facet_query_parameters)
+        if unknown:
+            raise BadRequestError(
+                "query parameter is not an operation or a recognised field: %s"
+                % ", ".join(sorted(unknown))
+            )
+
+        total, counts, labels = self.count_facets()
+        facets = {}
+        for facet, counter in counts.items():
+            facet_labels = {**self.facet_labels(facet, counter), **labels[facet]}
+            facets[facet] = facet_items(counter, facet_labels)
+        return Response({"total_count": total, "facets": facets})
@@ -0,0 +1,32 @@
+"""
+Management command: mostra i contatori della generazione single-flight
+delle renditions (generazioni, attese sul lock, placeholder serviti).
+
+Uso:
+    python manage.py rendition_lock_stats [--reset]
+"""
+from django.core.management.base import BaseCommand
+
+from core.renditions import get_rendition_lock_stats, reset_rendition_lock_stats
+
+
+class Command(BaseCommand):
+    help = "Mostra (e opzionalmente azzera) le statistiche del lock sulle renditions."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Azzera i contatori dopo averli mostrati.",
+        )
+
+    def handle(self, *args, **options):
+        stats = get_rendition_lock_stats()
+        self.stdout.write(
+            f"Generate: {stats['generated']}  Attese: {stats['waits']}  "
+            f"Attesa totale: {stats['wait_ms']} ms  Media: {stats['avg_wait_ms']:.1f} ms  "
+            f"Placeholder: {stats['placeholders']}"
+        )
+        if options["reset"]:
+            reset_rendition_lock_stats()
+            self.stdout.write(self.style.SUCCESS("Contatori azzerati."))
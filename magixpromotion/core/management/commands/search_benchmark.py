@@ -0,0 +1,108 @@
+"""
+Management command: benchmark della ricerca (search, autocomplete, fuzzy)
+su un roster sintetico, con confronto contro una baseline JSON.
+
+Da eseguire su un database dedicato (--seed crea migliaia di pagine):
+    python manage.py search_benchmark --seed
+    python manage.py search_benchmark --update-baseline
+    python manage.py search_benchmark --output bench.json
+
+Esce con errore se una metrica peggiora oltre la tolleranza.
+"""
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmark import (
+    DEFAULT_ARTISTS,
+    DEFAULT_EVENTS,
+    DEFAULT_ITERATIONS,
+    DEFAULT_TOLERANCE,
+    baseline_mismatch,
+    compare_to_baseline,
+    run_benchmark,
+    seed_roster,
+)
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / "benchmarks" / "search_baseline.json"
+
+
+class Command(BaseCommand):
+    help = "Misura latenza, query SQL e memoria della ricerca e le confronta con la baseline."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seed",
+            action="store_true",
+            help="Popola prima il roster sintetico (le pagine esistenti sono riusate).",
+        )
+        parser.add_argument("--artists", type=int, default=DEFAULT_ARTISTS)
+        parser.add_argument("--events", type=int, default=DEFAULT_EVENTS)
+        parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS)
+        parser.add_argument(
+            "--output",
+            type=str,
+            default="",
+            help="File JSON dove scrivere i risultati.",
+        )
+        parser.add_argument(
+            "--baseline",
+            type=str,
+            default=str(DEFAULT_BASELINE),
+            help="Baseline JSON da confrontare (default: benchmarks/search_baseline.json).",
+        )
+        parser.add_argument(
+            "--update-baseline",
+            action="store_true",
+            help="Salva i risultati come nuova baseline invece di confrontarli.",
+        )
+        parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+
+    def handle(self, *args, **options):
+        if options["seed"]:
+            seed_roster(
+                artists=options["artists"],
+                events=options["events"],
+                log=self.stdout.write,
+            )
+
+        results = run_benchmark(iterations=options["iterations"])
+        for name, metrics in results["results"].items():
+            self.stdout.write(
+                f"{name:<28} p50 {metrics['p50_ms']:>9.2f} ms  "
+                f"p95 {metrics['p95_ms']:>9.2f} ms  "
+                f"sql {metrics['sql']:>3}  mem {metrics['peak_kib']:>9.1f} KiB"
+            )
+
+        if options["output"]:
+            self._write(Path(options["output"]), results)
+
+        baseline_path = Path(options["baseline"])
+        if options["update_baseline"]:
+            self._write(baseline_path, results)
+            self.stdout.write(self.style.SUCCESS(f"Baseline aggiornata: {baseline_path}"))
+            return
+
+        if not baseline_path.exists():
+            self.stdout.write(self.style.WARNING(
+                f"Baseline non trovata ({baseline_path}): usa --update-baseline."
+            ))
+            return
+
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+        mismatch = baseline_mismatch(results, baseline)
+        if mismatch:
+            self.stdout.write(self.style.WARNING(
+                "Baseline misurata in un ambiente diverso (" + ", ".join(mismatch)
+                + "): confronto solo indicativo, rigenerala con --update-baseline."
+            ))
+        regressions = compare_to_baseline(results, baseline, options["tolerance"])
+        if regressions:
+            raise CommandError("Regressioni rispetto alla baseline:\n" + "\n".join(regressions))
+        self.stdout.write(self.style.SUCCESS("Nessuna regressione rispetto alla baseline."))
+
+    def _write(self, path, results):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(results, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
@@ -0,0 +1,31 @@
+"""
+Management command: mostra i contatori hit/miss della cache risultati
+di /api/v2/search/ e /api/v2/search/autocomplete/.
+
+Uso:
+    python manage.py search_cache_stats [--reset]
+"""
+from django.core.management.base import BaseCommand
+
+from core.search import get_search_cache_stats, reset_search_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Mostra (e opzionalmente azzera) le statistiche della cache ricerca."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Azzera i contatori dopo averli mostrati.",
+        )
+
+    def handle(self, *args, **options):
+        stats = get_search_cache_stats()
+        self.stdout.write(
+            f"Hit: {stats['hits']}  Miss: {stats['misses']}  "
+            f"Hit ratio: {stats['hit_ratio']:.1%}"
+        )
+        if options["reset"]:
+            reset_search_cache_stats()
+            self.stdout.write(self.style.SUCCESS("Contatori azzerati."))
@@ -0,0 +1,27 @@
+"""
+Management command: micro-benchmark di ``get_serializer_class`` dei viewset
+artisti/eventi, senza e con la cache delle classi serializer.
+
+    python manage.py serializer_benchmark
+    python manage.py serializer_benchmark --iterations 1000
+
+Non tocca il database.
+"""
+from django.core.management.base import BaseCommand
+
+from core.benchmark import SERIALIZER_BENCHMARK_ITERATIONS, run_serializer_benchmark
+
+
+class Command(BaseCommand):
+    help = "Misura il costo per richiesta di get_serializer_class con e senza cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=SERIALIZER_BENCHMARK_ITERATIONS)
+
+    def handle(self, *args, **options):
+        report = run_serializer_benchmark(iterations=options["iterations"])
+        for name, metrics in report["results"].items():
+            self.stdout.write(
+                f"{name:<18} senza cache {metrics['uncached_us']:>9.1f} us  "
+                f"con cache {metrics['cached_us']:>7.1f} us  x{metrics['speedup']}"
+            )
@@ -1,5 +1,6 @@
 """Middleware per cache headers su risposte API."""
-from django.utils.cache import patch_cache_control
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import parse_http_date_safe
 
 
 class APICacheMiddleware:
@@ -16,8 +17,12 @@ class APICacheMiddleware:
     def __call__(self, request):
         response = self.get_response(request)
 
-        # Solo per richieste API GET
-        if request.path.startswith("/api/") and request.method == "GET":
+        # Solo per richieste API GET, tranne quelle marcate non cacheable
+        if (
+            request.path.startswith("/api/")
+            and request.method == "GET"
+            and "no-store" not in response.get("Cache-Control", "")
+        ):
             patch_cache_control(
                 response,
                 public=True,
@@ -27,3 +32,60 @@ class APICacheMiddleware:
             )
 
         return response
+
+
+def _uncacheable(response):
+    """Risposta provvisoria: niente validatori, niente cache a valle."""
+    del response["ETag"]
+    del response["Last-Modified"]
+    patch_cache_control(response, no_store=True)
+    return response
+
+
+class APIResponseCacheMiddleware:
+    """Cache server-side delle risposte API v2 di artisti ed eventi.
+
+    Solo GET anonime; la risposta viene salvata se il viewset l'ha marcata
+    con ``Surrogate-Key`` (vedi ``core.response_cache``) e invalidata dai
+    segnali di pubblicazione e dall'archiviazione notturna degli eventi.
+    Va dopo ``APICacheMiddleware``, che aggiunge Cache-Control anche alle
+    risposte servite dalla cache.
+
+    Una risposta con URL immagine provvisorie (rendition in generazione su
+    un altro worker, vedi ``core.renditions``) non viene salvata, perde
+    ETag/Last-Modified ed esce con ``Cache-Control: no-store``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        from core.renditions import degraded_renditions, reset_degraded_renditions
+        from core.response_cache import (
+            get_cached_response,
+            is_cacheable_request,
+            store_response,
+        )
+
+        reset_degraded_renditions()
+        if not is_cacheable_request(request):
+            response = self.get_response(request)
+            return _uncacheable(response) if degraded_renditions() else response
+
+        response = get_cached_response(request)
+        if response is not None:
+            response["X-Cache"] = "HIT"
+            # La risposta in cache porta i validatori della view
+            return get_conditional_response(
+                request,
+                etag=response.get("ETag"),
+                last_modified=parse_http_date_safe(response.get("Last-Modified")),
+                response=response,
+            )
+
+        response = self.get_response(request)
+        if degraded_renditions():
+            return _uncacheable(response)
+        if store_response(request, response):
+            response["X-Cache"] = "MISS"
+        return response
@@ -0,0 +1,56 @@
+"""Indici GIN trigram per il fallback fuzzy della ricerca (SEARCH_FUZZY_BACKEND="trigram").
+
+Solo PostgreSQL: su altri database (SQLite nei test) la migration non fa nulla.
+unaccent() non e' IMMUTABLE e non puo' comparire in un indice, quindi viene
+creato il wrapper f_unaccent() usato sia dagli indici sia dalle query.
+"""
+from django.db import migrations
+
+TRIGRAM_INDEXES = [
+    ("search_trgm_page_title", "wagtailcore_page", "title"),
+    ("search_trgm_artist_short_bio", "artists_artistpage", "short_bio"),
+    ("search_trgm_artist_tribute_to", "artists_artistpage", "tribute_to"),
+    ("search_trgm_venue_name", "events_venue", "name"),
+    ("search_trgm_venue_city", "events_venue", "city"),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    schema_editor.execute(
+        "CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text "
+        "LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT AS "
+        "$$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$"
+    )
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} ON {table} "
+            f"USING gin (f_unaccent(lower({column})) gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for name, _table, _column in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+    schema_editor.execute("DROP FUNCTION IF EXISTS f_unaccent(text)")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_add_press_kit_zip'),
+        ('artists', '0002_add_gallery_images'),
+        ('events', '0001_initial'),
+        ('wagtailcore', '0096_referenceindex_referenceindex_source_object_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
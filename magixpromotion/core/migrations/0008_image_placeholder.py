@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_search_trigram_indexes'),
+        ('wagtailimages', '0027_image_description'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImagePlaceholder',
+            fields=[
+                ('image', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='lqip', serialize=False, to='wagtailimages.image')),
+                ('source_key', models.CharField(max_length=128)),
+                ('data_uri', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Placeholder immagine',
+                'verbose_name_plural': 'Placeholder immagini',
+            },
+        ),
+    ]
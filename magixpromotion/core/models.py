@@ -7,6 +7,7 @@ from wagtail.admin.panels import FieldPanel, MultiFieldPanel
 from wagtail.documents import get_document_model_string
 from wagtail.fields import RichTextField, StreamField
 from wagtail import blocks as wagtail_blocks
+from wagtail.images import get_image_model_string
 from wagtail.images.blocks import ImageChooserBlock
 from wagtail.models import Page
 from wagtail.snippets.models import register_snippet
@@ -327,3 +328,28 @@ class PressAreaPage(Page):
     class Meta:
         verbose_name = _("Press Area")
         verbose_name_plural = _("Press Area")
+
+
+class ImagePlaceholder(models.Model):
+    """Placeholder LQIP di un'immagine: data URI sfocato di poche centinaia di byte.
+
+    Valido finche' ``source_key`` coincide con file hash e punto focale
+    dell'immagine (vedi ``core.renditions.lqip_source_key``).
+    """
+
+    image = models.OneToOneField(
+        get_image_model_string(),
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="lqip",
+    )
+    source_key = models.CharField(max_length=128)
+    data_uri = models.TextField()
+    created_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _("Placeholder immagine")
+        verbose_name_plural = _("Placeholder immagini")
+
+    def __str__(self) -> str:
+        return f"LQIP immagine {self.image_id}"
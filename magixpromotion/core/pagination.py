@@ -0,0 +1,203 @@
+"""Paginazione a cursore (keyset) per i listing API v2.
+
+Con ``?cursor=`` (vuoto per la prima pagina) il listing si ordina per una
+chiave stabile che finisce con il pk e ogni pagina riparte dall'ultima riga
+della precedente (``WHERE (chiave, pk) > (ultima chiave, ultimo pk)``):
+costo proporzionale alla pagina a qualsiasi profondita', e niente duplicati
+o salti se nel frattempo vengono pubblicate altre pagine.
+
+Il token contiene i valori della chiave, riconvertiti con il ``to_python()``
+dei rispettivi campi, e lo "scope" dell'ordinamento (``cursor_scope()`` del
+viewset): un token di un ordinamento diverso (es. rotazione giornaliera
+ricalcolata) risponde 400 e il client riparte dalla prima pagina.
+
+La risposta ha ``meta.next`` (token opaco, ``null`` sull'ultima pagina);
+``meta.total_count`` c'e' solo sulla prima pagina, per non contare tutte le
+righe a ogni scroll. ``offset``, ``order`` e ``search`` non si combinano
+con il cursore.
+"""
+import base64
+import binascii
+import json
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from wagtail.api.v2.utils import BadRequestError
+
+CURSOR_PARAM = "cursor"
+CURSOR_INCOMPATIBLE_PARAMS = ("offset", "order", "search")
+
+
+def encode_cursor(values, scope=None) -> str:
+    raw = json.dumps({"s": scope, "k": values}, cls=DjangoJSONEncoder, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, fields, nullable=frozenset(), scope=None):
+    """Valori della chiave dal token, convertiti per ``fields`` (nome, campo).
+
+    ``BadRequestError`` se il token non e' valido, se un valore non e' del
+    tipo del campo (o e' None su un campo non in ``nullable``) o se e' stato
+    emesso per un altro ``scope``.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded).decode())
+    except (ValueError, binascii.Error, UnicodeDecodeError) as e:
+        raise BadRequestError("cursor non valido") from e
+    if not isinstance(payload, dict) or not isinstance(payload.get("k"), list):
+        raise BadRequestError("cursor non valido")
+    if payload.get("s") != scope:
+        raise BadRequestError("cursor scaduto: ricominciare dalla prima pagina")
+    if len(payload["k"]) != len(fields):
+        raise BadRequestError("cursor non valido")
+
+    values = []
+    for (name, field), value in zip(fields, payload["k"]):
+        if value is None:
+            if name not in nullable:
+                raise BadRequestError("cursor non valido")
+            values.append(None)
+            continue
+        try:
+            values.append(field.to_python(value))
+        except (ValidationError, TypeError, ValueError) as e:
+            raise BadRequestError("cursor non valido") from e
+    return values
+
+
+def _after(field: str, descending: bool, value, nullable: bool) -> Q:
+    """Righe dopo ``value`` sul campo (NULL in fondo in entrambe le direzioni)."""
+    if value is None:
+        return Q(pk__in=[])
+    lookup = "lt" if descending else "gt"
+    after = Q(**{f"{field}__{lookup}": value})
+    if nullable:
+        after |= Q(**{f"{field}__isnull": True})
+    return after
+
+
+def keyset_filter(ordering, values, nullable=frozenset()) -> Q:
+    """``(k1, ..., kn) > (v1, ..., vn)`` nell'ordine dato, come OR di prefissi uguali."""
+    condition = Q(pk__in=[])
+    equal = Q()
+    for (field, descending), value in zip(ordering, values):
+        condition |= equal & _after(field, descending, value, field in nullable)
+        if value is None:
+            equal &= Q(**{f"{field}__isnull": True})
+        else:
+            equal &= Q(**{field: value})
+    return condition
+
+
+class KeysetPagination(BasePagination):
+    """Paginazione a cursore su ``ordering``: lista di ``(campo, discendente)``.
+
+    L'ultimo campo deve essere univoco (il pk) perche' l'ordine sia totale.
+    """
+
+    def __init__(self, ordering, scope=None):
+        self.ordering = ordering
+        self.scope = scope
+        self.next_cursor = None
+        self.total_count = None
+
+    def _limit(self, request) -> int:
+        # Stessi limiti di WagtailPagination
+        limit_max = getattr(settings, "WAGTAILAPI_LIMIT_MAX", 20)
+        try:
+            limit_default = 20 if not limit_max else min(20, limit_max)
+            limit = int(request.GET.get("limit", limit_default))
+            if limit < 1:
+                raise ValueError()
+        except ValueError as e:
+            raise BadRequestError("limit must be a positive integer") from e
+        if limit_max and limit > limit_max:
+            raise BadRequestError("limit cannot be higher than %d" % limit_max)
+        return limit
+
+    def _key_fields(self, queryset):
+        """(nome, campo) per la chiave e nomi dei campi che ammettono NULL."""
+        fields, nullable = [], set()
+        meta = queryset.model._meta
+        for name, _descending in self.ordering:
+            if name == "pk":
+                field = meta.pk
+            else:
+                try:
+                    field = meta.get_field(name)
+                except FieldDoesNotExist:
+                    # Annotazione del viewset: mai NULL
+                    fields.append((name, queryset.query.annotations[name].output_field))
+                    continue
+            fields.append((name, field))
+            if field.null:
+                nullable.add(name)
+        return fields, nullable
+
+    def paginate_queryset(self, queryset, request, view=None):
+        for param in CURSOR_INCOMPATIBLE_PARAMS:
+            if param in request.GET:
+                raise BadRequestError(f"{param} non si combina con cursor")
+        limit = self._limit(request)
+        if view is not None:
+            self.scope = view.cursor_scope(queryset)
+
+        cursor = request.GET.get(CURSOR_PARAM, "")
+        if cursor:
+            fields, nullable = self._key_fields(queryset)
+            values = decode_cursor(cursor, fields, nullable, self.scope)
+            queryset = queryset.filter(keyset_filter(self.ordering, values, nullable))
+        else:
+            self.total_count = queryset.count()
+
+        queryset = queryset.order_by(
+            *(
+                F(field).desc(nulls_last=True) if descending else F(field).asc(nulls_last=True)
+                for field, descending in self.ordering
+            )
+        )
+        rows = list(queryset[: limit + 1])
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            self.next_cursor = encode_cursor(
+                [getattr(last, field) for field, _descending in self.ordering], self.scope
+            )
+        return rows[:limit]
+
+    def get_paginated_response(self, data):
+        meta = OrderedDict()
+        if self.total_count is not None:
+            meta["total_count"] = self.total_count
+        meta["next"] = self.next_cursor
+        return Response(OrderedDict([("meta", meta), ("items", data)]))
+
+
+class KeysetPaginationMixin:
+    """Viewset API v2 con paginazione a cursore opzionale (``?cursor=``).
+
+    Il viewset ridefinisce ``cursor_ordering()`` (default: pk crescente) e,
+    se la chiave cambia significato tra una richiesta e l'altra,
+    ``cursor_scope()``.
+    """
+
+    def cursor_ordering(self):
+        """Chiave del cursore: lista di ``(campo, discendente)`` finita dal pk."""
+        return [("pk", False)]
+
+    def cursor_scope(self, queryset):
+        """Identifica l'ordinamento del queryset: un cursore vale solo nel suo scope."""
+        return None
+
+    @property
+    def paginator(self):
+        if CURSOR_PARAM not in self.request.GET:
+            return super().paginator
+        if not hasattr(self, "_keyset_paginator"):
+            self._keyset_paginator = KeysetPagination(self.cursor_ordering())
+        return self._keyset_paginator
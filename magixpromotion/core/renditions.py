@@ -0,0 +1,607 @@
+"""Registro delle rendition spec, cache delle URL e warm-up in background."""
+import contextvars
+import functools
+import threading
+import time
+import uuid
+from collections import OrderedDict, defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from wagtail.images import get_image_model
+
+from core.cache import increment_cache_counter
+
+# === Registro spec ===
+# Ogni spec usata dal codice e' definita qui: il warm-up genera in anticipo
+# esattamente quelle che le pagine e le API chiederanno.
+
+# Spec usate dai campi immagine delle API (full-res + LQIP placeholder)
+API_IMAGE_SPEC = "fill-800x1200|format-webp"
+API_THUMB_SPEC = "fill-40x60|format-webp"
+API_RENDITION_SPECS = (API_IMAGE_SPEC, API_THUMB_SPEC)
+
+# ArtistPage: card (griglia/OG), hero del dettaglio, JSON-LD
+ARTIST_CARD_SPECS = {
+    "thumbnail": "fill-400x533|format-webp",
+    "card": "fill-600x800|format-webp",
+    "card_2x": "fill-1200x1600|format-webp",
+    "og": "fill-1200x630|format-webp",
+}
+ARTIST_HERO_SPECS = {
+    "mobile": "fill-800x1000|format-webp",
+    "desktop": "fill-1200x1600|format-webp",
+    "desktop_2x": "fill-2400x3200|format-webp",
+}
+ARTIST_JSONLD_SPEC = "fill-800x600"
+
+# EventPage: immagine in evidenza nelle API eventi
+EVENT_FEATURED_SPEC = "fill-1200x1600|format-webp"
+
+
+def _unique(*specs) -> tuple[str, ...]:
+    return tuple(dict.fromkeys(specs))
+
+
+# Spec per ruolo dell'immagine. "upload" vale per immagini non ancora usate:
+# almeno le renditions delle API sono pronte quando l'immagine viene scelta.
+RENDITION_SPECS: dict[str, tuple[str, ...]] = {
+    "artist_main_image": _unique(
+        *API_RENDITION_SPECS,
+        *ARTIST_CARD_SPECS.values(),
+        *ARTIST_HERO_SPECS.values(),
+        ARTIST_JSONLD_SPEC,
+    ),
+    "artist_gallery_image": API_RENDITION_SPECS,
+    "event_featured_image": (EVENT_FEATURED_SPEC,),
+    "upload": API_RENDITION_SPECS,
+}
+
+WARMUP_KEY_PREFIX = "renditions:warmup"
+WARMUP_JOBS_KEPT = 10
+WARMUP_TIMEOUT = 60 * 60 * 24
+
+
+# === Cache URL renditions: LRU di processo + cache condivisa ===
+# Chiave (image_id, file_hash, focal point, spec): un nuovo file o un nuovo
+# punto focale cambiano la chiave, le URL vecchie non vengono piu' lette.
+
+RENDITION_URL_KEY_PREFIX = "rendition-url"
+RENDITION_URL_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+RENDITION_URL_LRU_SIZE = 4096
+RENDITION_URL_LRU_TTL = 300
+
+# Generazione single-flight: un solo worker crea una data (immagine, spec),
+# gli altri attendono al massimo RENDITION_LOCK_WAIT secondi la sua URL.
+RENDITION_LOCK_TIMEOUT = 30
+RENDITION_LOCK_WAIT = 0.5
+RENDITION_LOCK_POLL = 0.05
+RENDITION_LOCK_STATS_KEYS = {
+    "generated": "renditions:lock:generated",
+    "waits": "renditions:lock:waits",
+    "wait_ms": "renditions:lock:wait_ms",
+    "placeholders": "renditions:lock:placeholders",
+}
+
+
+# Risposta con URL provvisorie (lock scaduto o generazione fallita): chi la
+# costruisce non deve salvarla (cache delle risposte, snapshot, validatori)
+_degraded = contextvars.ContextVar("renditions_degraded", default=False)
+
+
+def reset_degraded_renditions() -> None:
+    """Da chiamare prima di costruire una risposta che verra' messa in cache."""
+    _degraded.set(False)
+
+
+def degraded_renditions() -> bool:
+    """True se da ``reset_degraded_renditions`` e' uscita almeno una URL provvisoria."""
+    return _degraded.get()
+
+
+class _LRUCache:
+    """LRU thread-safe con scadenza, locale al processo."""
+
+    def __init__(self, maxsize: int, ttl: int):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys) -> dict[str, str]:
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._data.get(key)
+                if entry is None:
+                    continue
+                if entry[0] < now:
+                    del self._data[key]
+                    continue
+                self._data.move_to_end(key)
+                found[key] = entry[1]
+        return found
+
+    def set_many(self, mapping: dict[str, str], ttl: int | None = None) -> None:
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            for key, value in mapping.items():
+                self._data[key] = (expires, value)
+                self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for key in [key for key in self._data if key.startswith(prefix)]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+_url_lru = _LRUCache(RENDITION_URL_LRU_SIZE, RENDITION_URL_LRU_TTL)
+
+
+@functools.lru_cache(maxsize=128)
+def _filter(spec: str):
+    from wagtail.images.models import Filter
+
+    return Filter(spec=spec)
+
+
+def rendition_url_cache_key(image, spec: str, focal_point_key: str | None = None) -> str:
+    """Chiave cache della URL di una rendition (come le chiavi Wagtail)."""
+    if focal_point_key is None:
+        focal_point_key = _filter(spec).get_cache_key(image)
+    return f"{RENDITION_URL_KEY_PREFIX}:{image.id}:{image.file_hash}:{focal_point_key}:{spec}"
+
+
+def absolute_url(url: str | None) -> str | None:
+    """URL assoluta come ``Rendition.full_url``."""
+    if url and url.startswith("/") and hasattr(settings, "WAGTAILADMIN_BASE_URL"):
+        return settings.WAGTAILADMIN_BASE_URL + url
+    return url
+
+
+def _generate_single_flight(key: str, image, spec: str) -> str | None:
+    """Genera una rendition con lock condiviso; ``None`` se l'attesa scade.
+
+    Chi prende il lock genera e pubblica la URL in cache prima di
+    rilasciarlo; gli altri worker la leggono invece di ripetere il resize.
+    """
+    lock_key = f"{key}:lock"
+    token = uuid.uuid4().hex
+    if cache.add(lock_key, token, RENDITION_LOCK_TIMEOUT):
+        try:
+            url = image.get_rendition(spec).url
+            cache.set(key, url, RENDITION_URL_CACHE_TIMEOUT)
+        finally:
+            if cache.get(lock_key) == token:
+                cache.delete(lock_key)
+        increment_cache_counter(RENDITION_LOCK_STATS_KEYS["generated"])
+        return url
+
+    started = time.monotonic()
+    url = None
+    locked = True
+    while time.monotonic() - started < RENDITION_LOCK_WAIT:
+        time.sleep(RENDITION_LOCK_POLL)
+        url = cache.get(key)
+        locked = cache.get(lock_key) is not None
+        if url is not None or not locked:
+            break
+    increment_cache_counter(RENDITION_LOCK_STATS_KEYS["waits"])
+    increment_cache_counter(
+        RENDITION_LOCK_STATS_KEYS["wait_ms"], round((time.monotonic() - started) * 1000)
+    )
+
+    if url is None and not locked:
+        # Il worker col lock ha finito senza pubblicare la URL (errore):
+        # si riprova qui, Wagtail usa get_or_create sulla rendition
+        url = image.get_rendition(spec).url
+    return url
+
+
+def _placeholder_url(image, spec: str) -> str | None:
+    """LQIP gia' disponibile dell'immagine, mentre un altro worker genera."""
+    increment_cache_counter(RENDITION_LOCK_STATS_KEYS["placeholders"])
+    if spec == API_THUMB_SPEC:
+        return None
+    key = rendition_url_cache_key(image, API_THUMB_SPEC)
+    return _url_lru.get_many([key]).get(key) or cache.get(key)
+
+
+def _load_rendition_urls(missing: dict, strict: bool = False) -> tuple[dict[str, str], dict[str, str]]:
+    """URL dalla tabella renditions (una query), generando quelle mancanti.
+
+    Ritorna ``(urls, placeholders)``: i placeholder non vanno in cache e
+    segnano la risposta come provvisoria (``degraded_renditions``). Con
+    ``strict`` (warm-up) gli errori di generazione si propagano e le
+    renditions in generazione altrove restano fuori, senza placeholder.
+    """
+    images = {image.id for image, _ in missing.values()}
+    specs = {spec for _, spec in missing.values()}
+    stored = {
+        (rendition.image_id, rendition.filter_spec, rendition.focal_point_key): rendition.url
+        for rendition in get_image_model().get_rendition_model().objects.filter(
+            image_id__in=images, filter_spec__in=specs,
+        )
+    }
+
+    urls, placeholders = {}, {}
+    for key, (image, spec) in missing.items():
+        url = stored.get((image.id, spec, _filter(spec).get_cache_key(image)))
+        if url is None:
+            try:
+                url = _generate_single_flight(key, image, spec)
+            except Exception:
+                if strict:
+                    raise
+                # Non messa in cache: si riprova alla prossima richiesta
+                _degraded.set(True)
+                continue
+            if url is None:
+                if strict:
+                    # La genera il worker col lock, che ne pubblica la URL
+                    continue
+                _degraded.set(True)
+                placeholder = _placeholder_url(image, spec)
+                if placeholder:
+                    placeholders[key] = placeholder
+                continue
+        urls[key] = url
+    return urls, placeholders
+
+
+def get_rendition_lock_stats() -> dict:
+    """Contatori della generazione single-flight (condivisi tra i worker)."""
+    stats = {
+        name: cache.get(key) or 0
+        for name, key in RENDITION_LOCK_STATS_KEYS.items()
+    }
+    stats["avg_wait_ms"] = stats["wait_ms"] / stats["waits"] if stats["waits"] else 0.0
+    return stats
+
+
+def reset_rendition_lock_stats() -> None:
+    cache.delete_many(list(RENDITION_LOCK_STATS_KEYS.values()))
+
+
+def cached_rendition_urls(pairs) -> dict[tuple[int, str], str | None]:
+    """Ritorna ``{(image_id, spec): url}`` per le coppie ``(image, spec)``.
+
+    Lookup in ordine: LRU del processo, cache condivisa (un ``get_many``),
+    tabella renditions (una query per tutte le mancanti), infine generazione
+    single-flight. Le URL sono relative come ``Rendition.url``; ``None`` se
+    la rendition non e' generabile. Se un altro worker la sta generando si
+    riceve l'LQIP dell'immagine, quando c'e'.
+    """
+    keyed = {
+        rendition_url_cache_key(image, spec): (image, spec)
+        for image, spec in pairs
+        if image is not None
+    }
+    if not keyed:
+        return {}
+
+    found = _url_lru.get_many(keyed)
+    missing = [key for key in keyed if key not in found]
+    if missing:
+        shared = cache.get_many(missing)
+        _url_lru.set_many(shared)
+        found.update(shared)
+        missing = [key for key in missing if key not in shared]
+    if missing:
+        loaded, placeholders = _load_rendition_urls({key: keyed[key] for key in missing})
+        cache.set_many(loaded, RENDITION_URL_CACHE_TIMEOUT)
+        _url_lru.set_many(loaded)
+        found.update(loaded)
+        found.update(placeholders)
+
+    return {(image.id, spec): found.get(key) for key, (image, spec) in keyed.items()}
+
+
+def warm_rendition_urls(image, specs) -> None:
+    """Warm-up: renditions mancanti con lo stesso lock single-flight delle richieste.
+
+    Le URL finiscono nella cache condivisa come per ``cached_rendition_urls``;
+    gli errori di generazione si propagano (il task ritenta).
+    """
+    keyed = {rendition_url_cache_key(image, spec): (image, spec) for spec in specs}
+    shared = cache.get_many(keyed)
+    missing = {key: pair for key, pair in keyed.items() if key not in shared}
+    if missing:
+        loaded, _placeholders = _load_rendition_urls(missing, strict=True)
+        cache.set_many(loaded, RENDITION_URL_CACHE_TIMEOUT)
+
+
+def rendition_url(image, spec: str, full: bool = False) -> str | None:
+    """URL (relativa, o assoluta con ``full``) di una rendition, via cache."""
+    if image is None:
+        return None
+    url = cached_rendition_urls([(image, spec)]).get((image.id, spec))
+    return absolute_url(url) if full else url
+
+
+def invalidate_image_rendition_urls(image_id: int) -> None:
+    """Scarta dall'LRU del processo URL e placeholder di un'immagine modificata.
+
+    Nella cache condivisa le chiavi vecchie restano irraggiungibili (file
+    hash o punto focale diversi) e scadono da sole.
+    """
+    _url_lru.delete_prefix(f"{RENDITION_URL_KEY_PREFIX}:{image_id}:")
+    _url_lru.delete_prefix(f"{LQIP_KEY_PREFIX}:{image_id}:")
+
+
+def invalidate_rendition_url(rendition) -> None:
+    """Scarta la URL di una rendition eliminata (il file non esiste piu')."""
+    image = rendition.image
+    key = rendition_url_cache_key(image, rendition.filter_spec, rendition.focal_point_key)
+    cache.delete(key)
+    invalidate_image_rendition_urls(image.id)
+
+
+def clear_rendition_url_cache() -> None:
+    """Svuota l'LRU del processo (la cache condivisa ha la sua scadenza)."""
+    _url_lru.clear()
+
+
+# === Placeholder LQIP inline ===
+# Il placeholder sfocato viaggia nel payload come data URI: niente lookup
+# della thumb 40x60 ne' richiesta HTTP del browser. Finche' non e' calcolato
+# (task Celery) si usa la URL della thumb.
+
+LQIP_KEY_PREFIX = "lqip"
+LQIP_SIZE = (16, 24)
+LQIP_BLUR_RADIUS = 1
+LQIP_QUALITY = 40
+LQIP_QUEUE_TIMEOUT = 300
+# Placeholder assente: ricordato per poco nell'LRU (niente query per ogni campo)
+LQIP_MISSING_TTL = 30
+
+
+def lqip_source_key(image) -> str:
+    """File e punto focale da cui dipende il placeholder."""
+    return ":".join(str(value) for value in (
+        image.file_hash,
+        image.focal_point_x,
+        image.focal_point_y,
+        image.focal_point_width,
+        image.focal_point_height,
+    ))
+
+
+def _lqip_cache_key(image) -> str:
+    return f"{LQIP_KEY_PREFIX}:{image.id}:{lqip_source_key(image)}"
+
+
+def compute_lqip(image) -> str:
+    """Data URI WebP sfocato, ritagliato 2:3 attorno al punto focale."""
+    import base64
+    import io
+
+    from PIL import Image as PILImage
+    from PIL import ImageFilter, ImageOps
+
+    with image.open_file() as f:
+        source = PILImage.open(f)
+        source.draft("RGB", (LQIP_SIZE[0] * 8, LQIP_SIZE[1] * 8))
+        source = source.convert("RGB")
+
+    centering = (0.5, 0.5)
+    focal_point = image.get_focal_point()
+    if focal_point is not None and image.width and image.height:
+        centering = (focal_point.centroid.x / image.width, focal_point.centroid.y / image.height)
+
+    thumb = ImageOps.fit(source, LQIP_SIZE, method=PILImage.BILINEAR, centering=centering)
+    thumb = thumb.filter(ImageFilter.GaussianBlur(LQIP_BLUR_RADIUS))
+    buffer = io.BytesIO()
+    thumb.save(buffer, "WEBP", quality=LQIP_QUALITY)
+    return "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def store_lqip(image):
+    """Calcola e salva il placeholder di un'immagine."""
+    from core.models import ImagePlaceholder
+
+    placeholder, _ = ImagePlaceholder.objects.update_or_create(
+        image=image,
+        defaults={"source_key": lqip_source_key(image), "data_uri": compute_lqip(image)},
+    )
+    cache.set(_lqip_cache_key(image), placeholder.data_uri, RENDITION_URL_CACHE_TIMEOUT)
+    return placeholder
+
+
+def _queue_lqip(image_ids) -> None:
+    """Accoda il calcolo dei placeholder mancanti (una volta ogni LQIP_QUEUE_TIMEOUT)."""
+    from django.db import transaction
+
+    from core.tasks import compute_image_placeholders
+
+    image_ids = [
+        image_id for image_id in image_ids
+        if cache.add(f"{LQIP_KEY_PREFIX}:queued:{image_id}", 1, LQIP_QUEUE_TIMEOUT)
+    ]
+    if image_ids:
+        transaction.on_commit(lambda: compute_image_placeholders.delay(image_ids))
+
+
+def lqip_placeholders(images) -> dict[int, str]:
+    """``{image_id: data_uri}`` per le immagini con un placeholder valido.
+
+    Stessi livelli delle URL renditions (LRU, cache condivisa, tabella);
+    per le immagini senza placeholder il calcolo viene accodato.
+    """
+    from core.models import ImagePlaceholder
+
+    keyed = {_lqip_cache_key(image): image for image in images if image is not None}
+    if not keyed:
+        return {}
+
+    found = _url_lru.get_many(keyed)
+    missing = [key for key in keyed if key not in found]
+    if missing:
+        shared = cache.get_many(missing)
+        _url_lru.set_many(shared)
+        found.update(shared)
+        missing = [key for key in missing if key not in shared]
+    if missing:
+        stored = {
+            placeholder.image_id: placeholder
+            for placeholder in ImagePlaceholder.objects.filter(
+                image_id__in={keyed[key].id for key in missing}
+            )
+        }
+        loaded = {}
+        for key in missing:
+            image = keyed[key]
+            placeholder = stored.get(image.id)
+            if placeholder is not None and placeholder.source_key == lqip_source_key(image):
+                loaded[key] = placeholder.data_uri
+        cache.set_many(loaded, RENDITION_URL_CACHE_TIMEOUT)
+        _url_lru.set_many(loaded)
+        found.update(loaded)
+        absent = [key for key in missing if key not in loaded]
+        _url_lru.set_many(dict.fromkeys(absent, ""), ttl=LQIP_MISSING_TTL)
+        _queue_lqip(keyed[key].id for key in absent)
+
+    return {image.id: found[key] for key, image in keyed.items() if found.get(key)}
+
+
+def placeholder_urls(images) -> dict[int, str | None]:
+    """Placeholder per immagine: data URI LQIP o, finche' manca, URL della thumb."""
+    images = [image for image in images if image is not None]
+    inline = lqip_placeholders(images)
+    pending = [image for image in images if image.id not in inline]
+    urls = cached_rendition_urls((image, API_THUMB_SPEC) for image in pending)
+    return {
+        **{image.id: absolute_url(urls.get((image.id, API_THUMB_SPEC))) for image in pending},
+        **inline,
+    }
+
+
+def placeholder_url(image) -> str | None:
+    if image is None:
+        return None
+    return placeholder_urls([image]).get(image.id)
+
+
+def api_image_urls(image_ids) -> dict[int, dict[str, str | None]]:
+    """``{image_id: {"image_url", "image_thumb"}}`` come nei payload API.
+
+    Una query per le immagini, poi le cache di URL e placeholder.
+    """
+    image_ids = {image_id for image_id in image_ids if image_id}
+    if not image_ids:
+        return {}
+
+    images = list(get_image_model().objects.filter(id__in=image_ids))
+    urls = cached_rendition_urls((image, API_IMAGE_SPEC) for image in images)
+    thumbs = placeholder_urls(images)
+    return {
+        image.id: {
+            "image_url": absolute_url(urls.get((image.id, API_IMAGE_SPEC))),
+            "image_thumb": thumbs.get(image.id),
+        }
+        for image in images
+    }
+
+
+def image_rendition_specs(image_ids) -> dict[int, tuple[str, ...]]:
+    """Ritorna ``{image_id: specs}`` in base a dove ogni immagine e' usata."""
+    from artists.models import ArtistGalleryImage, ArtistPage
+    from events.models import EventPage
+
+    image_ids = {image_id for image_id in image_ids if image_id}
+    if not image_ids:
+        return {}
+
+    usages = [
+        ("artist_main_image", ArtistPage.objects.filter(main_image_id__in=image_ids)
+            .values_list("main_image_id", flat=True)),
+        ("artist_gallery_image", ArtistGalleryImage.objects.filter(image_id__in=image_ids)
+            .values_list("image_id", flat=True)),
+        ("event_featured_image", EventPage.objects.filter(featured_image_id__in=image_ids)
+            .values_list("featured_image_id", flat=True)),
+    ]
+    roles: dict[int, list[str]] = defaultdict(list)
+    for role, used_ids in usages:
+        for image_id in set(used_ids):
+            roles[image_id].append(role)
+
+    return {
+        image_id: _unique(*(
+            spec
+            for role in roles.get(image_id, ["upload"])
+            for spec in RENDITION_SPECS[role]
+        ))
+        for image_id in sorted(image_ids)
+    }
+
+
+# === Avanzamento warm-up (cache condivisa, letto dalla dashboard admin) ===
+
+def _warmup_key(job_id: str, part: str) -> str:
+    return f"{WARMUP_KEY_PREFIX}:{job_id}:{part}"
+
+
+def start_warmup_job(label: str, total: int) -> str:
+    """Registra un job di warm-up con ``total`` renditions da generare."""
+    job_id = uuid.uuid4().hex
+    cache.set_many(
+        {
+            _warmup_key(job_id, "meta"): {
+                "id": job_id,
+                "label": label,
+                "total": total,
+                "started_at": timezone.now(),
+            },
+            _warmup_key(job_id, "done"): 0,
+            _warmup_key(job_id, "failed"): 0,
+        },
+        WARMUP_TIMEOUT,
+    )
+    jobs_key = f"{WARMUP_KEY_PREFIX}:jobs"
+    jobs = cache.get(jobs_key, [])
+    cache.set(jobs_key, [job_id, *jobs][:WARMUP_JOBS_KEPT], WARMUP_TIMEOUT)
+    return job_id
+
+
+def record_warmup_progress(job_id: str, done: int = 0, failed: int = 0) -> None:
+    """Aggiorna i contatori (atomici su Redis) di un job di warm-up."""
+    for part, delta in (("done", done), ("failed", failed)):
+        if not delta:
+            continue
+        try:
+            cache.incr(_warmup_key(job_id, part), delta)
+        except ValueError:
+            # Job scaduto dalla cache: l'avanzamento non e' piu' visibile
+            pass
+
+
+def warmup_jobs() -> list[dict]:
+    """Job di warm-up recenti, dal piu' nuovo, con avanzamento."""
+    job_ids = cache.get(f"{WARMUP_KEY_PREFIX}:jobs", [])
+    values = cache.get_many([
+        _warmup_key(job_id, part) for job_id in job_ids for part in ("meta", "done", "failed")
+    ])
+
+    jobs = []
+    for job_id in job_ids:
+        meta = values.get(_warmup_key(job_id, "meta"))
+        if meta is None:
+            continue
+        done = values.get(_warmup_key(job_id, "done"), 0)
+        failed = values.get(_warmup_key(job_id, "failed"), 0)
+        jobs.append({
+            **meta,
+            "done": done,
+            "failed": failed,
+            "finished": done + failed >= meta["total"],
+            "percent": round(100 * (done + failed) / meta["total"]) if meta["total"] else 100,
+        })
+    return jobs
@@ -0,0 +1,137 @@
+"""Cache delle risposte API v2 per le richieste anonime, con purge per surrogate key.
+
+I viewset di artisti ed eventi marcano le risposte con l'header
+``Surrogate-Key`` (es. ``roster artist:<translation_key>``); il middleware
+``APIResponseCacheMiddleware`` salva il corpo insieme alla generazione
+corrente di ogni chiave. Purgare una chiave incrementa la sua generazione:
+le risposte che la contengono non vengono piu' servite, le altre restano
+valide. Le generazioni vivono nella cache condivisa, come quelle della
+ricerca. ``API_RESPONSE_CACHE = False`` nei settings disattiva la cache.
+
+Chiavi usate:
+
+- ``roster``: listing artisti (qualsiasi artista pubblicato/ritirato);
+- ``calendar``: listing eventi (qualsiasi evento pubblicato/ritirato/archiviato);
+- ``artist:<translation_key>``: risposte che contengono l'artista o i suoi
+  eventi, in tutte le lingue;
+- ``event:<pk>``: risposte che contengono l'evento.
+"""
+import hashlib
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+
+from core.cache import bump_cache_generation, get_cache_generations
+
+API_RESPONSE_CACHE_PREFIXES = ("/api/v2/artists/", "/api/v2/events/")
+API_RESPONSE_CACHE_TTL = 600
+SURROGATE_KEY_HEADER = "Surrogate-Key"
+
+ROSTER_KEY = "roster"
+CALENDAR_KEY = "calendar"
+
+# Header della risposta originale da non ripetere nelle risposte dalla cache
+_SKIPPED_HEADERS = {"set-cookie", "cache-control", "expires"}
+
+
+def artist_key(translation_key) -> str:
+    return f"artist:{translation_key}"
+
+
+def event_key(pk) -> str:
+    return f"event:{pk}"
+
+
+def _generation_namespace(key: str) -> str:
+    return f"api:{key}"
+
+
+def set_surrogate_keys(response, keys) -> None:
+    """Marca la risposta con le surrogate key dei contenuti serializzati."""
+    response[SURROGATE_KEY_HEADER] = " ".join(sorted(keys))
+
+
+def purge_surrogate_keys(keys) -> None:
+    """Invalida le risposte marcate con almeno una delle chiavi."""
+    for key in set(keys):
+        bump_cache_generation(_generation_namespace(key))
+
+
+def purge_surrogate_keys_on_commit(keys) -> None:
+    """Purge dopo il commit: prima i worker leggerebbero ancora i dati vecchi."""
+    keys = set(keys)
+    transaction.on_commit(lambda: purge_surrogate_keys(keys))
+
+
+def is_cacheable_request(request) -> bool:
+    return (
+        getattr(settings, "API_RESPONSE_CACHE", True)
+        and request.method == "GET"
+        and request.path.startswith(API_RESPONSE_CACHE_PREFIXES)
+        and not request.user.is_authenticated
+    )
+
+
+def response_cache_key(request) -> str:
+    """Chiave della risposta: host + path + query string ordinata + lingua."""
+    query = urlencode(sorted(request.GET.lists()), doseq=True)
+    language = getattr(request, "LANGUAGE_CODE", "")
+    raw = f"{request.get_host()}|{request.path}|{query}|{language}"
+    return f"api:response:{hashlib.sha256(raw.encode()).hexdigest()}"
+
+
+def _generations(keys) -> dict[str, int]:
+    namespaces = {_generation_namespace(key): key for key in keys}
+    generations = get_cache_generations(namespaces)
+    return {namespaces[namespace]: value for namespace, value in generations.items()}
+
+
+def get_cached_response(request) -> HttpResponse | None:
+    """Risposta in cache se nessuna delle sue surrogate key e' stata purgata."""
+    entry = cache.get(response_cache_key(request))
+    if entry is None:
+        return None
+    if _generations(entry["generations"]) != entry["generations"]:
+        return None
+
+    response = HttpResponse(entry["content"], status=entry["status"])
+    for header, value in entry["headers"]:
+        response[header] = value
+    if entry.get("areas"):
+        # Validatori sulle versioni correnti: una versione cambiata senza
+        # purge delle surrogate key non risponde 304 con l'ETag vecchio
+        from core.conditional import api_validators
+
+        response["ETag"], response["Last-Modified"] = api_validators(request, entry["areas"])
+    return response
+
+
+def store_response(request, response) -> bool:
+    """Salva una risposta 200 marcata con surrogate key; False se non cacheable."""
+    keys = response.get(SURROGATE_KEY_HEADER, "").split()
+    if response.status_code != 200 or not keys or response.cookies or response.streaming:
+        return False
+
+    headers = [
+        (header, value)
+        for header, value in response.items()
+        if header.lower() not in _SKIPPED_HEADERS
+    ]
+    cache.set(
+        response_cache_key(request),
+        {
+            "content": response.content,
+            "status": response.status_code,
+            "headers": headers,
+            # Generazioni lette dopo la view: un purge durante la
+            # serializzazione puo' lasciare una risposta vecchia fino al TTL
+            "generations": _generations(keys),
+            # Aree dei validatori ETag/Last-Modified (``core.conditional``)
+            "areas": sorted(getattr(response, "content_areas", ())),
+        },
+        API_RESPONSE_CACHE_TTL,
+    )
+    return True
@@ -1,19 +1,51 @@
 """API per ricerca globale su artisti ed eventi."""
-from difflib import SequenceMatcher
+import base64
+import binascii
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import reduce
+import hashlib
+from operator import or_
+import threading
+import time
 import unicodedata
-
-from django.db.models import Q
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.contrib.postgres.lookups import TrigramWordSimilar
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import close_old_connections, connection, transaction
+from django.db.models import CharField, Func, Q, TextField, Value
+from django.db.models.functions import Greatest, Lower
 from django.http import JsonResponse
 
+from core.cache import get_cache_generation, increment_cache_counter
+from core.conditional import ARTISTS, EVENTS, IMAGES, VENUES, conditional_api
+from core.renditions import API_IMAGE_SPEC, api_image_urls, placeholder_url, rendition_url
+from core.search_index import SEARCH_GENERATION, FuzzyIndex, get_fuzzy_index
+from core.search_trace import SearchTrace
 
-def _safe_rendition_url(image, spec):
-    """Ritorna la URL di una rendition, se disponibile."""
-    if not image:
-        return None
-    try:
-        return image.get_rendition(spec).full_url
-    except Exception:
-        return None
+# Profondita' massima del ranking per tipo: le pagine successive (?cursor=)
+# leggono da questo ranking salvato in cache invece di ricalcolarlo.
+SEARCH_RESULTS_DEPTH = 100
+SEARCH_CURSOR_TTL = 600
+
+# Cache dei risultati (prima pagina): le chiavi includono la generazione
+# "search", quindi ogni publish/unpublish/archiviazione le rende obsolete.
+SEARCH_RESULTS_CACHE_TTL = 300
+SEARCH_CACHE_STATS_KEYS = {
+    "hits": "search:stats:hits",
+    "misses": "search:stats:misses",
+}
+
+# Autocomplete unificato: ordine dei tipi a parita' di match e lunghezza
+# massima della query (limita il lavoro per battuta).
+AUTOCOMPLETE_TYPES = ("artist", "event", "venue", "city")
+AUTOCOMPLETE_MAX_QUERY_LENGTH = 64
+
+_executor = None
+_executor_lock = threading.Lock()
 
 
 def _normalize_search_text(value):
@@ -35,92 +67,195 @@ def _resolve_locale_code(request):
     return locale.split("-")[0]
 
 
+def _resolve_locale_id(locale_code):
+    """Ritorna l'ID del Locale Wagtail per il codice lingua, se esiste."""
+    from wagtail.models import Locale
+
+    return (
+        Locale.objects.filter(language_code=locale_code)
+        .values_list("id", flat=True)
+        .first()
+    )
+
+
 def _apply_locale_filter(queryset, locale_code):
-    """Filtra il queryset sulla lingua richiesta, se presente."""
+    """Filtra il queryset sulla lingua richiesta, se presente.
+
+    Filtra su ``locale_id`` (``FilterField("locale")`` di Page) cosi' il
+    filtro vale anche dentro ``.search()``/``.autocomplete()`` e viene
+    applicato dal backend di ricerca, non a posteriori in Python.
+    """
     if not locale_code:
         return queryset
-    return queryset.filter(locale__language_code=locale_code)
+    locale_id = _resolve_locale_id(locale_code)
+    if locale_id is None:
+        return queryset.none()
+    return queryset.filter(locale_id=locale_id)
 
 
-def _filter_pages_for_locale(pages, locale_code, limit):
-    """Filtra una sequenza di pagine per lingua dopo una full-text search."""
-    if not locale_code:
-        return list(pages)[:limit]
+def _build_artist_fuzzy_index(locale_code):
+    """Costruisce l'indice fuzzy artisti (titolo, bio, tributo, generi)."""
+    from artists.models import ArtistPage
 
-    filtered = [
-        page for page in pages
-        if getattr(getattr(page, "locale", None), "language_code", None) == locale_code
-    ]
-    return filtered[:limit]
+    pages = _apply_locale_filter(ArtistPage.objects.live(), locale_code)
 
+    genre_names = defaultdict(list)
+    genre_rows = (
+        ArtistPage.genres.through.objects
+        .filter(artistpage__in=pages)
+        .order_by("genre__name")
+        .values_list("artistpage_id", "genre__name")
+    )
+    for page_id, name in genre_rows:
+        genre_names[page_id].append(name)
+
+    index = FuzzyIndex()
+    rows = pages.values_list("id", "title", "short_bio", "tribute_to")
+    for page_id, title, short_bio, tribute_to in rows:
+        index.add(
+            page_id,
+            title.lower(),
+            [
+                _normalize_search_text(value)
+                for value in (title, short_bio, tribute_to, " ".join(genre_names[page_id]))
+            ],
+        )
+    return index
 
-def _fuzzy_score(query_string, *values):
-    """Ritorna uno score fuzzy basato sui token disponibili."""
-    normalized_query = _normalize_search_text(query_string)
-    if len(normalized_query) < 3:
-        return 0.0
 
-    best_score = 0.0
-    for value in values:
-        normalized_value = _normalize_search_text(value)
-        if not normalized_value:
-            continue
+def _build_event_fuzzy_index(locale_code):
+    """Costruisce l'indice fuzzy eventi (titolo, descrizione, venue, citta)."""
+    from events.models import EventPage
 
-        if normalized_query in normalized_value:
-            return 1.0
+    pages = _apply_locale_filter(
+        EventPage.objects.live().filter(is_archived=False),
+        locale_code,
+    )
 
-        best_score = max(
-            best_score,
-            SequenceMatcher(None, normalized_query, normalized_value).ratio(),
+    index = FuzzyIndex()
+    rows = pages.values_list("id", "title", "description", "venue__name", "venue__city")
+    for page_id, title, description, venue_name, venue_city in rows:
+        index.add(
+            page_id,
+            title.lower(),
+            [
+                _normalize_search_text(value)
+                for value in (title, description, venue_name, venue_city)
+            ],
         )
+    return index
 
-        for token in normalized_value.split():
-            best_score = max(
-                best_score,
-                SequenceMatcher(None, normalized_query, token).ratio(),
-            )
 
-    return best_score
+def _artist_fuzzy_index(locale_code):
+    return get_fuzzy_index("artists", locale_code, _build_artist_fuzzy_index)
+
+
+def _event_fuzzy_index(locale_code):
+    return get_fuzzy_index("events", locale_code, _build_event_fuzzy_index)
+
 
+class ImmutableUnaccent(Func):
+    """f_unaccent(): wrapper IMMUTABLE di unaccent() (migration core 0007)."""
 
-def _fuzzy_match_artists(queryset, query_string, limit):
-    """Fallback fuzzy per artisti quando la full-text non trova risultati."""
-    candidates = list(
-        queryset.select_related("main_image").prefetch_related("genres", "target_events")
+    function = "f_unaccent"
+    output_field = TextField()
+
+
+def _trigram_expression(field):
+    """Stessa espressione degli indici GIN: f_unaccent(lower(field))."""
+    return ImmutableUnaccent(Lower(field))
+
+
+def _use_trigram_backend():
+    """True se il fallback fuzzy va eseguito con pg_trgm."""
+    return (
+        getattr(settings, "SEARCH_FUZZY_BACKEND", "python") == "trigram"
+        and connection.vendor == "postgresql"
     )
-    scored = []
-    for page in candidates:
-        score = _fuzzy_score(
+
+
+def _trigram_match(queryset, query_string, fields, limit):
+    """Ranking per word_similarity() su piu' campi in un'unica query indicizzata.
+
+    Il filtro usa l'operatore ``%>`` (coperto dagli indici GIN trigram);
+    la soglia e' impostata per la sola transazione corrente.
+    """
+    query = _normalize_search_text(query_string)
+    if len(query) < 3:
+        return []
+
+    expressions = [_trigram_expression(field) for field in fields]
+    matches = reduce(or_, (Q(TrigramWordSimilar(expr, query)) for expr in expressions))
+    score = Greatest(*(TrigramWordSimilarity(query, expr) for expr in expressions))
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT set_config('pg_trgm.word_similarity_threshold', %s, true)",
+                [str(settings.SEARCH_TRIGRAM_THRESHOLD)],
+            )
+        return list(
+            queryset.filter(matches)
+            .annotate(fuzzy_score=score)
+            .order_by("-fuzzy_score", "title")
+            .values_list("id", flat=True)[:limit]
+        )
+
+
+def _fuzzy_match_artists(locale_code, query_string, limit):
+    """Fallback fuzzy per artisti: ritorna gli ID ordinati per score."""
+    if _use_trigram_backend():
+        from artists.models import ArtistPage
+
+        return _trigram_match(
+            _apply_locale_filter(ArtistPage.objects.live(), locale_code),
             query_string,
-            page.title,
-            page.short_bio,
-            page.tribute_to,
-            " ".join(g.name for g in page.genres.all()),
+            ("title", "short_bio", "tribute_to"),
+            limit,
         )
-        if score >= 0.78:
-            scored.append((score, page.title.lower(), page))
 
-    scored.sort(key=lambda item: (-item[0], item[1]))
-    return [page for _, _, page in scored[:limit]]
+    return _artist_fuzzy_index(locale_code).search(
+        _normalize_search_text(query_string), limit
+    )
 
 
-def _fuzzy_match_events(queryset, query_string, limit):
-    """Fallback fuzzy per eventi quando la full-text non trova risultati."""
-    candidates = list(queryset.select_related("venue"))
-    scored = []
-    for page in candidates:
-        score = _fuzzy_score(
+def _fuzzy_match_events(locale_code, query_string, limit):
+    """Fallback fuzzy per eventi: ritorna gli ID ordinati per score."""
+    if _use_trigram_backend():
+        from events.models import EventPage
+
+        return _trigram_match(
+            _apply_locale_filter(
+                EventPage.objects.live().filter(is_archived=False),
+                locale_code,
+            ),
             query_string,
-            page.title,
-            page.description,
-            page.venue.name if page.venue else "",
-            page.venue.city if page.venue else "",
+            ("title", "venue__name", "venue__city"),
+            limit,
         )
-        if score >= 0.78:
-            scored.append((score, page.title.lower(), page))
 
-    scored.sort(key=lambda item: (-item[0], item[1]))
-    return [page for _, _, page in scored[:limit]]
+    return _event_fuzzy_index(locale_code).search(
+        _normalize_search_text(query_string), limit
+    )
+
+
+def _did_you_mean(locale_code, query_string, search_type="all"):
+    """Suggerimento "forse cercavi" dal vocabolario degli indici fuzzy.
+
+    Disponibile solo con il backend in memoria: il backend trigram non
+    costruisce un vocabolario.
+    """
+    if _use_trigram_backend():
+        return None
+
+    normalized_query = _normalize_search_text(query_string)
+    if search_type in ("all", "artists"):
+        suggestion = _artist_fuzzy_index(locale_code).suggest(normalized_query)
+        if suggestion:
+            return suggestion
+    if search_type in ("all", "events"):
+        return _event_fuzzy_index(locale_code).suggest(normalized_query)
+    return None
 
 
 def _serialize_artist_result(page):
@@ -137,14 +272,8 @@ def _serialize_artist_result(page):
         "slug": page.slug,
         "genre": genre_display,
         "genre_display": genre_display,
-        "image_url": _safe_rendition_url(
-            page.main_image,
-            "fill-800x1200|format-webp",
-        ),
-        "image_thumb": _safe_rendition_url(
-            page.main_image,
-            "fill-40x60|format-webp",
-        ),
+        "image_url": rendition_url(page.main_image, API_IMAGE_SPEC, full=True),
+        "image_thumb": placeholder_url(page.main_image),
         "artist_type": page.artist_type,
         "short_bio": page.short_bio,
         "tags": tags,
@@ -156,176 +285,640 @@ def _serialize_artist_result(page):
     }
 
 
+def _run_pipeline(kind, trace, stages):
+    """Esegue gli stage in ordine e si ferma al primo che trova risultati.
+
+    Ogni stage viene misurato dalla trace. Ritorna ``(ids, fuzzy_used)``.
+    """
+    for name, run in stages:
+        with trace.stage(f"{kind}.{name}") as record:
+            ids = run()
+            record["candidates"] = len(ids)
+        if ids:
+            trace.answered(kind, name)
+            return ids, name == "fuzzy"
+
+    trace.answered(kind, "none")
+    return [], True
+
+
+def _rank_artists(query_string, locale_code, depth, trace):
+    """Pipeline full-text -> icontains -> fuzzy per gli artisti.
+
+    Ritorna ``(ids, fuzzy_used)`` con al massimo ``depth`` ID ordinati.
+    """
+    from artists.models import ArtistPage
+
+    base_qs = _apply_locale_filter(ArtistPage.objects.live(), locale_code)
+
+    return _run_pipeline("artists", trace, [
+        ("fulltext", lambda: [
+            page.id for page in base_qs.search(query_string, operator="or")[:depth]
+        ]),
+        ("icontains", lambda: list(
+            base_qs
+            .filter(
+                Q(title__icontains=query_string)
+                | Q(short_bio__icontains=query_string)
+                | Q(tribute_to__icontains=query_string)
+                | Q(genres__name__icontains=query_string)
+            )
+            .distinct()
+            .order_by("title")
+            .values_list("id", flat=True)[:depth]
+        )),
+        ("fuzzy", lambda: _fuzzy_match_artists(locale_code, query_string, depth)),
+    ])
+
+
+def _rank_events(query_string, locale_code, depth, trace):
+    """Pipeline full-text -> icontains -> fuzzy per gli eventi.
+
+    Ritorna ``(ids, fuzzy_used)`` con al massimo ``depth`` ID ordinati.
+    """
+    from events.models import EventPage
+
+    base_qs = _apply_locale_filter(
+        EventPage.objects.live().filter(is_archived=False),
+        locale_code,
+    )
+
+    return _run_pipeline("events", trace, [
+        ("fulltext", lambda: [
+            page.id for page in base_qs.search(query_string, operator="or")[:depth]
+        ]),
+        ("icontains", lambda: list(
+            base_qs
+            .filter(
+                Q(title__icontains=query_string)
+                | Q(description__icontains=query_string)
+                | Q(venue__name__icontains=query_string)
+                | Q(venue__city__icontains=query_string)
+            )
+            .distinct()
+            .order_by("start_date")
+            .values_list("id", flat=True)[:depth]
+        )),
+        ("fuzzy", lambda: _fuzzy_match_events(locale_code, query_string, depth)),
+    ])
+
+
+def _artist_related_names(artist_ids):
+    """Nomi di generi e target event per artista, con un'unica query UNION.
+
+    Ritorna ``(genres, target_events)``: dict ``{artist_id: [nomi]}``
+    ordinati per nome come ``page.genres.all()``/``page.target_events.all()``.
+    """
+    from artists.models import ArtistPage
+
+    genres_qs = (
+        ArtistPage.genres.through.objects
+        .filter(artistpage_id__in=artist_ids)
+        .annotate(kind=Value("genre", output_field=CharField()))
+        .values_list("kind", "artistpage_id", "genre__name")
+    )
+    targets_qs = (
+        ArtistPage.target_events.through.objects
+        .filter(artistpage_id__in=artist_ids)
+        .annotate(kind=Value("target", output_field=CharField()))
+        .values_list("kind", "artistpage_id", "targetevent__name")
+    )
+
+    names = {"genre": defaultdict(list), "target": defaultdict(list)}
+    for kind, artist_id, name in genres_qs.union(targets_qs, all=True).order_by("genre__name"):
+        names[kind][artist_id].append(name)
+    return names["genre"], names["target"]
+
+
+def _serialize_artist_results(artist_ids):
+    """Serializza gli artisti nell'ordine degli ID dati, senza istanziare pagine.
+
+    Payload identico a ``_serialize_artist_result``: colonne via
+    ``values()``, nomi generi/target event con una query aggregata e URL
+    renditions in blocco.
+    """
+    from artists.models import ArtistPage
+
+    if not artist_ids:
+        return []
+
+    rows = {
+        row["id"]: row
+        for row in ArtistPage.objects.filter(id__in=artist_ids).values(
+            "id",
+            "title",
+            "slug",
+            "main_image_id",
+            "artist_type",
+            "short_bio",
+            "tribute_to",
+            "hero_video_url",
+            "base_country",
+            "base_region",
+            "base_city",
+        )
+    }
+    genres, target_events = _artist_related_names(list(rows))
+    images = api_image_urls(row["main_image_id"] for row in rows.values())
+
+    results = []
+    for page_id in artist_ids:
+        row = rows.get(page_id)
+        if row is None:
+            continue
+        genre_names = genres.get(page_id, [])
+        genre_display = ", ".join(genre_names)
+        image_id = row["main_image_id"]
+        results.append({
+            "type": "artist",
+            "id": row["id"],
+            "title": row["title"],
+            "slug": row["slug"],
+            "genre": genre_display,
+            "genre_display": genre_display,
+            "image_url": images.get(image_id, {}).get("image_url"),
+            "image_thumb": images.get(image_id, {}).get("image_thumb"),
+            "artist_type": row["artist_type"],
+            "short_bio": row["short_bio"],
+            "tags": genre_names + target_events.get(page_id, []),
+            "tribute_to": row["tribute_to"],
+            "hero_video_url": row["hero_video_url"],
+            "base_country": row["base_country"] or "",
+            "base_region": row["base_region"],
+            "base_city": row["base_city"],
+        })
+    return results
+
+
+def _serialize_event_results(event_ids):
+    """Serializza gli eventi nell'ordine degli ID dati, senza istanziare pagine."""
+    from events.models import EventPage
+
+    if not event_ids:
+        return []
+
+    rows = {
+        row["id"]: row
+        for row in EventPage.objects.filter(id__in=event_ids).values(
+            "id", "title", "slug", "start_date", "venue__name", "venue__city"
+        )
+    }
+    return [
+        {
+            "type": "event",
+            "id": row["id"],
+            "title": row["title"],
+            "slug": row["slug"],
+            "start_date": (
+                row["start_date"].isoformat() if row["start_date"] else None
+            ),
+            "venue_name": row["venue__name"] or "",
+            "city": row["venue__city"] or "",
+        }
+        for row in (rows.get(pk) for pk in event_ids)
+        if row is not None
+    ]
+
+
+def _limit_param(request, default, maximum):
+    """``?limit=`` tra 1 e ``maximum``; None se non e' un intero."""
+    try:
+        limit = int(request.GET.get("limit", default))
+    except (ValueError, TypeError):
+        return None
+    # Con limit <= 0 il cursor non avanzerebbe mai
+    return max(1, min(limit, maximum))
+
+
+def _encode_cursor(token, offset):
+    raw = f"{token}:{offset}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor):
+    """Ritorna ``(token, offset)`` oppure None se il cursor non e' valido."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        token, offset = base64.urlsafe_b64decode(padded).decode("ascii").split(":")
+        uuid.UUID(token)
+        offset = int(offset)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        return None
+    if offset < 0:
+        return None
+    return token, offset
+
+
+def _ranking_cache_key(token):
+    return f"search:ranking:{token}"
+
+
+def _cache_query_key(query_string):
+    """Query normalizzata per le chiavi cache (maiuscole e spazi)."""
+    return " ".join(query_string.lower().split())
+
+
+def _results_cache_key(endpoint, query_string, *parts):
+    """Chiave cache risultati: query normalizzata + parametri + generazione."""
+    raw = "|".join(str(part) for part in (_cache_query_key(query_string), *parts))
+    digest = hashlib.md5(raw.encode("utf-8")).hexdigest()
+    generation = get_cache_generation(SEARCH_GENERATION)
+    return f"search:results:{endpoint}:{generation}:{digest}"
+
+
+def _cached_results_response(cache_key, query_string, trace):
+    """Ritorna la risposta dalla cache risultati, o None (e conta hit/miss)."""
+    with trace.stage("cache") as record:
+        payload = cache.get(cache_key)
+        record["candidates"] = int(payload is not None)
+    if payload is None:
+        increment_cache_counter(SEARCH_CACHE_STATS_KEYS["misses"])
+        return None
+
+    trace.answered("all", "cache")
+
+    increment_cache_counter(SEARCH_CACHE_STATS_KEYS["hits"])
+    # La chiave e' normalizzata: riporta la query esattamente come ricevuta
+    payload["query"] = query_string
+    response = JsonResponse(payload)
+    response["X-Search-Cache"] = "HIT"
+    return trace.finish(response)
+
+
+def _store_results_response(cache_key, payload, trace):
+    cache.set(cache_key, payload, SEARCH_RESULTS_CACHE_TTL)
+    response = JsonResponse(payload)
+    response["X-Search-Cache"] = "MISS"
+    return trace.finish(response)
+
+
+def get_search_cache_stats():
+    """Contatori hit/miss della cache risultati (condivisi tra i worker)."""
+    stats = {
+        name: cache.get(key) or 0
+        for name, key in SEARCH_CACHE_STATS_KEYS.items()
+    }
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+    return stats
+
+
+def reset_search_cache_stats():
+    cache.delete_many(list(SEARCH_CACHE_STATS_KEYS.values()))
+
+
+@conditional_api(ARTISTS, EVENTS, VENUES, IMAGES)
 def search_api(request):
     """Ricerca full-text su artisti e/o eventi.
 
-    GET /api/v2/search/?q=<query>&type=all|artists|events&limit=10
+    GET /api/v2/search/?q=<query>&type=all|artists|events&limit=10&cursor=<cursor>
 
     Parametri:
         q: stringa di ricerca (minimo 2 caratteri)
         type: "all" (default), "artists", "events"
-        limit: max risultati (default 10, max 50)
+        limit: max risultati per tipo (default 10, max 50)
+        cursor: token opaco ``next_cursor`` della pagina precedente
 
-    Ritorna JSON con risultati unificati.
+    Ritorna JSON con risultati unificati. Il ranking viene calcolato una
+    sola volta (fino a SEARCH_RESULTS_DEPTH per tipo) e salvato in cache:
+    le pagine successive leggono solo la finestra richiesta.
     """
     query_string = request.GET.get("q", "").strip()
     search_type = request.GET.get("type", "all")
     locale_code = _resolve_locale_code(request)
 
-    try:
-        limit = min(int(request.GET.get("limit", "10")), 50)
-    except (ValueError, TypeError):
-        limit = 10
+    limit = _limit_param(request, 10, 50)
+    if limit is None:
+        return JsonResponse({"detail": "limit deve essere un intero."}, status=400)
 
     if not query_string or len(query_string) < 2:
         return JsonResponse({"results": [], "query": query_string, "total": 0})
 
-    results = []
+    trace = SearchTrace("search", query_string)
+    ranking_key = [_cache_query_key(query_string), search_type, locale_code]
+    ranking = None
+    token = None
+    offset = 0
+
+    cursor = request.GET.get("cursor")
+    results_cache_key = None
+    if not cursor:
+        results_cache_key = _results_cache_key(
+            "search", query_string, search_type, locale_code, limit
+        )
+        cached = _cached_results_response(results_cache_key, query_string, trace)
+        if cached is not None:
+            return cached
+    else:
+        decoded = _decode_cursor(cursor)
+        if decoded is None:
+            return JsonResponse({"detail": "Cursor non valido."}, status=400)
+        token, offset = decoded
+        ranking = cache.get(_ranking_cache_key(token))
+        if ranking is not None and ranking["key"] != ranking_key:
+            return JsonResponse(
+                {"detail": "Il cursor non corrisponde alla ricerca."},
+                status=400,
+            )
 
-    if search_type in ("all", "artists"):
-        from artists.models import ArtistPage
+    if ranking is None:
+        # Prima pagina, oppure ranking scaduto dalla cache
+        ranking = {"key": ranking_key, "artists": [], "events": [], "fuzzy": False}
+        if search_type in ("all", "artists"):
+            ranking["artists"], fuzzy_used = _rank_artists(
+                query_string, locale_code, SEARCH_RESULTS_DEPTH, trace
+            )
+            ranking["fuzzy"] |= fuzzy_used
+        if search_type in ("all", "events"):
+            ranking["events"], fuzzy_used = _rank_events(
+                query_string, locale_code, SEARCH_RESULTS_DEPTH, trace
+            )
+            ranking["fuzzy"] |= fuzzy_used
+        token = None
+
+    end = offset + limit
+    with trace.stage("serialize") as record:
+        results = _serialize_artist_results(ranking["artists"][offset:end])
+        results += _serialize_event_results(ranking["events"][offset:end])
+        record["candidates"] = len(results)
+
+    next_cursor = None
+    if end < max(len(ranking["artists"]), len(ranking["events"])):
+        if token is None:
+            token = uuid.uuid4().hex
+            cache.set(_ranking_cache_key(token), ranking, SEARCH_CURSOR_TTL)
+        next_cursor = _encode_cursor(token, end)
+
+    payload = {
+        "query": query_string,
+        "total": len(results),
+        "results": results,
+        "next_cursor": next_cursor,
+    }
+    if ranking["fuzzy"] and not cursor:
+        with trace.stage("suggest"):
+            payload["did_you_mean"] = _did_you_mean(locale_code, query_string, search_type)
 
-        artist_search_qs = ArtistPage.objects.live()
-        artist_base_qs = _apply_locale_filter(artist_search_qs, locale_code)
+    if results_cache_key:
+        return _store_results_response(results_cache_key, payload, trace)
+    return trace.finish(JsonResponse(payload))
 
-        artist_results = _filter_pages_for_locale(
-            artist_search_qs.search(query_string, operator="or")[: limit * 4],
-            locale_code,
-            limit,
+
+def _autocomplete_artists(query_string, locale_code, limit, trace):
+    """Suggerimenti artisti: autocomplete del backend, poi fallback fuzzy."""
+    from artists.models import ArtistPage
+
+    search_qs = _apply_locale_filter(ArtistPage.objects.live(), locale_code)
+
+    result_ids, _fuzzy_used = _run_pipeline("artists", trace, [
+        ("autocomplete", lambda: [
+            page.id for page in search_qs.autocomplete(query_string)[:limit]
+        ]),
+        ("fuzzy", lambda: _fuzzy_match_artists(locale_code, query_string, limit)),
+    ])
+
+    rows = {
+        row["id"]: row
+        for row in ArtistPage.objects.filter(id__in=result_ids).values("id", "title", "slug")
+    }
+    genres, _target_events = _artist_related_names(list(rows))
+    return [
+        {
+            "type": "artist",
+            "id": row["id"],
+            "name": row["title"],
+            "slug": row["slug"],
+            "genre": ", ".join(genres.get(row["id"], [])),
+        }
+        for row in (rows.get(pid) for pid in result_ids)
+        if row is not None
+    ]
+
+
+def _autocomplete_events(query_string, locale_code, limit, trace):
+    """Suggerimenti eventi (``AutocompleteField("title")`` di EventPage)."""
+    from events.models import EventPage
+
+    search_qs = _apply_locale_filter(
+        EventPage.objects.live().filter(is_archived=False),
+        locale_code,
+    )
+    with trace.stage("events.autocomplete") as record:
+        result_ids = [page.id for page in search_qs.autocomplete(query_string)[:limit]]
+        record["candidates"] = len(result_ids)
+
+    rows = {
+        row["id"]: row
+        for row in EventPage.objects.filter(id__in=result_ids).values(
+            "id", "title", "slug", "start_date", "venue__city"
         )
-        if not artist_results:
-            artist_results = (
-                artist_base_qs
-                .filter(
-                    Q(title__icontains=query_string)
-                    | Q(short_bio__icontains=query_string)
-                    | Q(tribute_to__icontains=query_string)
-                    | Q(genres__name__icontains=query_string)
-                )
-                .distinct()
-                .order_by("title")[:limit]
-            )
-        if not artist_results:
-            artist_results = _fuzzy_match_artists(artist_base_qs, query_string, limit)
-        # Prefetch generi, target event e immagine per evitare N+1 query
-        artist_ids = [p.id for p in artist_results]
-        prefetched = {
-            a.id: a
-            for a in ArtistPage.objects.filter(
-                id__in=artist_ids
-            ).prefetch_related("genres", "target_events").select_related("main_image")
+    }
+    return [
+        {
+            "type": "event",
+            "id": row["id"],
+            "name": row["title"],
+            "slug": row["slug"],
+            "start_date": row["start_date"].isoformat() if row["start_date"] else None,
+            "city": row["venue__city"] or "",
         }
-        for page_id in artist_ids:
-            page = prefetched.get(page_id)
-            if not page:
-                continue
-            results.append(_serialize_artist_result(page))
+        for row in (rows.get(pid) for pid in result_ids)
+        if row is not None
+    ]
 
-    if search_type in ("all", "events"):
-        from events.models import EventPage
 
-        event_search_qs = EventPage.objects.live().filter(is_archived=False)
-        event_base_qs = _apply_locale_filter(
-            EventPage.objects.live().filter(is_archived=False),
-            locale_code,
+def _unaccent_contains(queryset, field, query_string):
+    """Filtro "contiene" senza maiuscole e accenti.
+
+    Su PostgreSQL usa ``f_unaccent(lower(field))``, coperto dagli indici GIN
+    trigram della migration core 0007; altrove ripiega su ``icontains``.
+    """
+    if connection.vendor != "postgresql":
+        return queryset.filter(**{f"{field}__icontains": query_string})
+    return queryset.alias(
+        unaccented=_trigram_expression(field)
+    ).filter(unaccented__contains=_normalize_search_text(query_string))
+
+
+def _autocomplete_venues(query_string, limit, trace):
+    """Suggerimenti venue per nome."""
+    from events.models import Venue
+
+    with trace.stage("venues.autocomplete") as record:
+        rows = list(
+            _unaccent_contains(Venue.objects.all(), "name", query_string)
+            .order_by("name")
+            .values("id", "name", "city")[:limit]
         )
+        record["candidates"] = len(rows)
 
-        event_results = _filter_pages_for_locale(
-            event_search_qs.search(query_string, operator="or")[: limit * 4],
-            locale_code,
-            limit,
+    return [
+        {"type": "venue", "id": row["id"], "name": row["name"], "slug": "", "city": row["city"]}
+        for row in rows
+    ]
+
+
+def _autocomplete_cities(query_string, limit, trace):
+    """Suggerimenti citta' (distinte, dai venue)."""
+    from events.models import Venue
+
+    with trace.stage("cities.autocomplete") as record:
+        cities = list(
+            _unaccent_contains(Venue.objects.all(), "city", query_string)
+            .order_by("city")
+            .values_list("city", flat=True)
+            .distinct()[:limit]
         )
-        if not event_results:
-            event_results = (
-                event_base_qs
-                .filter(
-                    Q(title__icontains=query_string)
-                    | Q(description__icontains=query_string)
-                    | Q(venue__name__icontains=query_string)
-                    | Q(venue__city__icontains=query_string)
+        record["candidates"] = len(cities)
+
+    return [
+        {"type": "city", "id": None, "name": city, "slug": "", "city": city}
+        for city in cities
+    ]
+
+
+def _autocomplete_match_rank(name, normalized_query):
+    """0 = il nome inizia con la query, 1 = una parola inizia con la query,
+    2 = la contiene, 3 = match fuzzy."""
+    normalized = _normalize_search_text(name)
+    if normalized.startswith(normalized_query):
+        return 0
+    if f" {normalized_query}" in f" {normalized}":
+        return 1
+    if normalized_query in normalized:
+        return 2
+    return 3
+
+
+def _autocomplete_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.SEARCH_AUTOCOMPLETE_WORKERS,
+                    thread_name_prefix="autocomplete",
                 )
-                .distinct()
-                .order_by("start_date")[:limit]
-            )
-        if not event_results:
-            event_results = _fuzzy_match_events(event_base_qs, query_string, limit)
-        for page in event_results:
-            results.append(
-                {
-                    "type": "event",
-                    "id": page.id,
-                    "title": page.title,
-                    "slug": page.slug,
-                    "start_date": (
-                        page.start_date.isoformat() if page.start_date else None
-                    ),
-                    "venue_name": page.venue.name if page.venue else "",
-                    "city": page.venue.city if page.venue else "",
-                }
-            )
+    return _executor
 
-    return JsonResponse(
-        {
-            "query": query_string,
-            "total": len(results),
-            "results": results,
-        }
-    )
 
+def _run_in_worker(source):
+    """Esegue una sorgente in un thread del pool con connessione DB sana.
 
+    Alla fine la connessione del thread si chiude se rotta o oltre
+    ``CONN_MAX_AGE`` (come a fine richiesta), anche se la sorgente fallisce.
+    """
+    close_old_connections()
+    try:
+        return source()
+    finally:
+        close_old_connections()
+
+
+def _run_autocomplete_sources(sources):
+    """Esegue le sorgenti entro ``SEARCH_AUTOCOMPLETE_BUDGET_MS``.
+
+    Su PostgreSQL (con ``SEARCH_AUTOCOMPLETE_WORKERS`` > 0) le sorgenti
+    girano in parallelo nel pool; altrove in sequenza, nell'ordine dato.
+    Le sorgenti non concluse entro il budget vengono scartate (in sequenza
+    la prima gira sempre); nel pool quelle non ancora partite vengono
+    annullate, cosi' il lavoro non si accoda tra una battuta e l'altra.
+    Ritorna ``(risultati per sorgente, partial)``.
+    """
+    budget = settings.SEARCH_AUTOCOMPLETE_BUDGET_MS / 1000
+
+    if settings.SEARCH_AUTOCOMPLETE_WORKERS > 0 and connection.vendor == "postgresql":
+        executor = _autocomplete_executor()
+        futures = [executor.submit(_run_in_worker, source) for source in sources]
+        done, pending = wait(futures, timeout=budget)
+        for future in pending:
+            future.cancel()
+        return (
+            [future.result() if future in done else [] for future in futures],
+            len(done) < len(futures),
+        )
+
+    deadline = time.perf_counter() + budget
+    results = []
+    partial = False
+    for source in sources:
+        if results and time.perf_counter() > deadline:
+            results.append([])
+            partial = True
+            continue
+        results.append(source())
+    return results, partial
+
+
+@conditional_api(ARTISTS, EVENTS, VENUES)
 def autocomplete_api(request):
     """Suggerimenti autocomplete per la search bar.
 
-    GET /api/v2/search/autocomplete/?q=<partial_query>&limit=5
+    GET /api/v2/search/autocomplete/?q=<partial_query>&limit=5&types=artist,event
 
     Parametri:
         q: stringa parziale (minimo 2 caratteri)
-        limit: max suggerimenti (default 5, max 20)
+        limit: max suggerimenti in totale (default 5, max 20)
+        types: tipi da includere tra artist, event, venue, city (default tutti)
 
-    Ritorna JSON con suggerimenti artisti.
+    Ritorna JSON con un'unica lista ``suggestions`` ordinata: prima i nomi
+    che iniziano con la query, poi quelli con una parola che inizia con la
+    query, poi i match parziali/fuzzy; a parita' artisti, eventi, venue,
+    citta'. Ogni suggerimento ha il campo ``type``.
     """
-    query_string = request.GET.get("q", "").strip()
+    query_string = request.GET.get("q", "").strip()[:AUTOCOMPLETE_MAX_QUERY_LENGTH]
     locale_code = _resolve_locale_code(request)
 
-    try:
-        limit = min(int(request.GET.get("limit", "5")), 20)
-    except (ValueError, TypeError):
-        limit = 5
+    limit = _limit_param(request, 5, 20)
+    if limit is None:
+        return JsonResponse({"detail": "limit deve essere un intero."}, status=400)
+
+    requested_types = [
+        kind for kind in AUTOCOMPLETE_TYPES
+        if kind in request.GET.get("types", "").split(",")
+    ] or list(AUTOCOMPLETE_TYPES)
 
     if not query_string or len(query_string) < 2:
         return JsonResponse({"suggestions": []})
 
-    from artists.models import ArtistPage
-
-    search_qs = ArtistPage.objects.live()
-    base_qs = _apply_locale_filter(search_qs, locale_code)
-
-    results = _filter_pages_for_locale(
-        search_qs.autocomplete(query_string)[: limit * 4],
-        locale_code,
-        limit,
+    trace = SearchTrace("autocomplete", query_string)
+    results_cache_key = _results_cache_key(
+        "autocomplete", query_string, locale_code, limit, ",".join(requested_types)
     )
-    if not results:
-        results = _fuzzy_match_artists(base_qs, query_string, limit)
-
-    # Prefetch genres per evitare N+1 query
-    result_ids = [p.id for p in results]
-    prefetched = {
-        a.id: a
-        for a in ArtistPage.objects.filter(
-            id__in=result_ids
-        ).prefetch_related("genres")
+    cached = _cached_results_response(results_cache_key, query_string, trace)
+    if cached is not None:
+        return cached
+
+    sources = {
+        "artist": lambda: _autocomplete_artists(query_string, locale_code, limit, trace),
+        "event": lambda: _autocomplete_events(query_string, locale_code, limit, trace),
+        "venue": lambda: _autocomplete_venues(query_string, limit, trace),
+        "city": lambda: _autocomplete_cities(query_string, limit, trace),
     }
+    source_results, partial = _run_autocomplete_sources(
+        [sources[kind] for kind in requested_types]
+    )
 
-    suggestions = [
-        {
-            "id": page.id,
-            "name": page.title,
-            "slug": page.slug,
-            "genre": ", ".join(g.name for g in page.genres.all()),
-        }
-        for page in (prefetched.get(pid) for pid in result_ids)
-        if page is not None
-    ]
-
-    return JsonResponse({"query": query_string, "suggestions": suggestions})
+    with trace.stage("merge") as record:
+        normalized_query = _normalize_search_text(query_string)
+        candidates = [
+            (
+                _autocomplete_match_rank(suggestion["name"], normalized_query),
+                AUTOCOMPLETE_TYPES.index(suggestion["type"]),
+                position,
+                suggestion,
+            )
+            for suggestions in source_results
+            for position, suggestion in enumerate(suggestions)
+        ]
+        suggestions = [item[-1] for item in sorted(candidates, key=lambda item: item[:3])[:limit]]
+        record["candidates"] = len(candidates)
+
+    payload = {"query": query_string, "suggestions": suggestions}
+    if partial:
+        # Risposta incompleta (budget superato): non va in cache
+        payload["partial"] = True
+        response = JsonResponse(payload)
+        response["X-Search-Cache"] = "MISS"
+        return trace.finish(response)
+    return _store_results_response(results_cache_key, payload, trace)
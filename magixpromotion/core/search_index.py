@@ -0,0 +1,177 @@
+"""Indice fuzzy in memoria per il fallback della ricerca.
+
+Sostituisce la scansione completa con ``SequenceMatcher`` su ogni pagina:
+il vocabolario (token e valori normalizzati) viene costruito una volta per
+processo e ricostruito quando cambia la generazione ``search`` (bump ad ogni
+publish/unpublish di ArtistPage o EventPage).
+
+Gli score sono identici a quelli del vecchio ``_fuzzy_score``:
+
+- 1.0 se la query normalizzata e' contenuta in uno dei valori;
+- altrimenti il massimo ``SequenceMatcher.ratio()`` tra query e valore
+  intero o singolo token.
+
+L'indice riduce solo il numero di confronti: un indice a trigrammi
+individua i valori che possono contenere la query, e una finestra sulle
+lunghezze (piu' i bound ``real_quick_ratio``/``quick_ratio``) scarta i
+termini che non possono superare la soglia.
+"""
+import math
+import threading
+import time
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+from core.cache import get_cache_generation
+
+FUZZY_THRESHOLD = 0.78
+SEARCH_GENERATION = "search"
+
+# Ricostruzione forzata anche senza publish (es. modifica nome genere/venue)
+INDEX_MAX_AGE = 600
+
+
+def _trigrams(value: str) -> set[str]:
+    return {value[i:i + 3] for i in range(len(value) - 2)}
+
+
+class FuzzyIndex:
+    """Vocabolario n-gram per match fuzzy su un insieme di documenti.
+
+    I valori passati ad ``add`` devono essere gia' normalizzati con
+    ``core.search._normalize_search_text``.
+    """
+
+    def __init__(self, threshold: float = FUZZY_THRESHOLD):
+        self.threshold = threshold
+        self._sort_keys: dict[int, str] = {}
+        # termine (token o valore intero) -> documenti che lo contengono
+        self._postings: dict[str, set[int]] = defaultdict(set)
+        self._terms_by_length: dict[int, list[str]] = defaultdict(list)
+        # valori interi + trigrammi per la ricerca per sottostringa
+        self._values: list[tuple[str, int]] = []
+        self._grams: dict[str, set[int]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._sort_keys)
+
+    def add(self, doc_id: int, sort_key: str, values) -> None:
+        """Indicizza un documento con i suoi valori normalizzati."""
+        self._sort_keys[doc_id] = sort_key
+        for value in values:
+            if not value:
+                continue
+            value_index = len(self._values)
+            self._values.append((value, doc_id))
+            for gram in _trigrams(value):
+                self._grams[gram].add(value_index)
+            for term in {value, *value.split()}:
+                if term not in self._postings:
+                    self._terms_by_length[len(term)].append(term)
+                self._postings[term].add(doc_id)
+
+    def _substring_docs(self, query: str) -> set[int]:
+        """Documenti con almeno un valore che contiene la query."""
+        postings = sorted(
+            (self._grams.get(gram, set()) for gram in _trigrams(query)),
+            key=len,
+        )
+        if not postings or not postings[0]:
+            return set()
+        candidates = set.intersection(*postings)
+        return {
+            self._values[i][1]
+            for i in candidates
+            if query in self._values[i][0]
+        }
+
+    def _similar_terms(self, query: str):
+        """Genera (termine, ratio) per i termini con ratio >= soglia."""
+        # ratio = 2M / (la + lb) <= 2 * min(la, lb) / (la + lb): fuori da
+        # questa finestra di lunghezze la soglia e' irraggiungibile.
+        size = len(query)
+        min_length = math.floor(size * self.threshold / (2 - self.threshold))
+        max_length = math.ceil(size * (2 - self.threshold) / self.threshold)
+
+        matcher = SequenceMatcher(None, query, "")
+        for length in range(max(min_length, 1), max_length + 1):
+            for term in self._terms_by_length.get(length, ()):
+                matcher.set_seq2(term)
+                if (
+                    matcher.real_quick_ratio() >= self.threshold
+                    and matcher.quick_ratio() >= self.threshold
+                ):
+                    score = matcher.ratio()
+                    if score >= self.threshold:
+                        yield term, score
+
+    def scores(self, query: str) -> dict[int, float]:
+        """Ritorna ``{doc_id: score}`` per i documenti sopra soglia."""
+        if len(query) < 3:
+            return {}
+
+        scored = dict.fromkeys(self._substring_docs(query), 1.0)
+        for term, score in self._similar_terms(query):
+            for doc_id in self._postings[term]:
+                if score > scored.get(doc_id, 0.0):
+                    scored[doc_id] = score
+        return scored
+
+    def search(self, query: str, limit: int) -> list[int]:
+        """ID dei documenti ordinati per score decrescente e sort key."""
+        scored = self.scores(query)
+        ranked = sorted(
+            scored,
+            key=lambda doc_id: (-scored[doc_id], self._sort_keys[doc_id], doc_id),
+        )
+        return ranked[:limit]
+
+    def suggest(self, query: str) -> str | None:
+        """Suggerimento "forse cercavi": il termine piu' simile alla query.
+
+        A parita' di score vince il termine presente in piu' documenti.
+        """
+        if len(query) < 3:
+            return None
+
+        best = None
+        for term, score in self._similar_terms(query):
+            if term == query:
+                continue
+            rank = (score, len(self._postings[term]), -len(term))
+            if best is None or rank > best[0]:
+                best = (rank, term)
+        return best[1] if best else None
+
+
+_indexes: dict[tuple[str, str | None], tuple[int, float, FuzzyIndex]] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_fuzzy_index(name: str, locale_code: str | None, builder) -> FuzzyIndex:
+    """Ritorna l'indice ``name`` per la lingua data, ricostruendolo se obsoleto.
+
+    ``builder(locale_code)`` viene chiamato solo alla prima richiesta dopo un
+    cambio di generazione (o allo scadere di ``INDEX_MAX_AGE``).
+    """
+    generation = get_cache_generation(SEARCH_GENERATION)
+    key = (name, locale_code)
+
+    def _fresh(entry):
+        return (
+            entry is not None
+            and entry[0] == generation
+            and time.monotonic() - entry[1] < INDEX_MAX_AGE
+        )
+
+    entry = _indexes.get(key)
+    if _fresh(entry):
+        return entry[2]
+
+    with _indexes_lock:
+        entry = _indexes.get(key)
+        if _fresh(entry):
+            return entry[2]
+        index = builder(locale_code)
+        _indexes[key] = (generation, time.monotonic(), index)
+        return index
@@ -0,0 +1,101 @@
+"""Strumentazione per-stage della pipeline di ricerca.
+
+Ogni richiesta a search/autocomplete crea una ``SearchTrace``: ogni stage
+(full-text, icontains, fuzzy, serializzazione, cache) registra tempo,
+numero di candidati e query SQL eseguite. La trace viene emessa come
+header ``Server-Timing`` e come riga di log JSON sul logger
+``core.search``, cosi' si puo' misurare quanto spesso risponde il fallback
+fuzzy in produzione.
+"""
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from django.db import connection
+
+logger = logging.getLogger("core.search")
+
+
+class _QueryCounter:
+    """execute_wrapper che conta le query SQL eseguite."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class SearchTrace:
+    """Raccoglie le metriche degli stage di una singola richiesta.
+
+    Thread-safe: le sorgenti dell'autocomplete registrano i loro stage dai
+    thread del pool.
+    """
+
+    def __init__(self, endpoint: str, query: str):
+        self.endpoint = endpoint
+        self.query = query
+        self.stages: list[dict] = []
+        self.answered_by: dict[str, str] = {}
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Misura uno stage; il chiamante imposta ``record["candidates"]``."""
+        record = {"stage": name, "candidates": 0, "queries": 0, "ms": 0.0}
+        counter = _QueryCounter()
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(counter):
+                yield record
+        finally:
+            record["ms"] = round((time.perf_counter() - started) * 1000, 2)
+            record["queries"] = counter.count
+            with self._lock:
+                self.stages.append(record)
+
+    def answered(self, kind: str, stage: str) -> None:
+        """Registra quale stage ha prodotto i risultati per un tipo."""
+        with self._lock:
+            self.answered_by[kind] = stage
+
+    def _stages(self) -> list[dict]:
+        with self._lock:
+            return list(self.stages)
+
+    def server_timing(self) -> str:
+        """Valore dell'header Server-Timing (un metric per stage + totale)."""
+        metrics = [
+            f'{record["stage"]};dur={record["ms"]};'
+            f'desc="{record["candidates"]} cand, {record["queries"]} sql"'
+            for record in self._stages()
+        ]
+        metrics.append(f"total;dur={self._elapsed_ms()}")
+        return ", ".join(metrics)
+
+    def _elapsed_ms(self) -> float:
+        return round((time.perf_counter() - self._started) * 1000, 2)
+
+    def as_dict(self) -> dict:
+        stages = self._stages()
+        with self._lock:
+            answered_by = dict(self.answered_by)
+        return {
+            "endpoint": self.endpoint,
+            "query": self.query,
+            "answered_by": answered_by,
+            "total_ms": self._elapsed_ms(),
+            "queries": sum(record["queries"] for record in stages),
+            "stages": stages,
+        }
+
+    def finish(self, response):
+        """Aggiunge Server-Timing alla risposta e scrive la riga di log."""
+        response["Server-Timing"] = self.server_timing()
+        logger.info("search_trace %s", json.dumps(self.as_dict(), ensure_ascii=False))
+        return response
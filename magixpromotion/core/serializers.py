@@ -0,0 +1,70 @@
+"""Classi serializer delle API v2 costruite una volta per configurazione di campi.
+
+Wagtail crea una nuova sottoclasse di serializer a ogni richiesta (e i
+viewset ci aggiungevano sopra i campi custom): metaclasse DRF e
+introspezione dei campi giravano ogni volta. Qui la classe finale viene
+memorizzata per (viewset, router, modello, campi richiesti, dettaglio) in
+una LRU limitata: le combinazioni di ``?fields=`` sono arbitrarie.
+
+Condividere la classe tra richieste e' sicuro: DRF copia i campi dichiarati
+in ogni istanza del serializer.
+"""
+import functools
+
+from wagtail.api.v2.utils import BadRequestError, parse_fields_parameter
+
+SERIALIZER_CLASS_CACHE_SIZE = 128
+
+
+def request_fields_config(request):
+    """Configurazione campi di ``?fields=`` (lista vuota se assente)."""
+    if "fields" not in request.GET:
+        return []
+    try:
+        return parse_fields_parameter(request.GET["fields"])
+    except ValueError as e:
+        raise BadRequestError("fields error: %s" % str(e)) from e
+
+
+def _freeze(fields_config):
+    """Configurazione campi come tuple annidate (chiave della cache)."""
+    return tuple(
+        (name, negated, _freeze(sub_fields) if sub_fields else None)
+        for name, negated, sub_fields in fields_config
+    )
+
+
+@functools.lru_cache(maxsize=SERIALIZER_CLASS_CACHE_SIZE)
+def _build_serializer_class(viewset_class, router, model, fields_config, show_details):
+    base = viewset_class._get_serializer_class(
+        router, model, fields_config, show_details=show_details
+    )
+    # Solo i campi richiesti: DRF non accetta campi dichiarati assenti da Meta.fields
+    return type(
+        "CustomSerializer",
+        (base,),
+        {
+            name: field_class(read_only=True)
+            for name, field_class in viewset_class.custom_serializer_fields.items()
+            if name in base.Meta.fields
+        },
+    )
+
+
+def cached_serializer_class(viewset, model, fields_config, show_details):
+    """Serializer del viewset per i campi richiesti, con i suoi ``custom_serializer_fields``."""
+    return _build_serializer_class(
+        type(viewset),
+        viewset.request.wagtailapi_router,
+        model,
+        _freeze(fields_config),
+        show_details,
+    )
+
+
+def serializer_class_cache_info():
+    return _build_serializer_class.cache_info()
+
+
+def clear_serializer_class_cache():
+    _build_serializer_class.cache_clear()
@@ -0,0 +1,290 @@
+"""Receiver dei segnali Wagtail: invalidano cache e indici derivati dai contenuti."""
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save, pre_delete
+from wagtail.documents import get_document_model
+from wagtail.images import get_image_model
+from wagtail.signals import page_published, page_unpublished, post_page_move
+
+from artists.models import ArtistPage, Genre, TargetEvent
+from core import conditional
+from core.cache import bump_cache_generation
+from core.models import EPKPackage, MagixSiteSettings, PressAreaPage
+from core.search_index import SEARCH_GENERATION
+from events.models import EventPage, Venue
+from navigation.models import MenuItem, NavigationMenu
+
+
+def invalidate_search(sender, instance, **kwargs):
+    """Un artista/evento e' stato pubblicato o ritirato: indici fuzzy obsoleti.
+
+    Dopo il commit: prima un'altra richiesta ricostruirebbe il vocabolario
+    (o metterebbe in cache i risultati) dai dati vecchi sotto la nuova
+    generazione.
+    """
+    transaction.on_commit(lambda: bump_cache_generation(SEARCH_GENERATION))
+
+
+for _model in (ArtistPage, EventPage):
+    page_published.connect(invalidate_search, sender=_model)
+    page_unpublished.connect(invalidate_search, sender=_model)
+
+
+def purge_api_responses(sender, instance, **kwargs):
+    """Pubblicazione/ritiro: purge delle risposte API che contengono la pagina."""
+    from core.response_cache import (
+        CALENDAR_KEY,
+        ROSTER_KEY,
+        artist_key,
+        event_key,
+        purge_surrogate_keys_on_commit,
+    )
+
+    if isinstance(instance, ArtistPage):
+        keys = {ROSTER_KEY, artist_key(instance.translation_key)}
+    else:
+        keys = {CALENDAR_KEY, event_key(instance.pk)}
+        # Gli eventi compaiono anche nelle risposte dell'artista
+        if instance.related_artist_id:
+            translation_key = (
+                ArtistPage.objects.filter(pk=instance.related_artist_id)
+                .values_list("translation_key", flat=True)
+                .first()
+            )
+            if translation_key:
+                keys.add(artist_key(translation_key))
+    purge_surrogate_keys_on_commit(keys)
+
+
+for _model in (ArtistPage, EventPage):
+    page_published.connect(purge_api_responses, sender=_model)
+    page_unpublished.connect(purge_api_responses, sender=_model)
+
+
+def _artist_keys(artists) -> set[str]:
+    """Surrogate key degli artisti del queryset (tutte le lingue)."""
+    from core.response_cache import artist_key
+
+    return {
+        artist_key(translation_key)
+        for translation_key in artists.values_list("translation_key", flat=True)
+    }
+
+
+def _event_keys(events) -> set[str]:
+    """Surrogate key degli eventi del queryset e dei loro artisti."""
+    from core.response_cache import event_key
+
+    keys = {event_key(pk) for pk in events.values_list("pk", flat=True)}
+    return keys | _artist_keys(
+        ArtistPage.objects.filter(pk__in=events.values("related_artist_id"))
+    )
+
+
+def purge_roster_labels(sender, instance, **kwargs):
+    """Genere/tipologia evento modificati: nomi obsoleti nei listing e negli artisti.
+
+    Purga anche le risposte degli artisti che li usano (faccette, dettaglio).
+    Collegato a ``pre_delete``: dopo l'eliminazione le righe m2m non ci sono piu'.
+    """
+    from artists.roster_index import invalidate_roster_index
+    from artists.snapshot import schedule_roster_snapshot
+    from core.response_cache import ROSTER_KEY, purge_surrogate_keys_on_commit
+
+    relation = "genres" if sender is Genre else "target_events"
+    artists = ArtistPage.objects.filter(**{relation: instance})
+    purge_surrogate_keys_on_commit({ROSTER_KEY} | _artist_keys(artists))
+    # Slug cambiati: l'indice bitmap dei filtri va ricostruito
+    transaction.on_commit(invalidate_roster_index)
+    transaction.on_commit(schedule_roster_snapshot)
+
+
+for _model in (Genre, TargetEvent):
+    post_save.connect(purge_roster_labels, sender=_model)
+    pre_delete.connect(purge_roster_labels, sender=_model)
+
+
+def purge_venue_responses(sender, instance, **kwargs):
+    """Venue modificata: nome e citta' nel calendario, negli eventi e nei loro artisti."""
+    from core.response_cache import CALENDAR_KEY, purge_surrogate_keys_on_commit
+
+    events = EventPage.objects.filter(venue=instance)
+    purge_surrogate_keys_on_commit({CALENDAR_KEY} | _event_keys(events))
+
+
+post_save.connect(purge_venue_responses, sender=Venue)
+pre_delete.connect(purge_venue_responses, sender=Venue)
+
+
+def purge_epk_responses(sender, instance, **kwargs):
+    """EPK modificato: campo ``epk`` nelle risposte dell'artista."""
+    from core.response_cache import purge_surrogate_keys_on_commit
+
+    purge_surrogate_keys_on_commit(_artist_keys(ArtistPage.objects.filter(pk=instance.artist_id)))
+
+
+post_save.connect(purge_epk_responses, sender=EPKPackage)
+post_delete.connect(purge_epk_responses, sender=EPKPackage)
+
+
+def update_roster_index(sender, instance, **kwargs):
+    """Artista pubblicato/ritirato/eliminato: slot da aggiornare nell'indice bitmap."""
+    from artists.roster_index import record_roster_change
+
+    pk = instance.pk
+    transaction.on_commit(lambda: record_roster_change(pk))
+
+
+page_published.connect(update_roster_index, sender=ArtistPage)
+page_unpublished.connect(update_roster_index, sender=ArtistPage)
+post_delete.connect(update_roster_index, sender=ArtistPage)
+
+
+def rebuild_roster_snapshot(sender, **kwargs):
+    """Roster cambiato: snapshot statico da riscrivere (vedi artists.snapshot)."""
+    from artists.snapshot import schedule_roster_snapshot
+
+    transaction.on_commit(schedule_roster_snapshot)
+
+
+page_published.connect(rebuild_roster_snapshot, sender=ArtistPage)
+page_unpublished.connect(rebuild_roster_snapshot, sender=ArtistPage)
+
+
+# Aree dei validatori ETag/Last-Modified toccate da ogni modello
+_CONTENT_AREAS = {
+    ArtistPage: [conditional.ARTISTS],
+    Genre: [conditional.ARTISTS],
+    TargetEvent: [conditional.ARTISTS],
+    EventPage: [conditional.EVENTS],
+    PressAreaPage: [conditional.EPK],
+    EPKPackage: [conditional.EPK],
+    Venue: [conditional.VENUES],
+    MagixSiteSettings: [conditional.SETTINGS],
+    NavigationMenu: [conditional.MENU],
+    MenuItem: [conditional.MENU],
+}
+
+
+def touch_content_versions(sender, **kwargs):
+    """Contenuto modificato: i client con la versione precedente riscaricano."""
+    conditional.touch_content_versions_on_commit(_CONTENT_AREAS[sender])
+
+
+for _model in (ArtistPage, EventPage, PressAreaPage):
+    page_published.connect(touch_content_versions, sender=_model)
+    page_unpublished.connect(touch_content_versions, sender=_model)
+for _model in (Genre, TargetEvent, EPKPackage, Venue, MagixSiteSettings, NavigationMenu, MenuItem):
+    post_save.connect(touch_content_versions, sender=_model)
+    post_delete.connect(touch_content_versions, sender=_model)
+
+
+def touch_page_links(sender, **kwargs):
+    """Pagina qualsiasi pubblicata, ritirata o spostata: titolo e URL dei link cambiano.
+
+    Il menu e la press area mostrano titolo e URL delle pagine collegate.
+    """
+    conditional.touch_content_versions_on_commit([conditional.MENU, conditional.EPK])
+
+
+def touch_epk_documents(sender, **kwargs):
+    """Documento modificato: URL degli asset EPK (rider, bio, logo, zip) cambiati."""
+    conditional.touch_content_versions_on_commit([conditional.EPK])
+
+
+page_published.connect(touch_page_links)
+page_unpublished.connect(touch_page_links)
+post_page_move.connect(touch_page_links)
+post_save.connect(touch_epk_documents, sender=get_document_model())
+post_delete.connect(touch_epk_documents, sender=get_document_model())
+
+
+def render_artist_body(sender, instance, revision=None, **kwargs):
+    """Artista pubblicato: body HTML renderizzato in background per la revisione."""
+    from artists.tasks import render_artist_body_html
+
+    if revision is None:
+        return
+    transaction.on_commit(
+        lambda: render_artist_body_html.delay(instance.pk, revision.pk)
+    )
+
+
+page_published.connect(render_artist_body, sender=ArtistPage)
+
+
+# Campi immagine che cambiano il risultato delle renditions
+RENDITION_SOURCE_FIELDS = {
+    "file",
+    "focal_point_x",
+    "focal_point_y",
+    "focal_point_width",
+    "focal_point_height",
+}
+
+
+def _warm_renditions_on_commit(image_ids, label):
+    from core.tasks import warm_renditions
+
+    image_ids = [image_id for image_id in image_ids if image_id]
+    if image_ids:
+        transaction.on_commit(lambda: warm_renditions.delay(image_ids, label))
+
+
+def warm_image_renditions(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Immagine caricata o modificata: URL in cache scartate, renditions in background."""
+    from core.renditions import invalidate_image_rendition_urls
+
+    if raw or (update_fields is not None and not RENDITION_SOURCE_FIELDS & set(update_fields)):
+        return
+    invalidate_image_rendition_urls(instance.pk)
+    conditional.touch_content_versions_on_commit([conditional.IMAGES])
+    _warm_renditions_on_commit([instance.pk], f"Immagine: {instance.title}")
+
+
+def forget_rendition_url(sender, instance, **kwargs):
+    """Rendition eliminata: la sua URL non deve piu' uscire dalla cache."""
+    from core.renditions import invalidate_rendition_url
+
+    try:
+        invalidate_rendition_url(instance)
+    except get_image_model().DoesNotExist:
+        pass
+
+
+def warm_page_renditions(sender, instance, **kwargs):
+    """Pagina pubblicata: renditions delle sue immagini generate in background."""
+    if isinstance(instance, ArtistPage):
+        image_ids = [instance.main_image_id] + [
+            item.image_id for item in instance.gallery_images.all()
+        ]
+    else:
+        image_ids = [instance.featured_image_id]
+    _warm_renditions_on_commit(image_ids, f"Pagina: {instance.title}")
+
+
+def purge_image_responses(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Immagine sostituita, ritagliata o eliminata: URL renditions nelle risposte che la usano."""
+    from core.response_cache import purge_surrogate_keys_on_commit
+
+    if raw or (update_fields is not None and not RENDITION_SOURCE_FIELDS & set(update_fields)):
+        return
+    artists = ArtistPage.objects.filter(
+        Q(main_image=instance) | Q(gallery_images__image=instance)
+    )
+    events = EventPage.objects.filter(featured_image=instance)
+    purge_surrogate_keys_on_commit(_artist_keys(artists) | _event_keys(events))
+
+
+def forget_deleted_image(sender, instance, **kwargs):
+    """Immagine eliminata: risposte e validatori con le sue URL da rinnovare."""
+    purge_image_responses(sender, instance)
+    conditional.touch_content_versions_on_commit([conditional.IMAGES])
+
+
+post_save.connect(warm_image_renditions, sender=get_image_model())
+post_save.connect(purge_image_responses, sender=get_image_model())
+pre_delete.connect(forget_deleted_image, sender=get_image_model())
+post_delete.connect(forget_rendition_url, sender=get_image_model().get_rendition_model())
+for _model in (ArtistPage, EventPage):
+    page_published.connect(warm_page_renditions, sender=_model)
@@ -0,0 +1,74 @@
+"""Task Celery del core: warm-up delle renditions e placeholder LQIP delle immagini."""
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def warm_renditions(image_ids: list[int], label: str = "") -> dict:
+    """
+    Prepara in background tutte le renditions registrate per le immagini.
+
+    Un sotto-task per immagine: i processi del worker Celery generano le
+    immagini in parallelo, e la prima visita non paga i resize di Pillow.
+    """
+    from core.renditions import image_rendition_specs, start_warmup_job
+
+    specs_by_image = image_rendition_specs(image_ids)
+    if not specs_by_image:
+        return {"job_id": None, "images": 0, "renditions": 0}
+
+    total = sum(len(specs) for specs in specs_by_image.values())
+    job_id = start_warmup_job(label, total)
+    for image_id, specs in specs_by_image.items():
+        generate_image_renditions.delay(job_id, image_id, list(specs))
+
+    return {"job_id": job_id, "images": len(specs_by_image), "renditions": total}
+
+
+@shared_task(bind=True, max_retries=2, default_retry_delay=30)
+def generate_image_renditions(self, job_id: str, image_id: int, specs: list[str]) -> dict:
+    """Genera le renditions mancanti di un'immagine (quelle esistenti sono riusate)."""
+    from wagtail.images import get_image_model
+
+    from core.renditions import record_warmup_progress, store_lqip, warm_rendition_urls
+
+    image = get_image_model().objects.filter(pk=image_id).first()
+    if image is None:
+        record_warmup_progress(job_id, failed=len(specs))
+        return {"image_id": image_id, "generated": 0}
+
+    try:
+        # Stesso lock single-flight e stessa cache URL delle richieste API
+        warm_rendition_urls(image, specs)
+        store_lqip(image)
+    except Exception as exc:
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=exc)
+        logger.warning("Warm-up renditions immagine %s fallito: %s", image_id, exc)
+        record_warmup_progress(job_id, failed=len(specs))
+        return {"image_id": image_id, "generated": 0}
+
+    record_warmup_progress(job_id, done=len(specs))
+    return {"image_id": image_id, "generated": len(specs)}
+
+
+@shared_task
+def compute_image_placeholders(image_ids: list[int]) -> dict:
+    """Calcola i placeholder LQIP inline delle immagini che non li hanno."""
+    from django.core.cache import cache
+    from wagtail.images import get_image_model
+
+    from core.renditions import LQIP_KEY_PREFIX, store_lqip
+
+    computed = 0
+    for image in get_image_model().objects.filter(pk__in=image_ids):
+        try:
+            store_lqip(image)
+            computed += 1
+        except Exception as exc:
+            logger.warning("Placeholder LQIP immagine %s fallito: %s", image.pk, exc)
+    cache.delete_many([f"{LQIP_KEY_PREFIX}:queued:{image_id}" for image_id in image_ids])
+    return {"computed": computed}
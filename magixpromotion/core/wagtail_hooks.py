@@ -8,9 +8,12 @@ Logica:
   related_artist.managing_group == gruppo utente).
 - Il pulsante "Pubblica" viene rimosso per i non-staff: possono solo
   salvare bozze e inviare in moderazione.
+
+Inoltre: pannello dashboard con l'avanzamento del warm-up renditions.
 """
 from django.core.exceptions import PermissionDenied
 from wagtail import hooks
+from wagtail.admin.ui.components import Component
 
 
 def _get_user_managing_group_ids(user):
@@ -117,3 +120,22 @@ def filter_explorer_for_collaborators(parent_page, pages, request):
 
     all_visible_pks = set(artist_pks) | set(event_pks) | set(listing_pks)
     return pages.filter(pk__in=all_visible_pks)
+
+
+class RenditionWarmupPanel(Component):
+    """Pannello dashboard: avanzamento dei job di warm-up renditions."""
+
+    name = "rendition_warmup"
+    template_name = "core/admin/rendition_warmup_panel.html"
+    order = 150
+
+    def get_context_data(self, parent_context):
+        from core.renditions import warmup_jobs
+
+        return {"jobs": warmup_jobs()}
+
+
+@hooks.register("construct_homepage_panels")
+def add_rendition_warmup_panel(request, panels):
+    if request.user.is_staff or request.user.is_superuser:
+        panels.append(RenditionWarmupPanel())
@@ -2,11 +2,41 @@
 from django.db.models import QuerySet
 from django.utils import timezone
 from rest_framework.fields import Field
+from wagtail.api.v2.filters import LocaleFilter
 from wagtail.api.v2.serializers import PageSerializer
 from wagtail.api.v2.views import PagesAPIViewSet
 
+from core.conditional import ARTISTS, EVENTS, IMAGES, VENUES, conditional_api_method
+from core.facets import FacetsMixin, aggregate_counts
+from core.pagination import KeysetPaginationMixin
+from core.renditions import (
+    API_IMAGE_SPEC,
+    EVENT_FEATURED_SPEC,
+    absolute_url,
+    cached_rendition_urls,
+    placeholder_url,
+    placeholder_urls,
+    rendition_url,
+)
+from core.response_cache import (
+    CALENDAR_KEY,
+    ROSTER_KEY,
+    artist_key,
+    event_key,
+    set_surrogate_keys,
+)
+from core.serializers import cached_serializer_class, request_fields_config
+
 from .models import EventPage
 
+# Lookup dei filtri con faccetta, comuni a listing e facets/
+FACET_LOOKUPS = {
+    "artist": "related_artist__slug",
+    "region": "venue__region__icontains",
+    "country": "venue__country",
+    "city": "venue__city__iexact",
+}
+
 
 class VenueField(Field):
     """Campo custom: oggetto venue serializzato."""
@@ -42,42 +72,26 @@ class ArtistField(Field):
         if not artist:
             return None
 
-        # Immagine principale (full-res + LQIP thumb)
-        image_url = None
-        image_thumb = None
-        if artist.main_image:
-            try:
-                rendition = artist.main_image.get_rendition("fill-800x1200|format-webp")
-                image_url = rendition.full_url
-            except Exception:
-                pass
-            try:
-                thumb = artist.main_image.get_rendition("fill-40x60|format-webp")
-                image_thumb = thumb.full_url
-            except Exception:
-                pass
-
-        # Gallery immagini (full-res + LQIP thumbs) per rotazione
+        # Gallery immagini (full-res + LQIP inline) per rotazione:
+        # senza placeholder si usa l'immagine full-res
+        images = [item.image for item in artist.gallery_images.all()]
+        urls = cached_rendition_urls((image, API_IMAGE_SPEC) for image in images)
+        thumbs = placeholder_urls(images)
         gallery_images: list[str] = []
         gallery_thumbs: list[str] = []
-        for item in artist.gallery_images.all():
-            try:
-                g_rendition = item.image.get_rendition("fill-800x1200|format-webp")
-                gallery_images.append(g_rendition.full_url)
-            except Exception:
+        for image in images:
+            full = absolute_url(urls.get((image.id, API_IMAGE_SPEC)))
+            if not full:
                 continue
-            try:
-                g_thumb = item.image.get_rendition("fill-40x60|format-webp")
-                gallery_thumbs.append(g_thumb.full_url)
-            except Exception:
-                gallery_thumbs.append(g_rendition.full_url)
+            gallery_images.append(full)
+            gallery_thumbs.append(thumbs.get(image.id) or full)
 
         return {
             "id": artist.pk,
             "name": artist.title,
             "slug": artist.slug,
-            "image_url": image_url,
-            "image_thumb": image_thumb,
+            "image_url": rendition_url(artist.main_image, API_IMAGE_SPEC, full=True),
+            "image_thumb": placeholder_url(artist.main_image),
             "gallery_images": gallery_images,
             "gallery_thumbs": gallery_thumbs,
         }
@@ -90,16 +104,10 @@ class FeaturedImageField(Field):
         return instance
 
     def to_representation(self, page):
-        if not page.featured_image:
-            return None
-        try:
-            rendition = page.featured_image.get_rendition("fill-1200x1600|format-webp")
-            return rendition.full_url
-        except Exception:
-            return None
+        return rendition_url(page.featured_image, EVENT_FEATURED_SPEC, full=True)
 
 
-class EventAPIViewSet(PagesAPIViewSet):
+class EventAPIViewSet(FacetsMixin, KeysetPaginationMixin, PagesAPIViewSet):
     """Endpoint API per gli eventi."""
 
     base_serializer_class = PageSerializer
@@ -130,38 +138,74 @@ class EventAPIViewSet(PagesAPIViewSet):
     ]
 
     known_query_parameters = PagesAPIViewSet.known_query_parameters.union(
-        {"artist", "venue", "region", "country", "future_only", "date_from", "date_to", "city"}
+        {
+            "artist",
+            "venue",
+            "region",
+            "country",
+            "future_only",
+            "date_from",
+            "date_to",
+            "city",
+            "cursor",
+        }
     )
 
-    def get_serializer_class(self):
-        """Aggiunge campi custom al serializer."""
-        base = super().get_serializer_class()
-
-        class CustomSerializer(base):
-            venue = VenueField(read_only=True)
-            artist = ArtistField(read_only=True)
-            featured_image_url = FeaturedImageField(read_only=True)
+    # Faccette dei filtri calendario (/api/v2/events/facets/): (valore, etichetta).
+    # venue e periodo restringono le righe ma non hanno conteggi.
+    facet_fields = {
+        "artist": ("related_artist__slug", "related_artist__title"),
+        "region": ("venue__region", None),
+        "country": ("venue__country", None),
+        "city": ("venue__city", None),
+    }
+    facet_query_parameters = frozenset(facet_fields) | {
+        "venue",
+        "future_only",
+        "date_from",
+        "date_to",
+        "locale",
+    }
+
+    # Campi custom, dichiarati sul serializer solo se richiesti
+    custom_serializer_fields = {
+        "venue": VenueField,
+        "artist": ArtistField,
+        "featured_image_url": FeaturedImageField,
+    }
 
-        return CustomSerializer
+    def get_serializer_class(self):
+        """Serializer per i campi richiesti, con i campi custom (vedi ``core.serializers``)."""
+        return cached_serializer_class(
+            self,
+            self.model,
+            request_fields_config(self.request),
+            show_details=self.action != "listing_view",
+        )
 
     def _apply_filters(self, qs: QuerySet[EventPage]) -> QuerySet[EventPage]:
         """Applica i filtri custom agli eventi."""
-        artist = self.request.query_params.get("artist")
-        if artist:
-            qs = qs.filter(related_artist__slug=artist)
+        return self._apply_facet_filters(self._apply_scope_filters(qs))
+
+    def _apply_facet_filters(
+        self, qs: QuerySet[EventPage], exclude: str | None = None
+    ) -> QuerySet[EventPage]:
+        """Filtri con conteggi in ``facets/``: artista, regione, paese, citta'.
+
+        ``exclude`` salta il filtro di una faccetta, che conta sugli altri.
+        """
+        for facet, lookup in FACET_LOOKUPS.items():
+            value = self.request.query_params.get(facet)
+            if value and facet != exclude:
+                qs = qs.filter(**{lookup: value})
+        return qs
 
+    def _apply_scope_filters(self, qs: QuerySet[EventPage]) -> QuerySet[EventPage]:
+        """Filtri senza faccetta: venue e periodo."""
         venue = self.request.query_params.get("venue")
         if venue:
             qs = qs.filter(venue_id=venue)
 
-        region = self.request.query_params.get("region")
-        if region:
-            qs = qs.filter(venue__region__icontains=region)
-
-        country = self.request.query_params.get("country")
-        if country:
-            qs = qs.filter(venue__country=country)
-
         future_only = self.request.query_params.get("future_only")
         if future_only == "true":
             qs = qs.filter(start_date__gte=timezone.now().date())
@@ -174,10 +218,6 @@ class EventAPIViewSet(PagesAPIViewSet):
         if date_to:
             qs = qs.filter(start_date__lte=date_to)
 
-        city = self.request.query_params.get("city")
-        if city:
-            qs = qs.filter(venue__city__iexact=city)
-
         return qs
 
     def _apply_ordering(self, qs: QuerySet[EventPage]) -> QuerySet[EventPage]:
@@ -187,6 +227,11 @@ class EventAPIViewSet(PagesAPIViewSet):
             return qs.order_by("-start_date")
         return qs.order_by("start_date")
 
+    def cursor_ordering(self):
+        """Chiave del cursore: (start_date, pk) nella direzione di ``_apply_ordering``."""
+        descending = bool(self.request.query_params.get("date_to"))
+        return [("start_date", descending), ("pk", descending)]
+
     def _with_locale_fallback(self, qs: QuerySet[EventPage]) -> QuerySet[EventPage]:
         """Per lingue non originali, include gli eventi italiani non tradotti."""
         locale = self.request.query_params.get("locale")
@@ -201,9 +246,86 @@ class EventAPIViewSet(PagesAPIViewSet):
 
         return qs | fallback_qs
 
+    def facet_queryset(self):
+        """Eventi pubblicati nella lingua richiesta, con i soli filtri senza faccetta.
+
+        Senza un periodo esplicito (archivio) contano solo gli eventi futuri.
+        """
+        qs = self._apply_scope_filters(super().get_queryset())
+        params = self.request.query_params
+        if not (params.get("date_from") or params.get("date_to")):
+            qs = qs.filter(start_date__gte=timezone.now().date())
+        return LocaleFilter().filter_queryset(self.request, qs, self)
+
+    def count_facets(self):
+        """Conteggi nel database: ogni evento ha un solo valore per faccetta."""
+        qs = self.facet_queryset()
+        total = self._apply_facet_filters(qs).count()
+        counts = {}
+        labels = {}
+        for facet, (value_field, label_field) in self.facet_fields.items():
+            counts[facet], labels[facet] = aggregate_counts(
+                self._apply_facet_filters(qs, exclude=facet), value_field, label_field
+            )
+        return total, counts, labels
+
+    def facet_labels(self, facet, values):
+        if facet == "country":
+            from django_countries import countries
+
+            return {code: countries.name(code) for code in values}
+        return {}
+
+    @conditional_api_method(EVENTS, ARTISTS, VENUES)
+    def facets_view(self, request):
+        response = super().facets_view(request)
+        # Le etichette artista cambiano con le pubblicazioni del roster
+        set_surrogate_keys(response, {CALENDAR_KEY, ROSTER_KEY})
+        return response
+
     def get_queryset(self):
         qs = super().get_queryset()
         qs = self._apply_filters(qs)
         qs = self._with_locale_fallback(qs)
         qs = self._apply_ordering(qs)
-        return qs.select_related("venue", "related_artist", "featured_image")
+        return qs.select_related(
+            "venue", "related_artist__main_image", "featured_image", "locale"
+        ).prefetch_related("related_artist__gallery_images__image")
+
+    def paginate_queryset(self, queryset):
+        page = list(super().paginate_queryset(queryset))
+        # URL e placeholder delle immagini della pagina in blocco (cache + una query)
+        pairs = []
+        placeholder_images = []
+        for event in page:
+            pairs.append((event.featured_image, EVENT_FEATURED_SPEC))
+            artist = event.related_artist
+            if artist:
+                images = [artist.main_image] + [item.image for item in artist.gallery_images.all()]
+                pairs += [(image, API_IMAGE_SPEC) for image in images]
+                placeholder_images += images
+        cached_rendition_urls(pairs)
+        placeholder_urls(placeholder_images)
+        self._listed_pages = page
+        return page
+
+    def _surrogate_keys(self, pages) -> set[str]:
+        """Surrogate key della risposta: eventi serializzati e loro artisti."""
+        keys = set()
+        for event in pages:
+            keys.add(event_key(event.pk))
+            if event.related_artist:
+                keys.add(artist_key(event.related_artist.translation_key))
+        return keys
+
+    @conditional_api_method(EVENTS, ARTISTS, VENUES, IMAGES)
+    def listing_view(self, request):
+        response = super().listing_view(request)
+        set_surrogate_keys(response, {CALENDAR_KEY} | self._surrogate_keys(self._listed_pages))
+        return response
+
+    @conditional_api_method(EVENTS, ARTISTS, VENUES, IMAGES)
+    def detail_view(self, request, pk):
+        response = super().detail_view(request, pk)
+        set_surrogate_keys(response, self._surrogate_keys([self.get_object()]))
+        return response
@@ -157,7 +157,7 @@ describe("ArtistGrid", () => {
     server.use(
       http.get("/api/v2/artists/", () => {
         return HttpResponse.json({
-          meta: { total_count: 8 },
+          meta: { total_count: 8, next: "1" },
           items: [mockArtistsResponse.items[0]],
         });
       }),
@@ -108,6 +108,27 @@ describe("SearchBar", () => {
     );
   });
 
+  it("runs a full search when a city suggestion is clicked", async () => {
+    const user = userEvent.setup();
+    const onResultClick = vi.fn();
+
+    render(<SearchBar onResultClick={onResultClick} />);
+
+    const input = screen.getByRole("combobox");
+    await user.type(input, "gro");
+
+    await waitFor(
+      () => {
+        expect(screen.getByText("Grosseto")).toBeInTheDocument();
+      },
+      { timeout: 2000 },
+    );
+    await user.click(screen.getByText("Grosseto"));
+
+    expect(onResultClick).not.toHaveBeenCalled();
+    expect(input).toHaveValue("Grosseto");
+  });
+
   it("updates input value when typing", async () => {
     const user = userEvent.setup();
     render(<SearchBar />);
@@ -3,11 +3,12 @@
  * =================================================================== */
 
 import { describe, it, expect } from "vitest";
-import { renderHook, waitFor } from "@testing-library/react";
+import { act, renderHook, waitFor } from "@testing-library/react";
 import { http, HttpResponse } from "msw";
 import { server } from "../mocks/server";
 import { useEvents } from "@/hooks/useEvents";
 import { AllProviders } from "../test-utils";
+import { mockEventsResponse } from "../mocks/fixtures";
 
 describe("useEvents", () => {
   it("fetches events and returns data", async () => {
@@ -39,6 +40,40 @@ describe("useEvents", () => {
     expect(result.current.data).not.toBeNull();
   });
 
+  it("loads the next page with the cursor from meta.next", async () => {
+    const cursors: (string | null)[] = [];
+    server.use(
+      http.get("/api/v2/events/", ({ request }) => {
+        const cursor = new URL(request.url).searchParams.get("cursor");
+        cursors.push(cursor);
+        const [first, second] = mockEventsResponse.items;
+        return HttpResponse.json(
+          cursor
+            ? { meta: { next: null }, items: [second] }
+            : { meta: { total_count: 2, next: "c2" }, items: [first] },
+        );
+      }),
+    );
+
+    const { result } = renderHook(() => useEvents(), { wrapper: AllProviders });
+
+    await waitFor(() => {
+      expect(result.current.hasMore).toBe(true);
+    });
+
+    act(() => {
+      result.current.loadMore();
+    });
+
+    await waitFor(() => {
+      expect(result.current.items).toHaveLength(2);
+    });
+
+    expect(cursors).toEqual(["", "c2"]);
+    expect(result.current.hasMore).toBe(false);
+    expect(result.current.totalCount).toBe(2);
+  });
+
   it("sets error on API failure", async () => {
     server.use(
       http.get("/api/v2/events/", () => {
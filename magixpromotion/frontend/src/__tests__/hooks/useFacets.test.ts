@@ -0,0 +1,74 @@
+/* ===================================================================
+ * Tests for src/hooks/useFacets.ts
+ * =================================================================== */
+
+import { describe, it, expect } from "vitest";
+import { renderHook, waitFor } from "@testing-library/react";
+import { http, HttpResponse } from "msw";
+import { server } from "../mocks/server";
+import { useArtistFacets, useEventFacets } from "@/hooks/useFacets";
+import { AllProviders } from "../test-utils";
+
+describe("useArtistFacets", () => {
+  it("fetches the facet counts", async () => {
+    const { result } = renderHook(() => useArtistFacets(), { wrapper: AllProviders });
+
+    await waitFor(() => {
+      expect(result.current.loading).toBe(false);
+    });
+
+    expect(result.current.data!.total_count).toBe(2);
+    expect(result.current.data!.facets.artist_type).toEqual(
+      expect.arrayContaining([
+        { value: "show_band", label: "show_band", count: 1 },
+        { value: "tribute", label: "tribute", count: 1 },
+      ]),
+    );
+    expect(result.current.error).toBeNull();
+  });
+
+  it("sends only the active filters and the locale", async () => {
+    let capturedUrl = "";
+    server.use(
+      http.get("/api/v2/artists/facets/", ({ request }) => {
+        capturedUrl = request.url;
+        return HttpResponse.json({ total_count: 0, facets: {} });
+      }),
+    );
+
+    renderHook(() => useArtistFacets({ genre: "rock", region: "" }), {
+      wrapper: AllProviders,
+    });
+
+    await waitFor(() => {
+      expect(capturedUrl).not.toBe("");
+    });
+
+    const params = new URL(capturedUrl).searchParams;
+    expect(params.get("genre")).toBe("rock");
+    expect(params.has("region")).toBe(false);
+    expect(params.get("locale")).toBe("it");
+  });
+});
+
+describe("useEventFacets", () => {
+  it("serialises boolean filters", async () => {
+    let capturedUrl = "";
+    server.use(
+      http.get("/api/v2/events/facets/", ({ request }) => {
+        capturedUrl = request.url;
+        return HttpResponse.json({ total_count: 0, facets: {} });
+      }),
+    );
+
+    const { result } = renderHook(() => useEventFacets({ future_only: true }), {
+      wrapper: AllProviders,
+    });
+
+    await waitFor(() => {
+      expect(result.current.loading).toBe(false);
+    });
+
+    expect(new URL(capturedUrl).searchParams.get("future_only")).toBe("true");
+  });
+});
@@ -287,7 +287,9 @@ export const mockSearchResults = {
 
 export const mockAutocompleteSuggestions = {
   suggestions: [
-    { id: 1, name: "The Groove Machine", slug: "the-groove-machine", genre: "Dance / Pop" },
-    { id: 2, name: "Queen Forever", slug: "queen-forever", genre: "Rock" },
+    { type: "artist", id: 1, name: "The Groove Machine", slug: "the-groove-machine", genre: "Dance / Pop" },
+    { type: "artist", id: 2, name: "Queen Forever", slug: "queen-forever", genre: "Rock" },
+    { type: "event", id: 10, name: "Groove Night", slug: "groove-night", start_date: "2026-07-15", city: "Milano" },
+    { type: "city", id: null, name: "Grosseto", slug: "", city: "Grosseto" },
   ],
 };
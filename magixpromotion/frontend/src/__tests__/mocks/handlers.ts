@@ -16,6 +16,22 @@ import {
   mockAutocompleteSuggestions,
 } from "./fixtures";
 
+/**
+ * Cursor (keyset) pagination mock: the opaque cursor is just the next
+ * offset; total_count only on the first page, like the backend.
+ */
+function cursorPage<T>(items: T[], cursor: string, limit: number) {
+  const start = cursor ? Number(cursor) : 0;
+  const end = start + limit;
+  return HttpResponse.json({
+    meta: {
+      ...(cursor ? {} : { total_count: items.length }),
+      next: end < items.length ? String(end) : null,
+    },
+    items: items.slice(start, end),
+  });
+}
+
 export const handlers = [
   // --- Artists list (supports ?slug= filter) ---
   http.get("/api/v2/artists/", ({ request }) => {
@@ -23,7 +39,7 @@ export const handlers = [
     const slugFilter = url.searchParams.get("slug");
     const artistType = url.searchParams.get("artist_type");
     const limit = Number(url.searchParams.get("limit") || mockArtistsResponse.items.length);
-    const offset = Number(url.searchParams.get("offset") || 0);
+    const cursor = url.searchParams.get("cursor");
     let filtered = mockArtistsResponse.items;
 
     if (slugFilter) {
@@ -36,12 +52,38 @@ export const handlers = [
       filtered = filtered.filter((artist) => artist.artist_type === artistType);
     }
 
+    if (cursor !== null) return cursorPage(filtered, cursor, limit);
+
+    const offset = Number(url.searchParams.get("offset") || 0);
     return HttpResponse.json({
       meta: { total_count: filtered.length },
       items: filtered.slice(offset, offset + limit),
     });
   }),
 
+  // --- Artist facets (artist_type counted on the mock roster) ---
+  http.get("/api/v2/artists/facets/", () => {
+    const counts = new Map<string, number>();
+    for (const artist of mockArtistsResponse.items) {
+      counts.set(artist.artist_type, (counts.get(artist.artist_type) ?? 0) + 1);
+    }
+    return HttpResponse.json({
+      total_count: mockArtistsResponse.items.length,
+      facets: {
+        artist_type: [...counts].map(([value, count]) => ({ value, label: value, count })),
+        genre: [],
+        target_event: [],
+        region: [],
+        country: [],
+      },
+    });
+  }),
+
+  // --- Roster snapshot manifest (no snapshot: clients use the listing) ---
+  http.get("/api/v2/roster/", () => {
+    return HttpResponse.json({ generated_at: null, locales: {} });
+  }),
+
   // --- Single artist ---
   http.get("/api/v2/artists/:id/", ({ params }) => {
     const id = Number(params.id);
@@ -65,6 +107,11 @@ export const handlers = [
         items: filtered,
       });
     }
+    const cursor = url.searchParams.get("cursor");
+    if (cursor !== null) {
+      const limit = Number(url.searchParams.get("limit") || mockEventsResponse.items.length);
+      return cursorPage(mockEventsResponse.items, cursor, limit);
+    }
     return HttpResponse.json(mockEventsResponse);
   }),
 
@@ -1,5 +1,5 @@
 import React from "react";
-import { fetchArtists } from "@/lib/api";
+import { fetchRoster } from "@/lib/api";
 import { useLanguage } from "@/contexts/LanguageContext";
 import type { Artist } from "@/types";
 import { Search, Lock, ChevronDown } from "lucide-react";
@@ -17,7 +17,7 @@ interface ArtistAutocompleteProps {
 
 /**
  * Campo autocomplete per selezionare un artista del roster.
- * - Carica la lista artisti dall'API al mount
+ * - Carica il roster completo al mount (snapshot statico, fallback API)
  * - Mostra suggerimenti filtrati durante la digitazione
  * - Permette scrittura libera (artista non nel roster)
  * - Include opzione "Altro / Non in elenco" sempre visibile
@@ -39,7 +39,7 @@ const ArtistAutocomplete: React.FC<ArtistAutocompleteProps> = ({
   // Carica la lista artisti al mount
   React.useEffect(() => {
     let cancelled = false;
-    fetchArtists({ limit: 50, locale: lang })
+    fetchRoster(lang)
       .then((res) => {
         if (!cancelled) {
           setArtists(res.items);
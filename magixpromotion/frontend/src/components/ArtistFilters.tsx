@@ -5,6 +5,8 @@ interface ArtistFiltersProps {
   artistTypes: string[];
   activeType: string;
   onTypeChange: (type: string) => void;
+  /** Conteggi per tipologia da /api/v2/artists/facets/ (ALL = totale) */
+  counts?: Record<string, number>;
 }
 
 /** Map artist_type API values to i18n keys under artists.* */
@@ -21,6 +23,7 @@ const ArtistFilters: React.FC<ArtistFiltersProps> = ({
   artistTypes,
   activeType,
   onTypeChange,
+  counts,
 }) => {
   const { t } = useLanguage();
 
@@ -37,6 +40,9 @@ const ArtistFilters: React.FC<ArtistFiltersProps> = ({
           }`}
         >
           {TYPE_I18N_KEYS[type] ? t(TYPE_I18N_KEYS[type]) : type.toUpperCase()}
+          {counts && (
+            <span className="ml-1.5 opacity-60">{counts[type] ?? 0}</span>
+          )}
         </button>
       ))}
     </div>
@@ -1,7 +1,9 @@
 import React from "react";
 import { Artist, ArtistSearchResult } from "@/types";
 import { useArtists } from "@/hooks/useArtists";
+import type { ArtistFilterParams } from "@/hooks/useArtists";
 import { useArtistSearch } from "@/hooks/useSearch";
+import { useArtistFacets } from "@/hooks/useFacets";
 import { useInfiniteScroll } from "@/hooks/useInfiniteScroll";
 import { useLanguage } from "@/contexts/LanguageContext";
 import { fetchArtist } from "@/lib/api";
@@ -72,10 +74,11 @@ const ArtistGrid: React.FC<ArtistGridProps> = ({ onArtistClick }) => {
     return () => clearTimeout(timer);
   }, [search]);
 
-  // Costruisci parametri filtro per API (senza limit/offset — gestiti dal hook)
+  // Costruisci parametri filtro per API (senza limit/offset — gestiti dal hook).
+  // La griglia chiede il profilo "card": il dettaglio si carica al click.
   const apiFilters = React.useMemo(() => {
-    const p: Record<string, string> = {};
-    if (typeFilter !== "ALL") p["artist_type"] = typeFilter;
+    const p: ArtistFilterParams = { profile: "card" };
+    if (typeFilter !== "ALL") p.artist_type = typeFilter;
     return p;
   }, [typeFilter]);
 
@@ -121,13 +124,9 @@ const ArtistGrid: React.FC<ArtistGridProps> = ({ onArtistClick }) => {
   const scrollDisabled = loading || loadingMore || !hasMore || isSearching;
   const sentinelRef = useInfiniteScroll(loadMore, scrollDisabled);
 
+  // Card e risultati di ricerca sono parziali: carica sempre l'artista completo
   const handleArtistCardClick = React.useCallback(
     async (artist: Artist) => {
-      if (!isSearching) {
-        onArtistClick(artist);
-        return;
-      }
-
       try {
         const fullArtist = await fetchArtist(artist.id);
         onArtistClick(fullArtist);
@@ -135,12 +134,21 @@ const ArtistGrid: React.FC<ArtistGridProps> = ({ onArtistClick }) => {
         onArtistClick(artist);
       }
     },
-    [isSearching, onArtistClick],
+    [onArtistClick],
   );
 
   // Estrai generi unici per filtri (da tutti gli artisti caricati)
   const artistTypes = ["ALL", "show_band", "tribute", "cover", "dj", "original"];
 
+  // Conteggi per tipologia: una richiesta, indipendente dal filtro attivo
+  const { data: facets } = useArtistFacets();
+  const typeCounts = React.useMemo(() => {
+    if (!facets) return undefined;
+    const counts: Record<string, number> = { ALL: facets.total_count };
+    for (const item of facets.facets.artist_type) counts[item.value] = item.count;
+    return counts;
+  }, [facets]);
+
   return (
     <div className="max-w-7xl mx-auto px-6 py-24">
       <SEOHead
@@ -161,6 +169,7 @@ const ArtistGrid: React.FC<ArtistGridProps> = ({ onArtistClick }) => {
             artistTypes={artistTypes}
             activeType={typeFilter}
             onTypeChange={setTypeFilter}
+            counts={typeCounts}
           />
         </div>
 
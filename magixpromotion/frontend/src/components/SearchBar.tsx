@@ -1,6 +1,7 @@
 import React, { useState, useRef, useEffect } from "react";
 import { useLanguage } from "@/contexts/LanguageContext";
 import { useSearch } from "../hooks/useSearch";
+import type { AutocompleteSuggestion } from "@/types";
 
 interface SearchBarProps {
   placeholder?: string;
@@ -12,11 +13,18 @@ interface SearchBarProps {
   }) => void;
 }
 
+const SUGGESTION_TYPE_LABELS: Record<AutocompleteSuggestion["type"], string> = {
+  artist: "Artista",
+  event: "Evento",
+  venue: "Venue",
+  city: "Città",
+};
+
 /**
  * Search bar con autocomplete dropdown.
  *
- * Mostra suggerimenti artisti in tempo reale (autocomplete)
- * e permette ricerca completa su Enter.
+ * Mostra suggerimenti in tempo reale (artisti, eventi, venue, citta'
+ * in un'unica lista ordinata) e permette ricerca completa su Enter.
  */
 const SearchBar: React.FC<SearchBarProps> = ({
   placeholder = "Cerca artisti, eventi...",
@@ -66,14 +74,19 @@ const SearchBar: React.FC<SearchBarProps> = ({
     }
   };
 
-  const handleSuggestionClick = (suggestion: {
-    id: number;
-    name: string;
-    slug: string;
-  }) => {
+  const handleSuggestionClick = (suggestion: AutocompleteSuggestion) => {
     setQuery(suggestion.name);
-    setIsOpen(false);
-    onResultClick?.({ type: "artist", slug: suggestion.slug, id: suggestion.id });
+    if (suggestion.type === "artist" || suggestion.type === "event") {
+      setIsOpen(false);
+      onResultClick?.({
+        type: suggestion.type,
+        slug: suggestion.slug,
+        id: suggestion.id as number,
+      });
+      return;
+    }
+    // Venue e citta' non hanno una pagina: ricerca completa sul nome
+    search(suggestion.name, "events", lang);
   };
 
   const handleResultClick = (result: {
@@ -128,16 +141,25 @@ const SearchBar: React.FC<SearchBarProps> = ({
               <div className="search-section-title">Suggerimenti</div>
               {suggestions.map((s) => (
                 <button
-                  key={`suggestion-${s.id}`}
+                  key={`suggestion-${s.type}-${s.id ?? s.name}`}
                   className="search-item"
                   onClick={() => handleSuggestionClick(s)}
                   role="option"
                   type="button"
                 >
+                  <span className="search-item-type">
+                    {SUGGESTION_TYPE_LABELS[s.type]}
+                  </span>
                   <span className="search-item-name">{s.name}</span>
                   {s.genre && (
                     <span className="search-item-meta">{s.genre}</span>
                   )}
+                  {s.type !== "city" && s.city && (
+                    <span className="search-item-meta">{s.city}</span>
+                  )}
+                  {s.start_date && (
+                    <span className="search-item-date">{s.start_date}</span>
+                  )}
                 </button>
               ))}
             </div>
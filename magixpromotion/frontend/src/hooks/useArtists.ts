@@ -1,7 +1,10 @@
 import { useEffect, useState, useCallback, useRef, useMemo } from "react";
-import { fetchArtists, fetchArtist } from "@/lib/api";
+import { fetchArtists, fetchArtistsPage, fetchArtist } from "@/lib/api";
+import type { ArtistProfile } from "@/lib/api";
 import { useLanguage } from "@/contexts/LanguageContext";
-import type { Artist, WagtailListResponse } from "@/types";
+import type { Artist, CursorListResponse, WagtailListResponse } from "@/types";
+
+type ArtistListPage = WagtailListResponse<Artist> | CursorListResponse<Artist>;
 
 /** Parametri filtro (senza offset/limit, gestiti internamente) */
 export interface ArtistFilterParams {
@@ -10,6 +13,8 @@ export interface ArtistFilterParams {
   region?: string;
   country?: string;
   search?: string;
+  /** Profilo campi lato backend (es. "card" per la griglia) */
+  profile?: ArtistProfile;
 }
 
 /** Dimensione pagina per il caricamento incrementale */
@@ -24,6 +29,10 @@ function todaySeed(): string {
 /**
  * Hook per caricare la lista artisti con infinite scroll.
  *
+ * Senza ricerca usa la paginazione a cursore del backend (`?cursor=`,
+ * nell'ordine della rotazione giornaliera); la ricerca full-text non la
+ * supporta e resta a offset.
+ *
  * Espone:
  * - `items`: array cumulativo di artisti
  * - `loading`: true durante il primo caricamento
@@ -41,6 +50,7 @@ export function useArtists(filters?: ArtistFilterParams) {
   const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState<Error | null>(null);
   const offsetRef = useRef(0);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
 
   // Seed giornaliera calcolata una sola volta per sessione del componente
   const seed = useMemo(() => todaySeed(), []);
@@ -54,22 +64,22 @@ export function useArtists(filters?: ArtistFilterParams) {
   useEffect(() => {
     let cancelled = false;
     offsetRef.current = 0;
+    setNextCursor(null);
     setItems([]);
     setLoading(true);
     setError(null);
 
-    fetchArtists({
-      ...filters,
-      limit: pageSize,
-      offset: 0,
-      daily_seed: hasSearch ? undefined : seed,
-      locale: lang,
-    })
+    const request: Promise<ArtistListPage> = hasSearch
+      ? fetchArtists({ ...filters, limit: pageSize, offset: 0, locale: lang })
+      : fetchArtistsPage({ ...filters, limit: pageSize, daily_seed: seed, locale: lang }, "");
+
+    request
       .then((res) => {
         if (!cancelled) {
           setItems(res.items);
-          setTotalCount(res.meta.total_count);
+          setTotalCount(res.meta.total_count ?? res.items.length);
           offsetRef.current = res.items.length;
+          if ("next" in res.meta) setNextCursor(res.meta.next ?? null);
         }
       })
       .catch((err: Error) => {
@@ -85,24 +95,26 @@ export function useArtists(filters?: ArtistFilterParams) {
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [filterKey, hasSearch, lang, pageSize, seed]);
 
-  const hasMore = items.length < totalCount;
+  const hasMore = hasSearch ? items.length < totalCount : nextCursor !== null;
 
   /** Carica la pagina successiva (append) */
   const loadMore = useCallback(() => {
     if (loadingMore || !hasMore) return;
     setLoadingMore(true);
 
-    fetchArtists({
-      ...filters,
-      limit: pageSize,
-      offset: offsetRef.current,
-      daily_seed: hasSearch ? undefined : seed,
-      locale: lang,
-    })
+    const request: Promise<ArtistListPage> = hasSearch
+      ? fetchArtists({ ...filters, limit: pageSize, offset: offsetRef.current, locale: lang })
+      : fetchArtistsPage(
+          { ...filters, limit: pageSize, daily_seed: seed, locale: lang },
+          nextCursor ?? "",
+        );
+
+    request
       .then((res) => {
         setItems((prev) => [...prev, ...res.items]);
-        setTotalCount(res.meta.total_count);
+        if (res.meta.total_count !== undefined) setTotalCount(res.meta.total_count);
         offsetRef.current += res.items.length;
+        if ("next" in res.meta) setNextCursor(res.meta.next ?? null);
       })
       .catch((err: Error) => {
         setError(err);
@@ -111,7 +123,7 @@ export function useArtists(filters?: ArtistFilterParams) {
         setLoadingMore(false);
       });
     // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, [filterKey, hasMore, hasSearch, lang, loadingMore, pageSize, seed]);
+  }, [filterKey, hasMore, hasSearch, lang, loadingMore, nextCursor, pageSize, seed]);
 
   // Retrocompatibilità: esponi anche `data` nella forma WagtailListResponse
   const data: WagtailListResponse<Artist> | null =
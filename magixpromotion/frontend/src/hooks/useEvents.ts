@@ -1,9 +1,9 @@
-import { useEffect, useState, useCallback, useRef } from "react";
-import { fetchEvents } from "@/lib/api";
+import { useEffect, useState, useCallback } from "react";
+import { fetchEventsPage } from "@/lib/api";
 import { useLanguage } from "@/contexts/LanguageContext";
 import type { EventPage, WagtailListResponse } from "@/types";
 
-/** Parametri filtro eventi (senza offset/limit, gestiti internamente) */
+/** Parametri filtro eventi (senza cursore/limit, gestiti internamente) */
 export interface EventFilterParams {
   artist?: string;
   venue?: string;
@@ -21,6 +21,10 @@ const PAGE_SIZE = 6;
 /**
  * Hook per caricare gli eventi con infinite scroll.
  *
+ * Usa la paginazione a cursore del backend (`?cursor=`): ogni pagina
+ * riparte dall'ultimo evento ricevuto, senza duplicati se nel frattempo
+ * vengono pubblicati altri eventi.
+ *
  * Espone:
  * - `items`: array cumulativo di eventi
  * - `loading`: true durante il primo caricamento
@@ -37,24 +41,24 @@ export function useEvents(filters?: EventFilterParams) {
   const [loading, setLoading] = useState(true);
   const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState<Error | null>(null);
-  const offsetRef = useRef(0);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
 
   const filterKey = JSON.stringify(filters ?? {});
 
   // Reset e primo caricamento quando cambiano i filtri
   useEffect(() => {
     let cancelled = false;
-    offsetRef.current = 0;
+    setNextCursor(null);
     setItems([]);
     setLoading(true);
     setError(null);
 
-    fetchEvents({ ...filters, limit: PAGE_SIZE, offset: 0, locale: lang })
+    fetchEventsPage({ ...filters, limit: PAGE_SIZE, locale: lang }, "")
       .then((res) => {
         if (!cancelled) {
           setItems(res.items);
-          setTotalCount(res.meta.total_count);
-          offsetRef.current = res.items.length;
+          setTotalCount(res.meta.total_count ?? res.items.length);
+          setNextCursor(res.meta.next ?? null);
         }
       })
       .catch((err: Error) => {
@@ -70,18 +74,17 @@ export function useEvents(filters?: EventFilterParams) {
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [filterKey, lang]);
 
-  const hasMore = items.length < totalCount;
+  const hasMore = nextCursor !== null;
 
   /** Carica la pagina successiva (append) */
   const loadMore = useCallback(() => {
-    if (loadingMore || !hasMore) return;
+    if (loadingMore || nextCursor === null) return;
     setLoadingMore(true);
 
-    fetchEvents({ ...filters, limit: PAGE_SIZE, offset: offsetRef.current, locale: lang })
+    fetchEventsPage({ ...filters, limit: PAGE_SIZE, locale: lang }, nextCursor)
       .then((res) => {
         setItems((prev) => [...prev, ...res.items]);
-        setTotalCount(res.meta.total_count);
-        offsetRef.current += res.items.length;
+        setNextCursor(res.meta.next ?? null);
       })
       .catch((err: Error) => {
         setError(err);
@@ -90,7 +93,7 @@ export function useEvents(filters?: EventFilterParams) {
         setLoadingMore(false);
       });
     // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, [loadingMore, hasMore, filterKey, lang]);
+  }, [loadingMore, nextCursor, filterKey, lang]);
 
   // Retrocompatibilità: esponi anche `data` nella forma WagtailListResponse
   const data: WagtailListResponse<EventPage> | null =
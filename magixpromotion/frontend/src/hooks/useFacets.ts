@@ -0,0 +1,58 @@
+import { useEffect, useState } from "react";
+import { fetchArtistFacets, fetchEventFacets } from "@/lib/api";
+import type { ArtistFacetParams, EventFacetParams } from "@/lib/api";
+import { useLanguage } from "@/contexts/LanguageContext";
+import type { ArtistFacetName, EventFacetName, FacetsResponse } from "@/types";
+
+/**
+ * Carica i conteggi per faccette con una sola richiesta per combinazione
+ * di filtri: il backend conta ogni faccetta con tutti gli altri filtri
+ * attivi, quindi cambiando un filtro si aggiornano tutti i conteggi.
+ */
+function useFacets<K extends string, P extends object>(
+  fetcher: (params: P) => Promise<FacetsResponse<K>>,
+  filters: P | undefined,
+) {
+  const { lang } = useLanguage();
+  const [data, setData] = useState<FacetsResponse<K> | null>(null);
+  const [loading, setLoading] = useState(true);
+  const [error, setError] = useState<Error | null>(null);
+
+  const filterKey = JSON.stringify(filters ?? {});
+
+  useEffect(() => {
+    let cancelled = false;
+    setLoading(true);
+
+    fetcher({ ...filters, locale: lang } as P)
+      .then((res) => {
+        if (!cancelled) {
+          setData(res);
+          setError(null);
+        }
+      })
+      .catch((err: Error) => {
+        if (!cancelled) setError(err);
+      })
+      .finally(() => {
+        if (!cancelled) setLoading(false);
+      });
+
+    return () => {
+      cancelled = true;
+    };
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [filterKey, lang]);
+
+  return { data, loading, error };
+}
+
+/** Conteggi dei filtri roster (tipologia, genere, evento target, regione, paese). */
+export function useArtistFacets(filters?: ArtistFacetParams) {
+  return useFacets<ArtistFacetName, ArtistFacetParams>(fetchArtistFacets, filters);
+}
+
+/** Conteggi dei filtri calendario (artista, regione, paese, citta'). */
+export function useEventFacets(filters?: EventFacetParams) {
+  return useFacets<EventFacetName, EventFacetParams>(fetchEventFacets, filters);
+}
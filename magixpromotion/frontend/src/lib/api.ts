@@ -5,10 +5,15 @@
 
 import type {
   Artist,
+  ArtistFacetName,
   BookingFormData,
+  CursorListResponse,
+  EventFacetName,
   EventPage,
+  FacetsResponse,
   MenuResponse,
   PressAreaData,
+  RosterManifest,
   SiteSettings,
   WagtailListResponse,
 } from "@/types";
@@ -28,37 +33,63 @@ async function apiFetch<T>(url: string): Promise<T> {
 
 // --- Artists ---
 
-/**
- * Fetch paginated list of artists.
- */
-export async function fetchArtists(params?: {
+/** Field profiles supported by the artists endpoint (?profile=). */
+export type ArtistProfile = "card" | "detail" | "full";
+
+/** Filters and options shared by the artist list fetchers. */
+export interface ArtistListParams {
   artist_type?: string;
+  /** One or more comma-separated genre slugs */
   genre?: string;
+  /** One or more comma-separated target event slugs */
+  target_event?: string;
+  /** "all": every listed genre/target event must match (default: any) */
+  match?: "any" | "all";
   region?: string;
   country?: string;
   limit?: number;
-  offset?: number;
   daily_seed?: string;
   locale?: string;
   search?: string;
-}): Promise<WagtailListResponse<Artist>> {
+  profile?: ArtistProfile;
+}
+
+function artistSearchParams(params?: ArtistListParams): URLSearchParams {
   const searchParams = new URLSearchParams();
 
   if (params?.artist_type) searchParams.set("artist_type", params.artist_type);
   if (params?.genre) searchParams.set("genre", params.genre);
+  if (params?.target_event) searchParams.set("target_event", params.target_event);
+  if (params?.match === "all") searchParams.set("match", "all");
   if (params?.region) searchParams.set("region", params.region);
   if (params?.country) searchParams.set("country", params.country);
   if (params?.limit) searchParams.set("limit", String(params.limit));
-  if (params?.offset) searchParams.set("offset", String(params.offset));
   if (params?.daily_seed) searchParams.set("daily_seed", params.daily_seed);
   if (params?.locale) searchParams.set("locale", params.locale);
   if (params?.search) searchParams.set("search", params.search);
 
-  // Request extra fields in detail mode
-  searchParams.set(
-    "fields",
-    "short_bio,artist_type,image_url,genre_display,tags,socials,events,epk,tribute_to,hero_video_url,base_country,base_region,base_city",
-  );
+  if (params?.profile) {
+    searchParams.set("profile", params.profile);
+  } else {
+    // Request extra fields in detail mode
+    searchParams.set(
+      "fields",
+      "short_bio,artist_type,image_url,genre_display,tags,socials,events,epk,tribute_to,hero_video_url,base_country,base_region,base_city",
+    );
+  }
+  return searchParams;
+}
+
+/**
+ * Fetch paginated list of artists.
+ * With `profile` the backend picks the field set (e.g. "card" for the
+ * roster grid: no gallery, events, EPK or body).
+ */
+export async function fetchArtists(
+  params?: ArtistListParams & { offset?: number },
+): Promise<WagtailListResponse<Artist>> {
+  const searchParams = artistSearchParams(params);
+  if (params?.offset) searchParams.set("offset", String(params.offset));
 
   const qs = searchParams.toString();
   return apiFetch<WagtailListResponse<Artist>>(
@@ -66,6 +97,69 @@ export async function fetchArtists(params?: {
   );
 }
 
+/**
+ * Fetch one page of artists with cursor (keyset) pagination.
+ * Pass "" for the first page, then `meta.next` until it is null.
+ * Not combinable with `search`.
+ */
+export async function fetchArtistsPage(
+  params: ArtistListParams | undefined,
+  cursor: string,
+): Promise<CursorListResponse<Artist>> {
+  const searchParams = artistSearchParams(params);
+  searchParams.set("cursor", cursor);
+  return apiFetch<CursorListResponse<Artist>>(
+    `${API_BASE}/artists/?${searchParams.toString()}`,
+  );
+}
+
+/** Filters accepted by the facets endpoints (no fields, paging or search). */
+export type ArtistFacetParams = Pick<
+  ArtistListParams,
+  "artist_type" | "genre" | "target_event" | "match" | "region" | "country" | "locale"
+>;
+export type EventFacetParams = Omit<EventListParams, "limit">;
+
+/** Keep only the set, non-empty filter values as query parameters. */
+function facetSearchParams(params?: object): string {
+  const searchParams = new URLSearchParams();
+  for (const [key, value] of Object.entries(params ?? {})) {
+    if (value === true) searchParams.set(key, "true");
+    else if (typeof value === "string" && value) searchParams.set(key, value);
+  }
+  return searchParams.toString();
+}
+
+/**
+ * Fetch the roster facet counts for the current filters.
+ * Each facet is counted with every other active filter applied.
+ */
+export async function fetchArtistFacets(
+  params?: ArtistFacetParams,
+): Promise<FacetsResponse<ArtistFacetName>> {
+  return apiFetch<FacetsResponse<ArtistFacetName>>(
+    `${API_BASE}/artists/facets/?${facetSearchParams(params)}`,
+  );
+}
+
+/**
+ * Fetch the full roster (card fields) for a locale.
+ * Reads the static, content-hashed snapshot named by the manifest and
+ * falls back to the API listing when no snapshot has been built yet.
+ */
+export async function fetchRoster(locale: string): Promise<WagtailListResponse<Artist>> {
+  const manifest = await apiFetch<RosterManifest>(`${API_BASE}/roster/`);
+  const entry = manifest.locales[locale];
+  if (entry) {
+    try {
+      return await apiFetch<WagtailListResponse<Artist>>(entry.url);
+    } catch {
+      // Snapshot appena sostituito o non raggiungibile: usa l'API
+    }
+  }
+  return fetchArtists({ profile: "card", limit: 50, locale });
+}
+
 /**
  * Fetch a single artist by ID.
  */
@@ -113,10 +207,8 @@ export async function fetchEventBySlug(slug: string, locale?: string): Promise<E
 
 // --- Events ---
 
-/**
- * Fetch paginated list of events.
- */
-export async function fetchEvents(params?: {
+/** Filters and options shared by the event list fetchers. */
+export interface EventListParams {
   artist?: string;
   venue?: string;
   region?: string;
@@ -126,9 +218,10 @@ export async function fetchEvents(params?: {
   date_to?: string;
   city?: string;
   limit?: number;
-  offset?: number;
   locale?: string;
-}): Promise<WagtailListResponse<EventPage>> {
+}
+
+function eventSearchParams(params?: EventListParams): URLSearchParams {
   const searchParams = new URLSearchParams();
 
   if (params?.artist) searchParams.set("artist", params.artist);
@@ -140,13 +233,23 @@ export async function fetchEvents(params?: {
   if (params?.date_to) searchParams.set("date_to", params.date_to);
   if (params?.city) searchParams.set("city", params.city);
   if (params?.limit) searchParams.set("limit", String(params.limit));
-  if (params?.offset) searchParams.set("offset", String(params.offset));
   if (params?.locale) searchParams.set("locale", params.locale);
 
   searchParams.set(
     "fields",
     "start_date,end_date,doors_time,start_time,status,ticket_url,ticket_price,description,venue,artist,featured_image_url",
   );
+  return searchParams;
+}
+
+/**
+ * Fetch paginated list of events.
+ */
+export async function fetchEvents(
+  params?: EventListParams & { offset?: number },
+): Promise<WagtailListResponse<EventPage>> {
+  const searchParams = eventSearchParams(params);
+  if (params?.offset) searchParams.set("offset", String(params.offset));
 
   const qs = searchParams.toString();
   return apiFetch<WagtailListResponse<EventPage>>(
@@ -154,6 +257,33 @@ export async function fetchEvents(params?: {
   );
 }
 
+/**
+ * Fetch one page of events with cursor (keyset) pagination.
+ * Pass "" for the first page, then `meta.next` until it is null.
+ */
+export async function fetchEventsPage(
+  params: EventListParams | undefined,
+  cursor: string,
+): Promise<CursorListResponse<EventPage>> {
+  const searchParams = eventSearchParams(params);
+  searchParams.set("cursor", cursor);
+  return apiFetch<CursorListResponse<EventPage>>(
+    `${API_BASE}/events/?${searchParams.toString()}`,
+  );
+}
+
+/**
+ * Fetch the calendar facet counts (artist, region, country, city).
+ * Venue and date filters narrow the events without being counted.
+ */
+export async function fetchEventFacets(
+  params?: EventFacetParams,
+): Promise<FacetsResponse<EventFacetName>> {
+  return apiFetch<FacetsResponse<EventFacetName>>(
+    `${API_BASE}/events/facets/?${facetSearchParams(params)}`,
+  );
+}
+
 // --- Navigation Menu ---
 
 /**
@@ -70,6 +70,7 @@ export interface Artist {
   base_region: string;
   base_city: string;
   image_url: string | null;
+  /** LQIP placeholder: inline data URI, or the 40x60 thumb URL until computed */
   image_thumb: string | null;
   gallery_images: string[];
   gallery_thumbs: string[];
@@ -118,11 +119,18 @@ export interface SearchResponse {
   results: SearchResult[];
 }
 
+export type AutocompleteSuggestionType = "artist" | "event" | "venue" | "city";
+
 export interface AutocompleteSuggestion {
-  id: number;
+  type: AutocompleteSuggestionType;
+  /** null per le citta' */
+  id: number | null;
   name: string;
+  /** vuoto per venue e citta' */
   slug: string;
   genre?: string;
+  start_date?: string | null;
+  city?: string;
 }
 
 // --- Events ---
@@ -183,6 +191,51 @@ export interface WagtailListResponse<T> {
   items: T[];
 }
 
+/** Meta della paginazione a cursore (?cursor=): total_count solo sulla prima pagina */
+export interface CursorMeta {
+  total_count?: number;
+  next: string | null;
+}
+
+export interface CursorListResponse<T> {
+  meta: CursorMeta;
+  items: T[];
+}
+
+// --- Facets ---
+
+/** Valore di una faccetta: conteggio con tutti gli altri filtri attivi */
+export interface FacetValue {
+  value: string;
+  label: string;
+  count: number;
+}
+
+export type ArtistFacetName = "artist_type" | "genre" | "target_event" | "region" | "country";
+export type EventFacetName = "artist" | "region" | "country" | "city";
+
+/** Risposta di /api/v2/artists/facets/ e /api/v2/events/facets/ */
+export interface FacetsResponse<K extends string> {
+  total_count: number;
+  facets: Record<K, FacetValue[]>;
+}
+
+// --- Roster snapshot ---
+
+/** Snapshot statico del roster di una lingua (file con hash, cache immutable) */
+export interface RosterSnapshotEntry {
+  hash: string;
+  url: string;
+  count: number;
+  bytes: number;
+}
+
+/** Risposta di /api/v2/roster/: snapshot corrente per lingua */
+export interface RosterManifest {
+  generated_at: string | null;
+  locales: Record<string, RosterSnapshotEntry>;
+}
+
 // --- Site Settings ---
 
 export interface SiteAddress {
@@ -2,9 +2,12 @@
 from django.http import JsonResponse
 from django.utils.translation import get_language
 
+from core.conditional import MENU, conditional_api
+
 from .models import NavigationMenu
 
 
+@conditional_api(MENU)
 def menu_api(request, location: str):
     """
     GET /api/v2/menu/<location>/
@@ -93,6 +93,44 @@ class TestArtistAPI:
         response = client.get("/api/v2/artists/?daily_seed=2026-02-19")
         assert response.status_code == 200
 
+    def test_daily_seed_uses_precomputed_rotation(self, artist_listing):
+        """Per il seed di oggi le posizioni vengono salvate alla prima richiesta
+        e l'ordine coincide con la permutazione MD5."""
+        from django.utils import timezone
+
+        from artists.models import ArtistDailyRank
+        from artists.rotation import rotation_sort_key
+        from core.response_cache import ROSTER_KEY, purge_surrogate_keys
+
+        for i in range(5):
+            ArtistPageFactory(parent=artist_listing, title=f"Rotazione {i}")
+        seed = timezone.localdate().isoformat()
+        client = Client()
+
+        response = client.get(f"/api/v2/artists/?daily_seed={seed}")
+        ids = [item["id"] for item in response.json()["items"]]
+
+        assert ArtistDailyRank.objects.filter(seed=seed).count() == 5
+        assert ids == sorted(ids, key=lambda pk: rotation_sort_key(pk, seed))
+
+        # Artista creato dopo il calcolo: in coda
+        late = ArtistPageFactory(parent=artist_listing, title="Rotazione tardiva")
+        purge_surrogate_keys([ROSTER_KEY])  # la factory non pubblica
+        response = client.get(f"/api/v2/artists/?daily_seed={seed}")
+        assert [item["id"] for item in response.json()["items"]] == ids + [late.pk]
+
+    def test_daily_seed_far_from_today_uses_hash(self, artist_listing):
+        from artists.models import ArtistDailyRank
+        from artists.rotation import rotation_sort_key
+
+        for i in range(4):
+            ArtistPageFactory(parent=artist_listing, title=f"Hash {i}")
+        response = Client().get("/api/v2/artists/?daily_seed=2020-01-01")
+        ids = [item["id"] for item in response.json()["items"]]
+
+        assert not ArtistDailyRank.objects.exists()
+        assert ids == sorted(ids, key=lambda pk: rotation_sort_key(pk, "2020-01-01"))
+
     def test_artist_detail_falls_back_to_italian_events_for_english_locale(self, home_page):
         import datetime
 
@@ -136,6 +174,205 @@ class TestArtistAPI:
         assert len(data) == 1
         assert data[0]["slug"] == "evento-originale"
 
+    def _artists_with_events(self, artist_listing, event_listing, venue, count, events_each, prefix="A"):
+        import datetime
+
+        for idx in range(count):
+            artist = ArtistPageFactory(parent=artist_listing, title=f"Band Eventi {prefix}{idx}")
+            for day in range(events_each):
+                EventPageFactory(
+                    parent=event_listing,
+                    title=f"Evento {prefix}{idx}-{day}",
+                    start_date=datetime.date(2099, 1, 1) + datetime.timedelta(days=day),
+                    related_artist=artist,
+                    venue=venue,
+                )
+
+    def test_listing_events_query_count_does_not_grow_with_artists(
+        self, artist_listing, event_listing, venue, settings
+    ):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        settings.API_RESPONSE_CACHE = False  # misura la view, non la cache
+        self._artists_with_events(artist_listing, event_listing, venue, 2, 2)
+        client = Client()
+        with CaptureQueriesContext(connection) as small:
+            client.get("/api/v2/artists/?fields=_,id,events")
+
+        self._artists_with_events(artist_listing, event_listing, venue, 6, 2, prefix="B")
+        with CaptureQueriesContext(connection) as large:
+            response = client.get("/api/v2/artists/?fields=_,id,events")
+
+        assert len(large.captured_queries) == len(small.captured_queries)
+        items = response.json()["items"]
+        assert len(items) == 8
+        assert all(len(item["events"]) == 2 for item in items)
+
+    def test_listing_events_are_capped_per_artist(self, artist_listing, event_listing, venue):
+        self._artists_with_events(artist_listing, event_listing, venue, 2, 12)
+
+        items = Client().get("/api/v2/artists/?fields=_,id,events").json()["items"]
+
+        for item in items:
+            dates = [event["date"] for event in item["events"]]
+            assert len(dates) == 10
+            assert dates == sorted(dates)
+            assert dates[0] == "2099-01-01"
+
+    def _artists_with_epks(self, artist_listing, count, prefix="A"):
+        import datetime
+
+        import wagtail_factories
+        from django.utils import timezone
+
+        from core.models import EPKPackage
+
+        base = timezone.now() - datetime.timedelta(days=10)
+        for idx in range(count):
+            artist = ArtistPageFactory(parent=artist_listing, title=f"Band EPK {prefix}{idx}")
+            for offset, title, is_public in [
+                (0, "Vecchio", True),
+                (1, "Recente", True),
+                (2, "Bozza", False),
+            ]:
+                epk = EPKPackage.objects.create(
+                    artist=artist,
+                    title=title,
+                    is_public=is_public,
+                    technical_rider=wagtail_factories.DocumentFactory(),
+                )
+                EPKPackage.objects.filter(pk=epk.pk).update(
+                    updated_at=base + datetime.timedelta(days=offset)
+                )
+
+    def test_listing_epk_is_latest_public_with_constant_queries(
+        self, artist_listing, settings, tmp_path
+    ):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        settings.MEDIA_ROOT = str(tmp_path)
+        settings.API_RESPONSE_CACHE = False  # misura la view, non la cache
+        self._artists_with_epks(artist_listing, 2)
+        client = Client()
+        with CaptureQueriesContext(connection) as small:
+            client.get("/api/v2/artists/?fields=_,id,epk")
+
+        self._artists_with_epks(artist_listing, 5, prefix="B")
+        with CaptureQueriesContext(connection) as large:
+            response = client.get("/api/v2/artists/?fields=_,id,epk")
+
+        assert len(large.captured_queries) == len(small.captured_queries)
+        items = response.json()["items"]
+        assert len(items) == 7
+        assert {item["epk"]["title"] for item in items} == {"Recente"}
+        assert all(item["epk"]["assets"]["rider"] for item in items)
+
+    def test_detail_view_serializes_prefetched_events(self, artist_listing, event_listing, venue):
+        from artists.models import ArtistPage
+
+        self._artists_with_events(artist_listing, event_listing, venue, 1, 3)
+        artist = ArtistPage.objects.get(title="Band Eventi A0")
+
+        data = Client().get(f"/api/v2/artists/{artist.pk}/").json()
+
+        assert [event["slug"] for event in data["events"]] == [
+            "evento-a0-0", "evento-a0-1", "evento-a0-2",
+        ]
+
+    def _artists_with_images(self, artist_listing, count, prefix="I"):
+        import wagtail_factories
+
+        from artists.models import ArtistGalleryImage
+
+        artists = []
+        for idx in range(count):
+            artist = ArtistPageFactory(
+                parent=artist_listing,
+                title=f"Band Immagini {prefix}{idx}",
+                main_image=wagtail_factories.ImageFactory(),
+            )
+            for order in range(2):
+                ArtistGalleryImage.objects.create(
+                    page=artist, image=wagtail_factories.ImageFactory(), sort_order=order
+                )
+            artists.append(artist)
+        return artists
+
+    def test_listing_renditions_are_prefetched(self, artist_listing, settings, tmp_path):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        settings.MEDIA_ROOT = str(tmp_path)
+        settings.API_RESPONSE_CACHE = False  # misura la view, non la cache
+        url = "/api/v2/artists/?fields=_,id,image_url,image_thumb,gallery_images,gallery_thumbs"
+        client = Client()
+        self._artists_with_images(artist_listing, 2)
+        client.get(url)  # genera le renditions
+        with CaptureQueriesContext(connection) as small:
+            client.get(url)
+
+        self._artists_with_images(artist_listing, 5, prefix="J")
+        client.get(url)
+        with CaptureQueriesContext(connection) as large:
+            response = client.get(url)
+
+        assert len(large.captured_queries) == len(small.captured_queries)
+        items = response.json()["items"]
+        assert len(items) == 7
+        assert all(item["image_url"] and item["image_thumb"] for item in items)
+        assert all(len(item["gallery_images"]) == len(item["gallery_thumbs"]) == 2 for item in items)
+
+    def test_card_profile_skips_heavy_fields_and_queries(self, artist_listing, event_listing, venue):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        self._artists_with_events(artist_listing, event_listing, venue, 3, 2)
+        client = Client()
+        with CaptureQueriesContext(connection) as default:
+            client.get("/api/v2/artists/")
+        with CaptureQueriesContext(connection) as card:
+            response = client.get("/api/v2/artists/?profile=card")
+
+        assert response.status_code == 200
+        item = response.json()["items"][0]
+        assert {"short_bio", "image_thumb", "genre_display", "base_city"} <= set(item)
+        assert not {"events", "epk", "body_html", "gallery_images", "socials"} & set(item)
+        assert len(card.captured_queries) < len(default.captured_queries)
+
+    def test_profile_combines_with_fields(self, artist):
+        item = Client().get("/api/v2/artists/?profile=card&fields=socials").json()["items"][0]
+
+        assert "socials" in item
+        assert "events" not in item
+
+    def test_detail_profile_includes_body(self, artist):
+        item = Client().get("/api/v2/artists/?profile=detail").json()["items"][0]
+
+        assert {"body_html", "events", "epk", "gallery_images"} <= set(item)
+
+    def test_unknown_profile_is_rejected(self, artist):
+        response = Client().get("/api/v2/artists/?profile=huge")
+
+        assert response.status_code == 400
+        assert "profile" in response.json()["message"]
+
+    def test_serializer_class_is_reused_across_requests(self, artist):
+        from core.serializers import (
+            clear_serializer_class_cache,
+            serializer_class_cache_info,
+        )
+
+        clear_serializer_class_cache()
+        client = Client()
+        client.get("/api/v2/artists/?profile=card&limit=1")
+        client.get("/api/v2/artists/?profile=card&limit=2")
+        client.get("/api/v2/artists/?fields=_,id,title")
+
+        # Una classe per configurazione di campi, riusata dalle richieste successive
+        assert serializer_class_cache_info().misses == 2
+
 
 @pytest.mark.django_db
 class TestSearchAPI:
@@ -305,6 +542,56 @@ class TestEventAPI:
         data = response.json()
         assert data["meta"]["total_count"] >= 1
 
+    def test_fields_subset_declares_only_requested_custom_fields(self, event_listing, artist):
+        EventPageFactory(parent=event_listing, related_artist=artist)
+        response = Client().get("/api/v2/events/?fields=_,id,artist")
+
+        assert response.status_code == 200
+        item = response.json()["items"][0]
+        assert set(item) == {"id", "artist"}
+        assert item["artist"]["id"] == artist.pk
+
+    def test_listing_artist_renditions_are_prefetched(
+        self, artist_listing, event_listing, venue, settings, tmp_path
+    ):
+        import wagtail_factories
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from artists.models import ArtistGalleryImage
+
+        settings.MEDIA_ROOT = str(tmp_path)
+        settings.API_RESPONSE_CACHE = False  # misura la view, non la cache
+
+        def add_events(count, prefix):
+            for idx in range(count):
+                artist = ArtistPageFactory(
+                    parent=artist_listing,
+                    title=f"Band {prefix}{idx}",
+                    main_image=wagtail_factories.ImageFactory(),
+                )
+                ArtistGalleryImage.objects.create(page=artist, image=wagtail_factories.ImageFactory())
+                EventPageFactory(
+                    parent=event_listing, title=f"Serata {prefix}{idx}", related_artist=artist, venue=venue
+                )
+
+        url = "/api/v2/events/?fields=artist"
+        client = Client()
+        add_events(2, "A")
+        client.get(url)
+        with CaptureQueriesContext(connection) as small:
+            client.get(url)
+
+        add_events(4, "B")
+        client.get(url)
+        with CaptureQueriesContext(connection) as large:
+            response = client.get(url)
+
+        assert len(large.captured_queries) == len(small.captured_queries)
+        artists = [item["artist"] for item in response.json()["items"]]
+        assert len(artists) == 6
+        assert all(artist["image_url"] and len(artist["gallery_thumbs"]) == 1 for artist in artists)
+
     def test_filter_future_only(self, home_page):
         import datetime
 
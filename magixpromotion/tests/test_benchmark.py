@@ -0,0 +1,117 @@
+"""Test per il benchmark della ricerca (seed sintetico e confronto baseline)."""
+import json
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from core.benchmark import (
+    QUERY_MIXES,
+    SERIALIZER_TARGETS,
+    baseline_mismatch,
+    compare_to_baseline,
+    run_benchmark,
+    run_serializer_benchmark,
+    seed_roster,
+)
+
+
+def _result(p50=10.0, p95=20.0, sql=5, peak_kib=100.0):
+    return {"results": {"search.exact": {
+        "p50_ms": p50, "p95_ms": p95, "sql": sql, "peak_kib": peak_kib,
+    }}}
+
+
+class TestCompareToBaseline:
+    def test_within_tolerance(self):
+        assert compare_to_baseline(_result(p50=12.0, p95=24.0), _result()) == []
+
+    def test_small_absolute_delta_is_noise(self):
+        assert compare_to_baseline(_result(p50=1.5), _result(p50=0.5)) == []
+
+    def test_regressions(self):
+        regressions = compare_to_baseline(
+            _result(p95=40.0, sql=6, peak_kib=200.0), _result()
+        )
+        assert [line.split(":")[1].split()[0] for line in regressions] == [
+            "p95_ms", "sql", "peak_kib",
+        ]
+
+    def test_missing_measurement(self):
+        assert compare_to_baseline({"results": {}}, _result()) == ["search.exact: misura assente"]
+
+    def test_baseline_mismatch(self):
+        current = {"meta": {"database": "postgresql", "artists": 10000, "events": 200000}}
+        baseline = {"meta": {"database": "sqlite", "artists": 10000, "events": 200000}}
+
+        assert baseline_mismatch(current, baseline) == ["database: sqlite -> postgresql"]
+        assert baseline_mismatch(current, {}) == []
+
+    def test_default_baseline_is_committed(self):
+        from core.management.commands.search_benchmark import DEFAULT_BASELINE
+
+        assert set(json.loads(DEFAULT_BASELINE.read_text())["results"]) == {
+            f"{target}.{mix}"
+            for target in ("search", "autocomplete", "fuzzy")
+            for mix in QUERY_MIXES
+        }
+
+
+@pytest.mark.django_db
+class TestSearchBenchmark:
+    def test_seed_is_resumable(self, home_page):
+        from artists.models import ArtistPage
+        from events.models import EventPage
+
+        seed_roster(artists=12, events=20)
+        titles = list(ArtistPage.objects.order_by("slug").values_list("title", flat=True))
+        seed_roster(artists=15, events=20)
+
+        assert ArtistPage.objects.count() == 15
+        assert EventPage.objects.count() == 20
+        assert ArtistPage.objects.filter(locale__language_code="en").count() == 2
+        assert list(
+            ArtistPage.objects.exclude(slug__in=["bench-artist-12", "bench-artist-13", "bench-artist-14"])
+            .order_by("slug").values_list("title", flat=True)
+        ) == titles
+
+    def test_run_reports_every_endpoint_and_mix(self, home_page):
+        seed_roster(artists=20, events=30)
+
+        report = run_benchmark(iterations=2)
+
+        assert report["meta"]["artists"] == 20
+        assert set(report["results"]) == {
+            f"{target}.{mix}"
+            for target in ("search", "autocomplete", "fuzzy")
+            for mix in QUERY_MIXES
+        }
+        search = report["results"]["search.exact"]
+        assert search["sql"] > 0
+        assert search["p95_ms"] >= search["p50_ms"] > 0
+        assert search["peak_kib"] > 0
+
+    def test_command_fails_on_regression(self, home_page, tmp_path):
+        seed_roster(artists=5, events=5)
+        baseline = tmp_path / "baseline.json"
+        output = tmp_path / "out.json"
+
+        call_command("search_benchmark", "--iterations=1", f"--baseline={baseline}", "--update-baseline")
+        saved = json.loads(baseline.read_text())
+        for metrics in saved["results"].values():
+            metrics["sql"] = 0
+        baseline.write_text(json.dumps(saved))
+
+        with pytest.raises(CommandError, match="sql"):
+            call_command(
+                "search_benchmark", "--iterations=1", f"--baseline={baseline}", f"--output={output}",
+            )
+        assert json.loads(output.read_text())["meta"]["iterations"] == 1
+
+
+class TestSerializerBenchmark:
+    def test_cached_serializer_class_is_faster(self):
+        report = run_serializer_benchmark(iterations=20)
+
+        assert set(report["results"]) == set(SERIALIZER_TARGETS)
+        for metrics in report["results"].values():
+            assert metrics["cached_us"] < metrics["uncached_us"]
@@ -0,0 +1,132 @@
+"""Test per i GET condizionali (ETag / Last-Modified) degli endpoint JSON."""
+import datetime
+
+import pytest
+from django.test import Client
+
+from tests.factories import EventPageFactory
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    def test_matching_etag_answers_304_without_queries(self, home_page, django_assert_num_queries):
+        client = Client()
+        first = client.get("/api/v2/site-settings/")
+        assert first.status_code == 200
+        assert first["ETag"] and first["Last-Modified"]
+
+        with django_assert_num_queries(0):
+            second = client.get("/api/v2/site-settings/", HTTP_IF_NONE_MATCH=first["ETag"])
+        assert second.status_code == 304
+
+        # Stesso timestamp: anche If-Modified-Since basta
+        third = client.get("/api/v2/site-settings/", HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+        assert third.status_code == 304
+
+    def test_etag_varies_with_query_string(self, home_page):
+        client = Client()
+        first = client.get("/api/v2/menu/header/?lang=it")
+        second = client.get("/api/v2/menu/header/?lang=en", HTTP_IF_NONE_MATCH=first["ETag"])
+        assert second.status_code == 200
+
+    def test_menu_change_invalidates_etag(self, home_page, django_capture_on_commit_callbacks):
+        from navigation.models import MenuItem, NavigationMenu
+
+        menu = NavigationMenu.objects.create(title="Header", location="header", language="it")
+        client = Client()
+        etag = client.get("/api/v2/menu/header/?lang=it")["ETag"]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            MenuItem.objects.create(
+                menu=menu, title_override="Artisti", external_url="https://example.com", sort_order=0
+            )
+
+        response = client.get("/api/v2/menu/header/?lang=it", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.json()["items"][0]["title"] == "Artisti"
+
+    def test_linked_page_rename_invalidates_menu_etag(
+        self, home_page, artist_listing, django_capture_on_commit_callbacks
+    ):
+        from navigation.models import MenuItem, NavigationMenu
+
+        menu = NavigationMenu.objects.create(title="Header", location="header", language="it")
+        MenuItem.objects.create(menu=menu, page_link=artist_listing, sort_order=0)
+        client = Client()
+        etag = client.get("/api/v2/menu/header/?lang=it")["ETag"]
+
+        artist_listing.title = "Il nostro roster"
+        with django_capture_on_commit_callbacks(execute=True):
+            artist_listing.save_revision().publish()
+
+        response = client.get("/api/v2/menu/header/?lang=it", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.json()["items"][0]["title"] == "Il nostro roster"
+
+    def test_linked_page_move_invalidates_menu_etag(
+        self, home_page, artist_listing, event_listing, django_capture_on_commit_callbacks
+    ):
+        from navigation.models import MenuItem, NavigationMenu
+
+        menu = NavigationMenu.objects.create(title="Header", location="header", language="it")
+        MenuItem.objects.create(menu=menu, page_link=artist_listing, sort_order=0)
+        client = Client()
+        first = client.get("/api/v2/menu/header/?lang=it")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            artist_listing.move(event_listing, pos="last-child")
+
+        response = client.get("/api/v2/menu/header/?lang=it", HTTP_IF_NONE_MATCH=first["ETag"])
+        assert response.status_code == 200
+        assert response.json()["items"][0]["url"] != first.json()["items"][0]["url"]
+
+    def test_document_change_invalidates_epk_etag(
+        self, home_page, settings, tmp_path, django_capture_on_commit_callbacks
+    ):
+        from django.core.files.base import ContentFile
+        from wagtail.documents import get_document_model
+
+        settings.MEDIA_ROOT = tmp_path
+        client = Client()
+        etag = client.get("/api/v2/site-settings/epk/")["ETag"]
+        with django_capture_on_commit_callbacks(execute=True):
+            get_document_model().objects.create(
+                title="Rider", file=ContentFile(b"pdf", name="rider.pdf")
+            )
+        assert client.get("/api/v2/site-settings/epk/", HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    @pytest.mark.parametrize("response_cache", [True, False])
+    def test_artist_listing_until_publish(
+        self, artist, settings, response_cache, django_capture_on_commit_callbacks
+    ):
+        settings.API_RESPONSE_CACHE = response_cache
+        client = Client()
+        etag = client.get("/api/v2/artists/")["ETag"]
+
+        assert client.get("/api/v2/artists/", HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        artist.title = "Band Rinominata"
+        with django_capture_on_commit_callbacks(execute=True):
+            artist.save_revision().publish()
+
+        response = client.get("/api/v2/artists/", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+
+    def test_archive_task_invalidates_events_etag(
+        self, event_listing, django_capture_on_commit_callbacks
+    ):
+        from booking.tasks import archive_past_events
+
+        EventPageFactory(
+            parent=event_listing,
+            title="Evento passato",
+            start_date=datetime.date.today() - datetime.timedelta(days=5),
+        )
+        client = Client()
+        etag = client.get("/api/v2/events/")["ETag"]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            archive_past_events.apply()
+
+        assert client.get("/api/v2/events/", HTTP_IF_NONE_MATCH=etag).status_code == 200
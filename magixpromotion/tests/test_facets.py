@@ -0,0 +1,166 @@
+"""Test per i conteggi per faccette di roster e calendario."""
+import datetime
+
+import pytest
+from django.test import Client
+
+from tests.factories import (
+    ArtistPageFactory,
+    EventPageFactory,
+    GenreFactory,
+    TargetEventFactory,
+    VenueFactory,
+)
+
+
+def _counts(data, facet):
+    return {item["value"]: item["count"] for item in data["facets"][facet]}
+
+
+@pytest.fixture
+def roster(artist_listing, genres):
+    matrimoni = TargetEventFactory(name="Matrimoni")
+    specs = [
+        ("show_band", [genres[0]], "Lombardia", "IT"),
+        ("show_band", [genres[0], genres[3]], "Piemonte", "IT"),
+        ("tribute", [genres[1]], "Lombardia", "IT"),
+        ("tribute", [genres[2]], "Baviera", "DE"),
+        ("dj", [], "", "IT"),
+    ]
+    artists = []
+    for artist_type, artist_genres, region, country in specs:
+        artist = ArtistPageFactory(
+            parent=artist_listing,
+            artist_type=artist_type,
+            base_region=region,
+            base_country=country,
+        )
+        artist.genres.set(artist_genres)
+        artist.target_events.set([matrimoni] if region == "Lombardia" else [])
+        artist.save()
+        artists.append(artist)
+    return artists
+
+
+@pytest.mark.django_db
+class TestArtistFacets:
+    def test_counts_in_one_query(self, roster, settings):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        settings.API_RESPONSE_CACHE = False  # misura la view, non la cache
+        client = Client()
+        with CaptureQueriesContext(connection) as queries:
+            data = client.get("/api/v2/artists/facets/").json()
+
+        # Oltre alle query di Wagtail (sito, restrizioni) una sola per le righe
+        assert sum("artists_artistpage" in query["sql"] for query in queries.captured_queries) == 1
+        assert data["total_count"] == 5
+        assert _counts(data, "artist_type") == {"show_band": 2, "tribute": 2, "dj": 1}
+        assert _counts(data, "genre") == {
+            "dance-show-band": 2,
+            "rock-band": 1,
+            "tributo-italiano": 1,
+            "tributo-internazionale": 1,
+        }
+        assert _counts(data, "target_event") == {"matrimoni": 2}
+        assert _counts(data, "region") == {"Lombardia": 2, "Piemonte": 1, "Baviera": 1}
+        assert _counts(data, "country") == {"IT": 4, "DE": 1}
+        assert data["facets"]["artist_type"][0]["label"]
+        assert {item["label"] for item in data["facets"]["genre"]} >= {"Dance Show Band"}
+
+    def test_counts_exclude_own_filter(self, roster):
+        data = Client().get("/api/v2/artists/facets/?artist_type=tribute&country=IT").json()
+
+        assert data["total_count"] == 1
+        # La tipologia conta con il solo filtro paese, il paese con la sola tipologia
+        assert _counts(data, "artist_type") == {"show_band": 2, "tribute": 1, "dj": 1}
+        assert _counts(data, "country") == {"IT": 1, "DE": 1}
+        assert _counts(data, "genre") == {"tributo-italiano": 1}
+
+    def test_total_matches_listing(self, roster):
+        client = Client()
+        query = "genre=dance-show-band&region=lomb&target_event=matrimoni"
+        facets = client.get(f"/api/v2/artists/facets/?{query}").json()
+        listing = client.get(f"/api/v2/artists/?{query}").json()
+
+        assert facets["total_count"] == listing["meta"]["total_count"] == 1
+
+    def test_unknown_parameter_is_rejected(self, roster):
+        response = Client().get("/api/v2/artists/facets/?order=title")
+        assert response.status_code == 400
+
+    def test_genre_rename_purges_cached_facets(self, roster, django_capture_on_commit_callbacks):
+        client = Client()
+        assert client.get("/api/v2/artists/facets/")["X-Cache"] == "MISS"
+        assert client.get("/api/v2/artists/facets/")["X-Cache"] == "HIT"
+
+        genre = GenreFactory(name="Rock Band")
+        genre.name = "Rock"
+        with django_capture_on_commit_callbacks(execute=True):
+            genre.save()
+
+        response = client.get("/api/v2/artists/facets/")
+        assert response["X-Cache"] == "MISS"
+        assert "Rock" in {item["label"] for item in response.json()["facets"]["genre"]}
+
+
+@pytest.mark.django_db
+class TestEventFacets:
+    def test_counts_exclude_own_filter(self, event_listing, artist):
+        milano = VenueFactory(city="Milano", region="Lombardia", country="IT")
+        torino = VenueFactory(city="Torino", region="Piemonte", country="IT")
+        monaco = VenueFactory(city="Monaco", region="Baviera", country="DE")
+        other = ArtistPageFactory(parent=artist.get_parent(), title="Altra Band")
+        day = datetime.date(2099, 6, 1)
+        for venue, related_artist in [
+            (milano, artist),
+            (milano, other),
+            (torino, artist),
+            (monaco, artist),
+        ]:
+            EventPageFactory(
+                parent=event_listing, venue=venue, related_artist=related_artist, start_date=day
+            )
+        # Fuori periodo: non conta in nessuna faccetta
+        EventPageFactory(
+            parent=event_listing, venue=milano, related_artist=artist, start_date=datetime.date(2000, 1, 1)
+        )
+
+        data = Client().get(
+            f"/api/v2/events/facets/?future_only=true&artist={artist.slug}&city=milano"
+        ).json()
+
+        assert data["total_count"] == 1
+        assert _counts(data, "artist") == {artist.slug: 1, other.slug: 1}
+        assert _counts(data, "city") == {"Milano": 1, "Torino": 1, "Monaco": 1}
+        assert _counts(data, "country") == {"IT": 1}
+        assert {item["label"] for item in data["facets"]["artist"]} == {artist.title, "Altra Band"}
+
+    def test_counts_only_upcoming_events(self, event_listing, artist, settings):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        settings.API_RESPONSE_CACHE = False  # misura la view, non la cache
+        milano = VenueFactory(city="Milano", region="Lombardia", country="IT")
+        torino = VenueFactory(city="Torino", region="Piemonte", country="IT")
+        EventPageFactory(
+            parent=event_listing, venue=milano, related_artist=artist, start_date=datetime.date(2099, 6, 1)
+        )
+        EventPageFactory(
+            parent=event_listing, venue=torino, related_artist=artist, start_date=datetime.date(2000, 1, 1)
+        )
+        client = Client()
+
+        with CaptureQueriesContext(connection) as queries:
+            data = client.get("/api/v2/events/facets/").json()
+        assert data["total_count"] == 1
+        assert _counts(data, "city") == {"Milano": 1}
+        # Conteggi con GROUP BY nel database, non lettura delle righe
+        event_queries = [q["sql"] for q in queries.captured_queries if "events_eventpage" in q["sql"]]
+        assert all("GROUP BY" in sql or "COUNT(" in sql for sql in event_queries)
+
+        # Con un periodo esplicito (archivio) contano anche gli eventi passati
+        data = client.get("/api/v2/events/facets/?date_to=2001-01-01").json()
+        assert data["total_count"] == 1
+        assert _counts(data, "city") == {"Torino": 1}
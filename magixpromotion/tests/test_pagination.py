@@ -0,0 +1,138 @@
+"""Test per la paginazione a cursore (keyset) di artisti ed eventi."""
+import datetime
+
+import pytest
+from django.test import Client
+
+from events.models import EventPage
+from tests.factories import ArtistPageFactory, EventPageFactory
+
+
+def _walk(client, url):
+    """Segue ``meta.next`` fino all'ultima pagina; ritorna (id, risposte)."""
+    ids, pages = [], []
+    cursor = ""
+    while True:
+        data = client.get(f"{url}&cursor={cursor}").json()
+        pages.append(data)
+        ids += [item["id"] for item in data["items"]]
+        cursor = data["meta"]["next"]
+        if cursor is None:
+            return ids, pages
+
+
+@pytest.fixture
+def calendar(event_listing):
+    base = datetime.date(2099, 1, 1)
+    events = [
+        EventPageFactory(
+            parent=event_listing,
+            title=f"Data {idx}",
+            start_date=base + datetime.timedelta(days=idx // 2),
+        )
+        for idx in range(5)
+    ]
+    # Data mancante (colonna nullable): in fondo in entrambe le direzioni
+    undated = EventPageFactory(parent=event_listing, title="Senza data")
+    EventPage.objects.filter(pk=undated.pk).update(start_date=None)
+    undated.start_date = None
+    return events + [undated]
+
+
+@pytest.mark.django_db
+class TestCursorPagination:
+    def test_events_walk_in_start_date_order(self, calendar, settings):
+        settings.API_RESPONSE_CACHE = False
+        ids, pages = _walk(Client(), "/api/v2/events/?limit=2")
+
+        expected = sorted(calendar[:5], key=lambda e: (e.start_date, e.pk))
+        assert ids == [e.pk for e in expected] + [calendar[5].pk]
+        assert pages[0]["meta"]["total_count"] == 6
+        assert all("total_count" not in page["meta"] for page in pages[1:])
+
+    def test_events_descending_with_date_to(self, calendar, settings):
+        settings.API_RESPONSE_CACHE = False
+        ids, _pages = _walk(Client(), "/api/v2/events/?limit=2&date_to=2099-12-31")
+
+        expected = sorted(calendar[:5], key=lambda e: (e.start_date, e.pk), reverse=True)
+        assert ids == [e.pk for e in expected]
+
+    def test_publish_mid_scroll_has_no_duplicates(self, calendar, event_listing, settings):
+        settings.API_RESPONSE_CACHE = False
+        client = Client()
+        first = client.get("/api/v2/events/?limit=2&cursor=").json()
+
+        # Nuovo evento prima del cursore: con offset spostava tutto di una riga
+        EventPageFactory(parent=event_listing, title="Anticipato", start_date=datetime.date(2098, 1, 1))
+        second = client.get(f"/api/v2/events/?limit=2&cursor={first['meta']['next']}").json()
+
+        expected = sorted(calendar[:5], key=lambda e: (e.start_date, e.pk))
+        assert [item["id"] for item in first["items"] + second["items"]] == [e.pk for e in expected[:4]]
+
+    def test_deep_page_does_not_count(self, calendar, settings):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        settings.API_RESPONSE_CACHE = False
+        client = Client()
+        cursor = client.get("/api/v2/events/?limit=2&cursor=").json()["meta"]["next"]
+        with CaptureQueriesContext(connection) as queries:
+            client.get(f"/api/v2/events/?limit=2&cursor={cursor}")
+
+        assert not any("COUNT(" in query["sql"] for query in queries.captured_queries)
+
+    def test_artists_by_title_and_daily_rank(self, artist_listing, settings):
+        from django.utils import timezone
+
+        settings.API_RESPONSE_CACHE = False
+        for name in ["Delta", "Alfa", "Charlie", "Bravo", "Alfa"]:
+            ArtistPageFactory(parent=artist_listing, title=name, slug=None)
+        client = Client()
+
+        ids, _pages = _walk(client, "/api/v2/artists/?limit=2&fields=title")
+        items = client.get("/api/v2/artists/?fields=title").json()["items"]
+        assert ids == [pk for _title, pk in sorted((item["title"], item["id"]) for item in items)]
+
+        seed = timezone.localdate().isoformat()
+        ids, _pages = _walk(client, f"/api/v2/artists/?limit=2&daily_seed={seed}")
+        items = client.get(f"/api/v2/artists/?daily_seed={seed}").json()["items"]
+        assert ids == [item["id"] for item in items]
+
+    @pytest.mark.parametrize("query", ["cursor=non-valido", "cursor=&offset=2", "cursor=&order=title"])
+    def test_invalid_combinations_are_rejected(self, calendar, query):
+        response = Client().get(f"/api/v2/events/?{query}")
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize(
+        ("url", "values"),
+        [
+            ("/api/v2/events/", ["2099-01-01", "uno"]),
+            ("/api/v2/events/", [{"a": 1}, 1]),
+            ("/api/v2/events/", ["2099-01-01", None]),
+            ("/api/v2/artists/", ["Alfa", [1]]),
+        ],
+    )
+    def test_cursor_with_wrong_value_types_is_rejected(self, calendar, url, values):
+        from core.pagination import encode_cursor
+
+        response = Client().get(f"{url}?cursor={encode_cursor(values)}")
+        assert response.status_code == 400
+
+    def test_daily_cursor_from_other_rotation_mode_is_rejected(
+        self, artist_listing, settings, monkeypatch
+    ):
+        from django.utils import timezone
+
+        from artists import rotation
+
+        settings.API_RESPONSE_CACHE = False
+        for name in ["Alfa", "Bravo", "Charlie"]:
+            ArtistPageFactory(parent=artist_listing, title=name, slug=None)
+        client = Client()
+        url = f"/api/v2/artists/?limit=2&daily_seed={timezone.localdate().isoformat()}"
+        cursor = client.get(f"{url}&cursor=").json()["meta"]["next"]
+
+        # Rotazione non disponibile: la chiave diventa l'hash MD5
+        monkeypatch.setattr(rotation, "ensure_daily_rotation", lambda seed: False)
+        assert client.get(f"{url}&cursor={cursor}").status_code == 400
+        assert client.get(f"{url}&cursor=").status_code == 200
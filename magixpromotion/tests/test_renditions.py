@@ -0,0 +1,216 @@
+"""Test per la cache delle URL renditions (LRU di processo + cache condivisa)."""
+import pytest
+from django.core.cache import cache
+
+from core.renditions import (
+    API_IMAGE_SPEC,
+    API_THUMB_SPEC,
+    cached_rendition_urls,
+    clear_rendition_url_cache,
+    rendition_url,
+)
+
+
+@pytest.fixture
+def image(settings, tmp_path):
+    import wagtail_factories
+
+    settings.MEDIA_ROOT = str(tmp_path)
+    return wagtail_factories.ImageFactory()
+
+
+@pytest.mark.django_db
+class TestRenditionUrlCache:
+    def test_tiers(self, image, django_assert_num_queries):
+        pairs = [(image, API_IMAGE_SPEC), (image, API_THUMB_SPEC)]
+        urls = cached_rendition_urls(pairs)
+        assert all(urls.values())
+
+        # LRU del processo
+        with django_assert_num_queries(0):
+            assert cached_rendition_urls(pairs) == urls
+
+        # Cache condivisa
+        clear_rendition_url_cache()
+        with django_assert_num_queries(0):
+            assert cached_rendition_urls(pairs) == urls
+
+        # Tabella renditions: una query, nessuna generazione
+        clear_rendition_url_cache()
+        cache.clear()
+        with django_assert_num_queries(1):
+            assert cached_rendition_urls(pairs) == urls
+
+    def test_focal_point_change_gives_new_url(self, image):
+        before = rendition_url(image, API_IMAGE_SPEC)
+
+        image.focal_point_x = image.focal_point_y = 1
+        image.focal_point_width = image.focal_point_height = 1
+        image.save()
+
+        after = rendition_url(image, API_IMAGE_SPEC)
+        assert after and after != before
+
+    def test_deleted_rendition_is_forgotten(self, image):
+        rendition_url(image, API_IMAGE_SPEC)
+        image.renditions.all().delete()
+
+        # La URL in cache punterebbe a un file rimosso: la rendition si rigenera
+        assert rendition_url(image, API_IMAGE_SPEC)
+        assert image.renditions.count() == 1
+
+    def test_full_url_and_missing_image(self, image, settings):
+        settings.WAGTAILADMIN_BASE_URL = "https://magix.example"
+
+        assert rendition_url(image, API_THUMB_SPEC, full=True).startswith("https://magix.example/")
+        assert rendition_url(None, API_THUMB_SPEC) is None
+
+    def test_artist_rendition_sets_use_cache(self, artist, image, django_assert_num_queries):
+        artist.main_image = image
+        artist.save()
+        card = artist.card_image_renditions
+
+        with django_assert_num_queries(0):
+            assert artist.card_image_renditions == card
+        assert set(card) == {"thumbnail", "card", "card_2x", "og"}
+
+
+@pytest.mark.django_db
+class TestSingleFlightGeneration:
+    @pytest.fixture(autouse=True)
+    def short_wait(self, monkeypatch):
+        monkeypatch.setattr("core.renditions.RENDITION_LOCK_WAIT", 0.05)
+        monkeypatch.setattr("core.renditions.RENDITION_LOCK_POLL", 0.01)
+
+    def _lock(self, image, spec):
+        from core.renditions import rendition_url_cache_key
+
+        key = rendition_url_cache_key(image, spec)
+        cache.add(f"{key}:lock", "altro-worker", 30)
+        return key
+
+    def test_generates_once_and_releases_lock(self, image):
+        from core.renditions import get_rendition_lock_stats, rendition_url_cache_key
+
+        assert rendition_url(image, API_IMAGE_SPEC)
+
+        key = rendition_url_cache_key(image, API_IMAGE_SPEC)
+        assert cache.get(f"{key}:lock") is None
+        assert get_rendition_lock_stats()["generated"] == 1
+
+    def test_waiter_reads_url_published_by_lock_holder(self, image, monkeypatch):
+        key = self._lock(image, API_IMAGE_SPEC)
+        monkeypatch.setattr(
+            "core.renditions.time.sleep", lambda _: cache.set(key, "/media/pronta.webp")
+        )
+
+        assert rendition_url(image, API_IMAGE_SPEC) == "/media/pronta.webp"
+        assert image.renditions.count() == 0
+
+    def test_waiter_gets_lqip_placeholder_when_wait_expires(self, image):
+        from core.renditions import get_rendition_lock_stats, rendition_url_cache_key
+
+        thumb = rendition_url(image, API_THUMB_SPEC)
+        self._lock(image, API_IMAGE_SPEC)
+
+        assert rendition_url(image, API_IMAGE_SPEC) == thumb
+        assert not image.renditions.filter(filter_spec=API_IMAGE_SPEC).exists()
+        stats = get_rendition_lock_stats()
+        assert (stats["waits"], stats["placeholders"]) == (1, 1)
+        assert stats["wait_ms"] >= 50
+
+        # Il placeholder non resta in cache: a lock libero si genera
+        cache.delete(f"{rendition_url_cache_key(image, API_IMAGE_SPEC)}:lock")
+        assert rendition_url(image, API_IMAGE_SPEC) != thumb
+
+    def test_degraded_api_response_is_not_cached(self, artist, image):
+        from django.test import Client
+
+        artist.main_image = image
+        artist.save()
+        key = self._lock(image, API_IMAGE_SPEC)
+        client = Client()
+
+        degraded = client.get("/api/v2/artists/?fields=image_url")
+        assert degraded.status_code == 200
+        assert "no-store" in degraded["Cache-Control"]
+        assert "public" not in degraded["Cache-Control"]
+        assert not degraded.has_header("ETag") and not degraded.has_header("X-Cache")
+
+        cache.delete(f"{key}:lock")
+        response = client.get("/api/v2/artists/?fields=image_url")
+        assert response["X-Cache"] == "MISS" and response.has_header("ETag")
+        assert response.json()["items"][0]["image_url"] != degraded.json()["items"][0]["image_url"]
+
+    def test_degraded_listing_is_not_snapshotted(self, artist, image):
+        from artists.snapshot import (
+            SnapshotNotReady,
+            build_roster_snapshots,
+            snapshot_dir,
+        )
+
+        artist.main_image = image
+        artist.save()
+        self._lock(image, API_IMAGE_SPEC)
+
+        with pytest.raises(SnapshotNotReady):
+            build_roster_snapshots()
+        assert not list(snapshot_dir().glob("roster.*.json"))
+
+
+@pytest.mark.django_db
+class TestLQIPPlaceholders:
+    def test_compute_lqip_is_tiny_webp(self, image):
+        import base64
+        import io
+
+        from PIL import Image as PILImage
+
+        from core.renditions import LQIP_SIZE, compute_lqip
+
+        data_uri = compute_lqip(image)
+
+        assert data_uri.startswith("data:image/webp;base64,")
+        assert len(data_uri) < 1000
+        decoded = PILImage.open(io.BytesIO(base64.b64decode(data_uri.split(",", 1)[1])))
+        assert decoded.size == LQIP_SIZE
+
+    def test_thumb_url_until_computed_then_inline(self, image, django_capture_on_commit_callbacks):
+        from core.models import ImagePlaceholder
+        from core.renditions import placeholder_url
+
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            first = placeholder_url(image)
+            # Accodato una sola volta
+            placeholder_url(image)
+        clear_rendition_url_cache()
+
+        assert first.startswith("http") and first.endswith(".webp")
+        assert len(callbacks) == 1
+        assert placeholder_url(image) == ImagePlaceholder.objects.get(image=image).data_uri
+
+    def test_focal_point_change_invalidates_placeholder(self, image):
+        from core.renditions import lqip_placeholders, store_lqip
+
+        store_lqip(image)
+        assert image.id in lqip_placeholders([image])
+
+        image.focal_point_x = image.focal_point_y = 1
+        image.focal_point_width = image.focal_point_height = 1
+        image.save()
+
+        assert lqip_placeholders([image]) == {}
+
+    def test_api_returns_inline_placeholder(self, artist, image):
+        from django.test import Client
+
+        from core.renditions import store_lqip
+
+        artist.main_image = image
+        artist.save()
+        placeholder = store_lqip(image)
+
+        item = Client().get("/api/v2/artists/?profile=card").json()["items"][0]
+
+        assert item["image_thumb"] == placeholder.data_uri
+        assert item["image_url"].endswith(".webp")
@@ -0,0 +1,199 @@
+"""Test per la cache delle risposte API v2 con purge per surrogate key."""
+import datetime
+
+import pytest
+from django.test import Client
+
+from tests.factories import ArtistPageFactory, EventPageFactory
+
+
+@pytest.fixture
+def event(event_listing, artist, venue):
+    return EventPageFactory(
+        parent=event_listing,
+        title="Concerto in piazza",
+        related_artist=artist,
+        venue=venue,
+        start_date=datetime.date.today() + datetime.timedelta(days=10),
+    )
+
+
+def _publish(page, title, capture):
+    page.title = title
+    with capture(execute=True):
+        page.save_revision().publish()
+
+
+@pytest.mark.django_db
+class TestAPIResponseCache:
+    def test_second_anonymous_get_is_served_from_cache(self, artist, django_assert_num_queries):
+        client = Client()
+        first = client.get("/api/v2/artists/?limit=5&offset=0")
+        assert first["X-Cache"] == "MISS"
+        assert "roster" in first["Surrogate-Key"].split()
+        assert f"artist:{artist.translation_key}" in first["Surrogate-Key"].split()
+
+        with django_assert_num_queries(0):
+            # Query string in ordine diverso: stessa chiave
+            second = client.get("/api/v2/artists/?offset=0&limit=5")
+        assert second["X-Cache"] == "HIT"
+        assert second.content == first.content
+        assert "max-age=300" in second["Cache-Control"]
+
+    def test_locale_is_part_of_the_key(self, artist):
+        client = Client()
+        client.get("/api/v2/artists/")
+        response = client.get("/api/v2/artists/", HTTP_ACCEPT_LANGUAGE="en")
+        assert response["X-Cache"] == "MISS"
+
+    def test_authenticated_requests_bypass_cache(self, artist, django_user_model):
+        client = Client()
+        client.force_login(django_user_model.objects.create_user("editor", password="x"))
+        client.get("/api/v2/artists/")
+        response = client.get("/api/v2/artists/")
+        assert "X-Cache" not in response
+
+    def test_artist_publish_purges_roster_and_artist_events(
+        self, artist, event, django_capture_on_commit_callbacks
+    ):
+        client = Client()
+        client.get("/api/v2/artists/")
+        client.get(f"/api/v2/artists/{artist.pk}/")
+        client.get("/api/v2/events/")
+
+        _publish(artist, "Nuovo nome", django_capture_on_commit_callbacks)
+
+        listing = client.get("/api/v2/artists/")
+        assert listing["X-Cache"] == "MISS"
+        assert listing.json()["items"][0]["title"] == "Nuovo nome"
+        assert client.get(f"/api/v2/artists/{artist.pk}/")["X-Cache"] == "MISS"
+        # L'evento incorpora l'artista
+        assert client.get("/api/v2/events/")["X-Cache"] == "MISS"
+
+    def test_event_publish_keeps_unrelated_responses(
+        self, artist, artist_listing, event, django_capture_on_commit_callbacks
+    ):
+        other = ArtistPageFactory(parent=artist_listing, title="Altra band")
+        client = Client()
+        client.get("/api/v2/events/")
+        client.get(f"/api/v2/artists/{artist.pk}/")
+        client.get(f"/api/v2/artists/{other.pk}/")
+        client.get("/api/v2/artists/")
+
+        _publish(event, "Concerto spostato", django_capture_on_commit_callbacks)
+
+        assert client.get("/api/v2/events/")["X-Cache"] == "MISS"
+        assert client.get(f"/api/v2/artists/{artist.pk}/")["X-Cache"] == "MISS"
+        assert client.get(f"/api/v2/artists/{other.pk}/")["X-Cache"] == "HIT"
+
+    def test_archive_task_purges_calendar(self, event_listing, django_capture_on_commit_callbacks):
+        from booking.tasks import archive_past_events
+
+        EventPageFactory(
+            parent=event_listing,
+            title="Evento passato",
+            start_date=datetime.date.today() - datetime.timedelta(days=5),
+        )
+        client = Client()
+        client.get("/api/v2/events/")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            assert archive_past_events.apply().get()["archived"] == 1
+        assert client.get("/api/v2/events/")["X-Cache"] == "MISS"
+
+    def test_venue_change_purges_calendar_events_and_artist(
+        self, artist, event, venue, django_capture_on_commit_callbacks
+    ):
+        client = Client()
+        client.get("/api/v2/events/")
+        client.get(f"/api/v2/events/{event.pk}/")
+        client.get(f"/api/v2/artists/{artist.pk}/?fields=events")
+
+        venue.name = "Nuovo locale"
+        with django_capture_on_commit_callbacks(execute=True):
+            venue.save()
+
+        assert client.get("/api/v2/events/")["X-Cache"] == "MISS"
+        assert client.get(f"/api/v2/events/{event.pk}/")["X-Cache"] == "MISS"
+        detail = client.get(f"/api/v2/artists/{artist.pk}/?fields=events")
+        assert detail["X-Cache"] == "MISS"
+        assert detail.json()["events"][0]["venue"] == "Nuovo locale"
+
+    def test_genre_change_purges_artist_detail(
+        self, artist, artist_listing, genres, django_capture_on_commit_callbacks
+    ):
+        other = ArtistPageFactory(parent=artist_listing, title="Altra band")
+        client = Client()
+        client.get(f"/api/v2/artists/{artist.pk}/")
+        client.get(f"/api/v2/artists/{other.pk}/")
+
+        genres[0].name = "Dance anni 90"
+        with django_capture_on_commit_callbacks(execute=True):
+            genres[0].save()
+
+        detail = client.get(f"/api/v2/artists/{artist.pk}/")
+        assert detail["X-Cache"] == "MISS"
+        assert "Dance anni 90" in detail.json()["genre_display"]
+        assert client.get(f"/api/v2/artists/{other.pk}/")["X-Cache"] == "HIT"
+
+        with django_capture_on_commit_callbacks(execute=True):
+            genres[0].delete()
+        assert client.get(f"/api/v2/artists/{artist.pk}/")["X-Cache"] == "MISS"
+
+    def test_epk_change_purges_artist(self, artist, django_capture_on_commit_callbacks):
+        from core.models import EPKPackage
+
+        client = Client()
+        client.get(f"/api/v2/artists/{artist.pk}/?fields=epk")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            EPKPackage.objects.create(artist=artist, title="Press kit 2026", is_public=True)
+
+        detail = client.get(f"/api/v2/artists/{artist.pk}/?fields=epk")
+        assert detail["X-Cache"] == "MISS"
+        assert detail.json()["epk"]["title"] == "Press kit 2026"
+
+    def test_image_change_purges_artists_and_events_using_it(
+        self, artist, event, settings, tmp_path, django_capture_on_commit_callbacks
+    ):
+        import wagtail_factories
+
+        settings.MEDIA_ROOT = str(tmp_path)
+        image = wagtail_factories.ImageFactory()
+        artist.main_image = image
+        artist.save()
+        event.featured_image = image
+        event.save()
+        client = Client()
+        client.get(f"/api/v2/artists/{artist.pk}/")
+        client.get(f"/api/v2/events/{event.pk}/")
+
+        image.focal_point_x = image.focal_point_y = 1
+        image.focal_point_width = image.focal_point_height = 1
+        with django_capture_on_commit_callbacks(execute=True):
+            image.save()
+
+        assert client.get(f"/api/v2/artists/{artist.pk}/")["X-Cache"] == "MISS"
+        assert client.get(f"/api/v2/events/{event.pk}/")["X-Cache"] == "MISS"
+
+        with django_capture_on_commit_callbacks(execute=True):
+            image.delete()
+        detail = client.get(f"/api/v2/artists/{artist.pk}/")
+        assert detail["X-Cache"] == "MISS"
+        assert detail.json()["image_url"] is None
+
+    def test_hit_revalidates_against_current_versions(self, artist):
+        from core import conditional
+
+        client = Client()
+        first = client.get(f"/api/v2/artists/{artist.pk}/")
+        assert client.get(
+            f"/api/v2/artists/{artist.pk}/", HTTP_IF_NONE_MATCH=first["ETag"]
+        ).status_code == 304
+
+        # Versione cambiata senza purge della surrogate key
+        conditional.touch_content_versions([conditional.VENUES])
+        response = client.get(f"/api/v2/artists/{artist.pk}/", HTTP_IF_NONE_MATCH=first["ETag"])
+        assert response.status_code == 200
+        assert response["X-Cache"] == "HIT"
+        assert response["ETag"] != first["ETag"]
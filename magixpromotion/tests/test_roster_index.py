@@ -0,0 +1,109 @@
+"""Test per l'indice bitmap in memoria dei filtri roster."""
+import pytest
+from django.test import Client
+
+from artists import roster_index
+from artists.roster_index import RosterIndex, get_roster_index, invalidate_roster_index
+from tests.factories import ArtistPageFactory, TargetEventFactory
+
+
+def _row(**values):
+    row = {facet: set() for facet in roster_index.INDEX_FIELDS}
+    for facet, value in values.items():
+        row[facet] = set(value) if isinstance(value, (list, set)) else {value}
+    return row
+
+
+class TestRosterIndex:
+    @pytest.fixture
+    def index(self):
+        index = RosterIndex()
+        index.add(10, _row(artist_type="show_band", genre=["rock", "dance"], region="Lombardia"))
+        index.add(11, _row(artist_type="tribute", genre=["rock"], region="Piemonte"))
+        index.add(12, _row(artist_type="tribute", genre=["jazz"], region="Lombardia", country="CH"))
+        return index
+
+    def test_multi_select_any_and_all(self, index):
+        assert index.filter_ids(genres=["dance", "jazz"]) == [10, 12]
+        assert index.filter_ids(genres=["rock", "dance"], match_all=True) == [10]
+        assert index.filter_ids(genres=["rock"], artist_type="tribute") == [11]
+
+    def test_region_is_case_insensitive_substring(self, index):
+        assert index.filter_ids(region="lomb") == [10, 12]
+        assert index.filter_ids(region="lomb", country="CH") == [12]
+
+    def test_remove_frees_the_slot(self, index):
+        index.remove(10)
+        assert index.filter_ids(genres=["rock"]) == [11]
+        assert len(index) == 2
+
+
+@pytest.mark.django_db
+class TestRosterIndexRefresh:
+    def test_publish_updates_only_changed_artist(
+        self, artist_listing, genres, monkeypatch, django_capture_on_commit_callbacks
+    ):
+        artist = ArtistPageFactory(parent=artist_listing, artist_type="show_band")
+        get_roster_index()
+
+        builds = []
+        monkeypatch.setattr(
+            roster_index, "build_roster_index", lambda: builds.append(1) or RosterIndex()
+        )
+        artist.genres.set([genres[3]])
+        with django_capture_on_commit_callbacks(execute=True):
+            artist.save_revision().publish()
+
+        assert get_roster_index().filter_ids(genres=["rock-band"]) == [artist.pk]
+        assert builds == []
+
+        with django_capture_on_commit_callbacks(execute=True):
+            artist.unpublish()
+        assert get_roster_index().filter_ids(artist_type="show_band") == []
+        assert builds == []
+
+    def test_missing_change_forces_full_rebuild(self, artist_listing, monkeypatch):
+        get_roster_index()
+        builds = []
+        monkeypatch.setattr(
+            roster_index, "build_roster_index", lambda: builds.append(1) or RosterIndex()
+        )
+
+        invalidate_roster_index()
+        get_roster_index()
+        assert builds == [1]
+
+
+@pytest.mark.django_db
+class TestRosterFilters:
+    @pytest.fixture
+    def roster(self, artist_listing, genres):
+        matrimoni = TargetEventFactory(name="Matrimoni")
+        rock = ArtistPageFactory(parent=artist_listing, title="Rock", base_region="Lombardia")
+        rock.genres.set([genres[3]])
+        both = ArtistPageFactory(parent=artist_listing, title="Both", base_region="Piemonte")
+        both.genres.set([genres[0], genres[3]])
+        both.target_events.set([matrimoni])
+        dance = ArtistPageFactory(parent=artist_listing, title="Dance", base_region="Lombardia")
+        dance.genres.set([genres[0]])
+        for artist in (rock, both, dance):
+            artist.save()  # ParentalManyToMany: salvate con la pagina
+        return rock, both, dance
+
+    def test_api_multi_select(self, roster):
+        rock, both, dance = roster
+        client = Client()
+
+        def ids(query):
+            items = client.get(f"/api/v2/artists/?fields=_,id&{query}").json()["items"]
+            return {item["id"] for item in items}
+
+        assert ids("genre=rock-band,dance-show-band") == {rock.pk, both.pk, dance.pk}
+        assert ids("genre=rock-band,dance-show-band&match=all") == {both.pk}
+        assert ids("genre=dance-show-band&region=lomb") == {dance.pk}
+        assert ids("target_event=matrimoni") == {both.pk}
+
+    def test_listing_page_filters(self, roster):
+        rock, both, _dance = roster
+        response = Client().get(f"{rock.get_parent().url}?genre=dance-show-band&region=piem")
+        assert [artist.pk for artist in response.context["artists"]] == [both.pk]
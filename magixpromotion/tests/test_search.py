@@ -0,0 +1,446 @@
+"""Test per il motore di ricerca (indice fuzzy, fallback, suggerimenti)."""
+from difflib import SequenceMatcher
+
+import pytest
+from django.test import Client, override_settings
+
+from core.search import _normalize_search_text
+from core.search_index import FUZZY_THRESHOLD, FuzzyIndex
+from tests.factories import ArtistPageFactory
+
+DOCUMENTS = {
+    1: ("Queen Forever", "Queen tribute band da Milano", "Queen", "Tributo Internazionale"),
+    2: ("Vasco Live Kom", "Il tributo a Vasco Rossi", "Vasco Rossi", "Tributo Italiano"),
+    3: ("Red Moon", "Dance show band per matrimoni", "", "Dance Show Band"),
+    4: ("Fiesta Latina", "Musica latina e balli di gruppo", "", "Dance Show Band"),
+}
+
+
+def _brute_force_score(query, values):
+    """Score di riferimento: scansione completa con SequenceMatcher."""
+    best = 0.0
+    for value in values:
+        if not value:
+            continue
+        if query in value:
+            return 1.0
+        best = max(best, SequenceMatcher(None, query, value).ratio())
+        for token in value.split():
+            best = max(best, SequenceMatcher(None, query, token).ratio())
+    return best
+
+
+@pytest.fixture
+def fuzzy_index():
+    index = FuzzyIndex()
+    for doc_id, values in DOCUMENTS.items():
+        index.add(doc_id, values[0].lower(), [_normalize_search_text(v) for v in values])
+    return index
+
+
+class TestFuzzyIndex:
+    @pytest.mark.parametrize(
+        "query",
+        ["qeen", "vasko", "matrimonio", "red mon", "latinna", "tributo", "fiesta latin", "zzzz"],
+    )
+    def test_scores_match_full_scan(self, fuzzy_index, query):
+        normalized = _normalize_search_text(query)
+        expected = {}
+        for doc_id, values in DOCUMENTS.items():
+            score = _brute_force_score(normalized, [_normalize_search_text(v) for v in values])
+            if score >= FUZZY_THRESHOLD:
+                expected[doc_id] = score
+
+        assert fuzzy_index.scores(normalized) == pytest.approx(expected)
+
+    def test_search_orders_by_score_then_title(self, fuzzy_index):
+        assert fuzzy_index.search("tributo", 10) == [1, 2]
+        assert fuzzy_index.search("tributo", 1) == [1]
+
+    def test_short_query_returns_nothing(self, fuzzy_index):
+        assert fuzzy_index.search("qe", 10) == []
+
+    def test_suggest(self, fuzzy_index):
+        assert fuzzy_index.suggest("qeen") == "queen"
+        assert fuzzy_index.suggest("zzzz") is None
+
+
+@pytest.mark.django_db
+class TestFuzzySearchAPI:
+    def test_typo_returns_did_you_mean(self, artist_listing, genres):
+        ArtistPageFactory(
+            parent=artist_listing,
+            title="Queen Forever",
+            short_bio="Queen tribute band",
+            artist_type="tribute",
+        )
+
+        data = Client().get("/api/v2/search/?q=qeen&type=artists").json()
+
+        assert [item["title"] for item in data["results"]] == ["Queen Forever"]
+        assert data["did_you_mean"] == "queen"
+
+    def test_exact_match_has_no_suggestion(self, artist):
+        data = Client().get("/api/v2/search/?q=Red&type=artists").json()
+
+        assert data["total"] == 1
+        assert "did_you_mean" not in data
+
+    def test_index_rebuilt_after_publish(self, artist_listing, django_capture_on_commit_callbacks):
+        client = Client()
+        assert client.get("/api/v2/search/autocomplete/?q=qeen").json()["suggestions"] == []
+
+        page = ArtistPageFactory(parent=artist_listing, title="Queen Forever", live=False)
+        with django_capture_on_commit_callbacks(execute=True):
+            page.save_revision().publish()
+
+        data = client.get("/api/v2/search/autocomplete/?q=qeen").json()
+        assert [item["name"] for item in data["suggestions"]] == ["Queen Forever"]
+
+    @override_settings(SEARCH_FUZZY_BACKEND="trigram")
+    def test_trigram_backend_falls_back_to_python_outside_postgres(self, artist_listing):
+        ArtistPageFactory(parent=artist_listing, title="Queen Forever")
+
+        data = Client().get("/api/v2/search/?q=qeen&type=artists").json()
+
+        assert [item["title"] for item in data["results"]] == ["Queen Forever"]
+
+
+@pytest.mark.django_db
+class TestSearchPagination:
+    def _create_artists(self, artist_listing, count):
+        return [
+            ArtistPageFactory(
+                parent=artist_listing,
+                title=f"Red Artist {idx}",
+                short_bio="Red artist bio",
+            )
+            for idx in range(count)
+        ]
+
+    @pytest.mark.parametrize("limit", ["0", "-5"])
+    def test_non_positive_limit_still_advances(self, artist, artist_listing, limit):
+        ArtistPageFactory(parent=artist_listing, title="Red Sun")
+        client = Client()
+
+        data = client.get(f"/api/v2/search/?q=Red&type=artists&limit={limit}").json()
+        assert len(data["results"]) == 1
+        second = client.get(
+            f"/api/v2/search/?q=Red&type=artists&limit={limit}&cursor={data['next_cursor']}"
+        ).json()
+        assert second["next_cursor"] is None
+        assert second["results"] != data["results"]
+
+        data = client.get(f"/api/v2/search/autocomplete/?q=Red&limit={limit}").json()
+        assert len(data["suggestions"]) == 1
+
+    @pytest.mark.parametrize("endpoint", ["", "autocomplete/"])
+    def test_non_numeric_limit_is_rejected(self, endpoint):
+        response = Client().get(f"/api/v2/search/{endpoint}?q=Red&limit=tanti")
+        assert response.status_code == 400
+
+    def test_cursor_walks_all_results_once(self, artist_listing):
+        self._create_artists(artist_listing, 5)
+        client = Client()
+
+        first = client.get("/api/v2/search/?q=Red&type=artists&limit=2").json()
+        assert first["total"] == 2
+        assert first["next_cursor"]
+
+        seen = [item["id"] for item in first["results"]]
+        cursor = first["next_cursor"]
+        while cursor:
+            data = client.get(
+                f"/api/v2/search/?q=Red&type=artists&limit=2&cursor={cursor}"
+            ).json()
+            seen += [item["id"] for item in data["results"]]
+            cursor = data["next_cursor"]
+
+        assert len(seen) == 5
+        assert len(set(seen)) == 5
+
+    def test_cursor_pages_do_not_rerun_ranking(self, artist_listing, monkeypatch):
+        from core import search
+
+        self._create_artists(artist_listing, 3)
+        client = Client()
+        first = client.get("/api/v2/search/?q=Red&type=artists&limit=2").json()
+
+        def _fail(*args, **kwargs):
+            raise AssertionError("ranking ricalcolato")
+
+        monkeypatch.setattr(search, "_rank_artists", _fail)
+        second = client.get(
+            f"/api/v2/search/?q=Red&type=artists&limit=2&cursor={first['next_cursor']}"
+        ).json()
+
+        assert second["total"] == 1
+        assert second["next_cursor"] is None
+
+    def test_invalid_cursor(self, artist):
+        response = Client().get("/api/v2/search/?q=Red&cursor=not-a-cursor")
+        assert response.status_code == 400
+
+    def test_cursor_for_other_query_is_rejected(self, artist_listing):
+        self._create_artists(artist_listing, 3)
+        client = Client()
+        first = client.get("/api/v2/search/?q=Red&type=artists&limit=2").json()
+
+        response = client.get(
+            f"/api/v2/search/?q=Blue&type=artists&limit=2&cursor={first['next_cursor']}"
+        )
+        assert response.status_code == 400
+
+    def test_unknown_locale_returns_no_results(self, artist):
+        data = Client().get("/api/v2/search/?q=Red&type=artists&locale=de").json()
+        assert data["results"] == []
+
+
+@pytest.mark.django_db
+class TestSearchResultsCache:
+    def test_identical_query_is_served_from_cache(self, artist):
+        from core.search import get_search_cache_stats
+
+        client = Client()
+        first = client.get("/api/v2/search/?q=Red&type=artists")
+        second = client.get("/api/v2/search/?q=red&type=artists")
+
+        assert first["X-Search-Cache"] == "MISS"
+        assert second["X-Search-Cache"] == "HIT"
+        assert second.json()["query"] == "red"
+        assert second.json()["results"] == first.json()["results"]
+        assert get_search_cache_stats()["hits"] == 1
+        assert get_search_cache_stats()["misses"] == 1
+
+    def test_publish_invalidates_cached_results(
+        self, artist, artist_listing, django_capture_on_commit_callbacks
+    ):
+        client = Client()
+        assert client.get("/api/v2/search/?q=Red&type=artists").json()["total"] == 1
+
+        page = ArtistPageFactory(parent=artist_listing, title="Red Sun", live=False)
+        with django_capture_on_commit_callbacks(execute=True):
+            page.save_revision().publish()
+
+        response = client.get("/api/v2/search/?q=Red&type=artists")
+        assert response["X-Search-Cache"] == "MISS"
+        assert response.json()["total"] == 2
+
+    def test_generation_bumped_only_after_commit(
+        self, artist_listing, django_capture_on_commit_callbacks
+    ):
+        from core.cache import get_cache_generation
+        from core.search_index import SEARCH_GENERATION
+
+        before = get_cache_generation(SEARCH_GENERATION)
+        page = ArtistPageFactory(parent=artist_listing, title="Red Sun", live=False)
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            page.save_revision().publish()
+            # Dentro la transazione: vocabolario e risultati restano sulla generazione vecchia
+            assert get_cache_generation(SEARCH_GENERATION) == before
+
+        assert callbacks
+        assert get_cache_generation(SEARCH_GENERATION) != before
+
+    def test_archiving_invalidates_cached_results(self, event_listing, venue):
+        import datetime
+
+        from booking.tasks import archive_past_events
+        from tests.factories import EventPageFactory
+
+        EventPageFactory(
+            parent=event_listing,
+            title="Red Night",
+            venue=venue,
+            start_date=datetime.date(2020, 1, 1),
+        )
+        client = Client()
+        assert client.get("/api/v2/search/?q=Red&type=events").json()["total"] == 1
+
+        archive_past_events()
+
+        assert client.get("/api/v2/search/?q=Red&type=events").json()["total"] == 0
+
+    def test_autocomplete_is_cached(self, artist):
+        client = Client()
+        client.get("/api/v2/search/autocomplete/?q=Red")
+        response = client.get("/api/v2/search/autocomplete/?q=Red")
+
+        assert response["X-Search-Cache"] == "HIT"
+        assert response.json()["suggestions"][0]["name"] == "Red Moon"
+
+
+@pytest.mark.django_db
+class TestSearchTrace:
+    def test_server_timing_reports_answering_stage(self, artist_listing, caplog):
+        import json
+
+        ArtistPageFactory(parent=artist_listing, title="Queen Forever")
+
+        with caplog.at_level("INFO", logger="core.search"):
+            response = Client().get("/api/v2/search/?q=qeen&type=artists")
+
+        timing = response["Server-Timing"]
+        assert "artists.fulltext;dur=" in timing
+        assert "artists.fuzzy;dur=" in timing
+        assert 'desc="1 cand' in timing
+        assert "total;dur=" in timing
+
+        record = next(r for r in caplog.records if r.getMessage().startswith("search_trace "))
+        trace = json.loads(record.getMessage().split(" ", 1)[1])
+        assert trace["answered_by"] == {"artists": "fuzzy"}
+        assert trace["queries"] > 0
+        assert [stage["stage"] for stage in trace["stages"]][:4] == [
+            "cache",
+            "artists.fulltext",
+            "artists.icontains",
+            "artists.fuzzy",
+        ]
+
+    def test_cache_hit_is_traced(self, artist):
+        client = Client()
+        client.get("/api/v2/search/autocomplete/?q=Red")
+        response = client.get("/api/v2/search/autocomplete/?q=Red")
+
+        assert response["Server-Timing"].startswith('cache;dur=')
+
+
+@pytest.mark.django_db
+class TestLeanSerialization:
+    def test_artist_payload_matches_instance_serializer(self, artist_listing, genres, settings, tmp_path):
+        import wagtail_factories
+
+        from artists.models import ArtistPage
+        from core.search import _serialize_artist_result, _serialize_artist_results
+        from tests.factories import TargetEventFactory
+
+        settings.MEDIA_ROOT = str(tmp_path)
+        page = ArtistPageFactory(
+            parent=artist_listing,
+            title="Queen Forever",
+            tribute_to="Queen",
+            base_region="Piemonte",
+            main_image=wagtail_factories.ImageFactory(),
+        )
+        page.genres.add(genres[2], genres[0])
+        page.target_events.add(TargetEventFactory(name="Matrimoni"), TargetEventFactory(name="Feste"))
+        page.save()
+        bare = ArtistPageFactory(parent=artist_listing, title="Senza Immagine")
+
+        expected = [
+            _serialize_artist_result(
+                ArtistPage.objects.prefetch_related("genres", "target_events").get(pk=pk)
+            )
+            for pk in (page.pk, bare.pk)
+        ]
+
+        assert _serialize_artist_results([page.pk, bare.pk]) == expected
+
+    def test_artist_serialization_query_count(self, artist_listing, genres, django_assert_max_num_queries):
+        from core.search import _serialize_artist_results
+
+        ids = []
+        for idx in range(10):
+            page = ArtistPageFactory(parent=artist_listing, title=f"Band {idx}")
+            page.genres.add(genres[idx % len(genres)])
+            ids.append(page.pk)
+
+        # colonne + generi/target event (UNION); nessuna immagine da caricare
+        with django_assert_max_num_queries(2):
+            assert len(_serialize_artist_results(ids)) == 10
+
+
+@pytest.mark.django_db
+class TestUnifiedAutocomplete:
+    def test_merges_artists_events_venues_and_cities(self, artist, event_listing):
+        from tests.factories import EventPageFactory, VenueFactory
+
+        venue = VenueFactory(name="Red Lion Pub", city="Redondesco")
+        EventPageFactory(parent=event_listing, title="Red Moon Live", venue=venue)
+
+        data = Client().get("/api/v2/search/autocomplete/?q=Red&limit=10").json()
+
+        assert [(item["type"], item["name"]) for item in data["suggestions"]] == [
+            ("artist", "Red Moon"),
+            ("event", "Red Moon Live"),
+            ("venue", "Red Lion Pub"),
+            ("city", "Redondesco"),
+        ]
+        event = data["suggestions"][1]
+        assert event["slug"] == "red-moon-live"
+        assert event["city"] == "Redondesco"
+
+    def test_prefix_matches_rank_before_partial_matches(self, artist_listing):
+        from tests.factories import VenueFactory
+
+        ArtistPageFactory(parent=artist_listing, title="Il Lido Band")
+        VenueFactory(name="Lido di Camaiore", city="Camaiore")
+
+        data = Client().get("/api/v2/search/autocomplete/?q=lido").json()
+
+        assert [item["name"] for item in data["suggestions"]][:2] == [
+            "Lido di Camaiore",
+            "Il Lido Band",
+        ]
+
+    def test_limit_caps_merged_list_and_types_filter(self, artist, venue):
+        client = Client()
+
+        data = client.get("/api/v2/search/autocomplete/?q=Red&limit=1").json()
+        assert len(data["suggestions"]) == 1
+
+        data = client.get("/api/v2/search/autocomplete/?q=Term&types=city").json()
+        assert data["suggestions"] == [
+            {"type": "city", "id": None, "name": "Termenate", "slug": "", "city": "Termenate"}
+        ]
+
+    @override_settings(SEARCH_AUTOCOMPLETE_BUDGET_MS=0)
+    def test_exhausted_budget_returns_partial_uncached_response(self, artist):
+        client = Client()
+
+        response = client.get("/api/v2/search/autocomplete/?q=Red")
+        assert response.json()["partial"] is True
+        # la prima sorgente (artisti) gira comunque
+        assert response.json()["suggestions"][0]["name"] == "Red Moon"
+
+        response = client.get("/api/v2/search/autocomplete/?q=Red")
+        assert response["X-Search-Cache"] == "MISS"
+
+
+class TestAutocompleteWorkerPool:
+    def test_timeout_cancels_queued_sources_and_closes_connections(self, monkeypatch, settings):
+        import threading
+        from types import SimpleNamespace
+
+        from core import search
+
+        settings.SEARCH_AUTOCOMPLETE_WORKERS = 1
+        settings.SEARCH_AUTOCOMPLETE_BUDGET_MS = 50
+        monkeypatch.setattr(search, "connection", SimpleNamespace(vendor="postgresql"))
+        monkeypatch.setattr(search, "_executor", None)
+        closed = []
+        monkeypatch.setattr(
+            search, "close_old_connections", lambda: closed.append(threading.current_thread().name)
+        )
+
+        release = threading.Event()
+        ran = []
+
+        def slow():
+            release.wait(5)
+            return ["lenta"]
+
+        try:
+            results, partial = search._run_autocomplete_sources(
+                [lambda: ["veloce"], slow, lambda: ran.append("accodata") or ["accodata"]]
+            )
+        finally:
+            release.set()
+            search._executor.shutdown(wait=True)
+
+        assert (results, partial) == ([["veloce"], [], []], True)
+        # Accodata dietro la sorgente lenta: annullata, non gira dopo la risposta
+        assert ran == []
+        # Apertura e chiusura per ciascuna delle due sorgenti eseguite, nel pool
+        assert len(closed) == 4
+        assert all(name.startswith("autocomplete") for name in closed)
@@ -0,0 +1,84 @@
+"""Test per lo snapshot statico del roster (JSON + varianti compresse)."""
+import gzip
+import hashlib
+import json
+
+import pytest
+from django.test import Client
+
+from artists import snapshot
+from artists.snapshot import build_roster_snapshots
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+def _read(media_root, entry):
+    return (media_root / entry["url"].removeprefix("/media/")).read_bytes()
+
+
+@pytest.mark.django_db
+class TestRosterSnapshot:
+    def test_writes_hashed_json_with_compressed_variants(self, artist, media_root):
+        manifest = build_roster_snapshots()
+        entry = manifest["locales"]["it"]
+
+        data = _read(media_root, entry)
+        assert hashlib.sha256(data).hexdigest()[:16] == entry["hash"]
+        assert entry["url"].endswith(f"roster.it.{entry['hash']}.json")
+
+        payload = json.loads(data)
+        assert payload["meta"]["total_count"] == entry["count"] == 1
+        item = payload["items"][0]
+        assert item["title"] == "Red Moon"
+        # Campi della card, niente eventi/EPK/body
+        assert {"image_thumb", "genre_display", "tags"} <= set(item)
+        assert not {"events", "epk", "body_html"} & set(item)
+
+        path = media_root / "roster" / f"roster.it.{entry['hash']}.json"
+        assert gzip.decompress((media_root / f"{path}.gz").read_bytes()) == data
+        if snapshot.brotli is not None:
+            assert snapshot.brotli.decompress(path.with_name(path.name + ".br").read_bytes()) == data
+
+    def test_unchanged_roster_keeps_hash(self, artist, media_root):
+        first = build_roster_snapshots()["locales"]["it"]["hash"]
+        assert build_roster_snapshots()["locales"]["it"]["hash"] == first
+        assert len(list((media_root / "roster").glob("roster.it.*.json"))) == 1
+
+    def test_publish_rebuilds_and_prunes_old_versions(
+        self, artist, media_root, settings, django_capture_on_commit_callbacks
+    ):
+        settings.ROSTER_SNAPSHOT = True
+        hashes = [build_roster_snapshots()["locales"]["it"]["hash"]]
+        for idx in range(snapshot.ROSTER_SNAPSHOT_KEEP + 1):
+            artist.title = f"Red Moon {idx}"
+            with django_capture_on_commit_callbacks(execute=True):
+                artist.save_revision().publish()
+            hashes.append(snapshot.get_roster_manifest()["locales"]["it"]["hash"])
+
+        assert len(set(hashes)) == len(hashes)
+        kept = {path.name.split(".")[2] for path in (media_root / "roster").glob("roster.it.*.json")}
+        assert kept == set(hashes[-snapshot.ROSTER_SNAPSHOT_KEEP:])
+
+    def test_manifest_endpoint(self, artist, media_root):
+        client = Client()
+        assert client.get("/api/v2/roster/").json()["locales"] == {}
+
+        manifest = build_roster_snapshots()
+        response = client.get("/api/v2/roster/")
+        assert response.status_code == 200
+        assert response.json()["locales"]["it"]["url"] == manifest["locales"]["it"]["url"]
+        assert "max-age=60" in response["Cache-Control"]
+
+        cached = client.get("/api/v2/roster/", HTTP_IF_NONE_MATCH=response["ETag"])
+        assert cached.status_code == 304
+
+    def test_manifest_survives_cache_flush(self, artist, media_root):
+        from django.core.cache import cache
+
+        manifest = build_roster_snapshots()
+        cache.clear()
+        assert snapshot.get_roster_manifest() == manifest
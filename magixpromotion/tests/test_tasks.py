@@ -106,3 +106,166 @@ class TestArchiveTask:
         yesterday_event.refresh_from_db()
         # start_date (Jul 14) is NOT < yesterday (Jul 14), so not archived
         assert yesterday_event.is_archived is False
+
+
+@pytest.mark.django_db
+class TestArtistBodyHTML:
+    def _publish(self, page, heading):
+        page.body = [("heading", {"text": heading, "level": "h2"})]
+        revision = page.save_revision()
+        revision.publish()
+        page.refresh_from_db()
+        return revision
+
+    def test_publish_renders_body_for_revision(self, artist, django_capture_on_commit_callbacks):
+        from artists.models import ArtistRenderedBody
+
+        with django_capture_on_commit_callbacks(execute=True):
+            revision = self._publish(artist, "Chi siamo")
+
+        rendered = ArtistRenderedBody.objects.get(page=artist)
+        assert rendered.revision_id == revision.pk
+        assert rendered.html == "<h2>Chi siamo</h2>"
+
+    def test_api_serves_stored_html_only_for_live_revision(
+        self, artist, django_capture_on_commit_callbacks
+    ):
+        from django.test import Client
+
+        from artists.models import ArtistRenderedBody
+
+        with django_capture_on_commit_callbacks(execute=True):
+            self._publish(artist, "Chi siamo")
+        ArtistRenderedBody.objects.filter(page=artist).update(html="<p>salvato</p>")
+
+        client = Client()
+        data = client.get(f"/api/v2/artists/{artist.pk}/").json()
+        assert data["body_html"] == "<p>salvato</p>"
+
+        # Nuova revisione pubblicata, task non ancora eseguito: rendering al volo
+        self._publish(artist, "Storia")
+        data = client.get("/api/v2/artists/?fields=_,id,body_html").json()
+        assert data["items"][0]["body_html"] == "<h2>Storia</h2>"
+
+    def test_task_skips_superseded_revision(self, artist):
+        from artists.models import ArtistRenderedBody
+        from artists.tasks import render_artist_body_html
+
+        old = self._publish(artist, "Prima")
+        self._publish(artist, "Dopo")
+
+        result = render_artist_body_html(artist.pk, old.pk)
+
+        assert result["rendered"] is False
+        assert not ArtistRenderedBody.objects.exists()
+
+    def test_backfill_command(self, artist, artist_listing):
+        from django.core.management import call_command
+
+        from artists.models import ArtistRenderedBody
+        from tests.factories import ArtistPageFactory
+
+        self._publish(artist, "Chi siamo")
+        ArtistPageFactory(parent=artist_listing, title="Mai pubblicata con revisione")
+
+        call_command("backfill_body_html")
+        call_command("backfill_body_html")
+
+        rendered = ArtistRenderedBody.objects.get()
+        assert rendered.page_id == artist.pk
+        assert rendered.revision_id == artist.live_revision_id
+
+
+@pytest.mark.django_db
+class TestRenditionWarmup:
+    @pytest.fixture(autouse=True)
+    def media_root(self, settings, tmp_path):
+        settings.MEDIA_ROOT = str(tmp_path)
+
+    def test_specs_follow_image_usage(self, artist):
+        import wagtail_factories
+
+        from core.renditions import RENDITION_SPECS, image_rendition_specs
+
+        main = wagtail_factories.ImageFactory()
+        unused = wagtail_factories.ImageFactory()
+        artist.main_image = main
+        artist.save()
+
+        specs = image_rendition_specs([main.pk, unused.pk, None])
+
+        assert specs[main.pk] == RENDITION_SPECS["artist_main_image"]
+        assert "fill-2400x3200|format-webp" in specs[main.pk]
+        assert specs[unused.pk] == RENDITION_SPECS["upload"]
+
+    def test_publish_generates_renditions_and_reports_progress(
+        self, artist, django_capture_on_commit_callbacks
+    ):
+        import wagtail_factories
+
+        from core.renditions import RENDITION_SPECS, warmup_jobs
+        from core.wagtail_hooks import RenditionWarmupPanel
+
+        artist.main_image = wagtail_factories.ImageFactory()
+        artist.save()
+        with django_capture_on_commit_callbacks(execute=True):
+            artist.save_revision().publish()
+
+        specs = set(RENDITION_SPECS["artist_main_image"])
+        assert specs <= set(artist.main_image.renditions.values_list("filter_spec", flat=True))
+        job = warmup_jobs()[0]
+        assert job["label"] == f"Pagina: {artist.title}"
+        assert (job["done"], job["total"], job["finished"]) == (len(specs), len(specs), True)
+        assert "Completato" in RenditionWarmupPanel().render_html({})
+
+    def test_warmup_fills_url_cache_and_respects_lock(self):
+        import wagtail_factories
+        from django.core.cache import cache
+
+        from core.renditions import (
+            API_IMAGE_SPEC,
+            API_THUMB_SPEC,
+            rendition_url_cache_key,
+        )
+        from core.tasks import generate_image_renditions
+
+        image = wagtail_factories.ImageFactory()
+        image.renditions.all().delete()
+        cache.clear()
+        locked = rendition_url_cache_key(image, API_IMAGE_SPEC)
+        cache.add(f"{locked}:lock", "richiesta-api", 30)
+
+        generate_image_renditions("job", image.pk, [API_IMAGE_SPEC, API_THUMB_SPEC])
+
+        # La rendition col lock la genera chi lo tiene; l'altra e' pronta in cache
+        assert cache.get(rendition_url_cache_key(image, API_THUMB_SPEC))
+        assert list(image.renditions.values_list("filter_spec", flat=True)) == [API_THUMB_SPEC]
+
+    def test_image_save_warms_only_on_source_changes(self, django_capture_on_commit_callbacks):
+        import wagtail_factories
+
+        from core.renditions import warmup_jobs
+
+        with django_capture_on_commit_callbacks(execute=True):
+            image = wagtail_factories.ImageFactory(title="Promo")
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            image.save(update_fields=["title"])
+
+        assert callbacks == []
+        assert [job["label"] for job in warmup_jobs()] == ["Immagine: Promo"]
+        assert image.renditions.count() == 2
+
+
+@pytest.mark.django_db
+class TestDailyRotationTask:
+    @freeze_time("2026-02-19")
+    def test_builds_today_and_prunes_old_seeds(self, artist, django_capture_on_commit_callbacks):
+        from artists.models import ArtistDailyRank
+        from artists.tasks import build_daily_rotation
+
+        ArtistDailyRank.objects.create(seed="2026-02-10", page=artist, rank=0)
+        with django_capture_on_commit_callbacks(execute=True):
+            result = build_daily_rotation()
+
+        assert result == {"seed": "2026-02-19", "artists": 1}
+        assert list(ArtistDailyRank.objects.values_list("seed", flat=True)) == ["2026-02-19"]